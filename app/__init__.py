@@ -13,17 +13,20 @@ import logging
 import os
 import time
 
-import fitz
 import streamlit as st
-from markdown_pdf import MarkdownPdf, Section
 
 from dr_rd.config.env import get_env
 from dr_rd.telemetry.api_call_log import APICallLogger
 from dr_rd.telemetry import loggers as api_loggers
 from utils.i18n import missing_keys, set_locale
 from utils.i18n import tr as t
+from utils.lazy_import import lazy
 from utils.session_store import get_session_id, init_stores  # noqa: F401
 
+# PDF export is rarely used; load PyMuPDF and markdown_pdf on first export.
+fitz = lazy("fitz")
+markdown_pdf = lazy("markdown_pdf")
+
 st.set_page_config(
     page_title=t("app_title"),
     page_icon=":material/science:",
@@ -860,8 +863,8 @@ def _run(run_id: str, kwargs: dict, prefs: dict, origin_run_id: str | None) -> N
 def generate_pdf(markdown_text):
     if isinstance(markdown_text, dict):
         markdown_text = markdown_text.get("document", "")
-    pdf = MarkdownPdf(toc_level=2)
-    pdf.add_section(Section(markdown_text), user_css=WRAP_CSS)
+    pdf = markdown_pdf.MarkdownPdf(toc_level=2)
+    pdf.add_section(markdown_pdf.Section(markdown_text), user_css=WRAP_CSS)
     pdf.writer.close()
     pdf.out_file.seek(0)
     try:
@@ -34,9 +34,6 @@ def init_gcp_logging() -> bool:
         return True
 
     try:
-        from google.cloud import logging as gcp_logging
-        from google.oauth2 import service_account
-
         creds_raw = get_env("GCP_SERVICE_ACCOUNT")
         if not creds_raw:
             raise KeyError("missing gcp_service_account secret")
@@ -44,6 +41,10 @@ def init_gcp_logging() -> bool:
         if not creds_info.get("private_key"):
             raise KeyError("missing private_key in gcp_service_account secret")
 
+        # Only pay for the Cloud Logging SDK import when credentials exist.
+        from google.cloud import logging as gcp_logging
+        from google.oauth2 import service_account
+
         credentials = service_account.Credentials.from_service_account_info(creds_info)
         client = gcp_logging.Client(credentials=credentials)
         client.setup_logging()
@@ -9,30 +9,54 @@ def render(events_iter):
     """
     out = st.empty()
     buf = ""
+    events_iter = iter(events_iter)
 
     def _write(piece: str):
         nonlocal buf
         buf += piece
         out.markdown(buf)
 
+    def _drop(e: Event):
+        nonlocal buf
+        chars = int((e.meta or {}).get("chars") or 0)
+        buf = buf[: max(0, len(buf) - chars)]
+        out.markdown(buf)
+
     if hasattr(st, "write_stream"):
+        reset = None
+
         def gen():
+            nonlocal buf, reset
             for e in events_iter:
+                if e.kind == "token_reset":
+                    reset = e
+                    return
+                piece = ""
                 if e.kind == "token":
-                    yield e.text or ""
+                    piece = e.text or ""
                 elif e.kind == "message":
-                    yield (e.text or "") + "\n"
+                    piece = (e.text or "") + "\n"
+                buf += piece
+                if piece:
+                    yield piece
                 if is_terminal(e):
                     break
-        st.write_stream(gen())
-    else:
-        for e in events_iter:
-            if e.kind == "token":
-                _write(e.text or "")
-            elif e.kind == "message":
-                _write((e.text or "") + "\n")
-            if is_terminal(e):
-                break
+
+        with out.container():
+            st.write_stream(gen())
+        if reset is None:
+            return
+        # streamed text cannot be taken back: redraw it and continue manually
+        _drop(reset)
+    for e in events_iter:
+        if e.kind == "token_reset":
+            _drop(e)
+        elif e.kind == "token":
+            _write(e.text or "")
+        elif e.kind == "message":
+            _write((e.text or "") + "\n")
+        if is_terminal(e):
+            break
 
 
 __all__ = ["render"]
@@ -47,6 +47,12 @@ QUOTAS_ENABLED = os.getenv("QUOTAS_ENABLED", "true").lower() == "true"
 BUDGET_PROFILE: str = os.getenv("BUDGET_PROFILE", "standard")
 MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
 FAILOVER_ENABLED = os.getenv("FAILOVER_ENABLED", "true").lower() == "true"
+# Response cache in ``call_openai``; TTL and size limits come from the
+# ``caching`` block in config/models.yaml.
+LLM_CACHE_ENABLED = _flag("LLM_CACHE_ENABLED")
+# Lay prompts out as a stable per-role system prefix (instructions, schema,
+# examples) followed by the task, so provider prefix caching can hit.
+PROMPT_CACHE_LAYOUT = _flag("PROMPT_CACHE_LAYOUT")
 FAISS_INDEX_URI: str | None = os.getenv("FAISS_INDEX_URI")
 FAISS_INDEX_DIR: str = os.getenv("FAISS_INDEX_DIR", ".faiss_index")
 FAISS_BOOTSTRAP_MODE: str = os.getenv("FAISS_BOOTSTRAP_MODE", "download")
@@ -170,6 +176,8 @@ def get_env_defaults() -> dict:
         "COST_GOVERNANCE_ENABLED": COST_GOVERNANCE_ENABLED,
         "MODEL_ROUTING_ENABLED": MODEL_ROUTING_ENABLED,
         "FAILOVER_ENABLED": FAILOVER_ENABLED,
+        "LLM_CACHE_ENABLED": LLM_CACHE_ENABLED,
+        "PROMPT_CACHE_LAYOUT": PROMPT_CACHE_LAYOUT,
         "BUDGET_PROFILE": BUDGET_PROFILE,
         "PATENT_APIS_ENABLED": PATENT_APIS_ENABLED,
         "REGULATORY_APIS_ENABLED": REGULATORY_APIS_ENABLED,
@@ -2,56 +2,45 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Dict, Optional, Tuple, Type
-
-from core.agents.base_agent import LLMRoleAgent as BaseAgent
-from core.agents.chief_scientist_agent import ChiefScientistAgent
-from core.agents.cto_agent import CTOAgent
-from core.agents.dynamic_agent_wrapper import DynamicAgentWrapper
-from core.agents.evaluation_agent import EvaluationAgent
-from core.agents.finance_agent import FinanceAgent
-from core.agents.hrm_agent import HRMAgent
-from core.agents.invoke import resolve_invoker
-from core.agents.ip_analyst_agent import IPAnalystAgent
-from core.agents.marketing_agent import MarketingAgent
-from core.agents.materials_engineer_agent import MaterialsEngineerAgent
-from core.agents.mechanical_systems_lead_agent import MechanicalSystemsLeadAgent
-from core.agents.planner_agent import PlannerAgent
-from core.agents.qa_agent import QAAgent
-from core.agents.simulation_agent import SimulationAgent
-from core.agents.reflection_agent import ReflectionAgent
-from core.agents.regulatory_agent import RegulatoryAgent
-from core.agents.regulatory_specialist_agent import RegulatorySpecialistAgent
-from core.agents.research_scientist_agent import ResearchScientistAgent
-from core.agents.synthesizer_agent import SynthesizerAgent
-from core.llm import select_model
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type
+
+from utils.lazy_import import LazyMapping
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from core.agents.base_agent import LLMRoleAgent as BaseAgent
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Canonical registry
 # ---------------------------------------------------------------------------
-AGENT_REGISTRY: Dict[str, Type[BaseAgent]] = {
-    "CTO": CTOAgent,
-    "Research Scientist": ResearchScientistAgent,
-    "Regulatory": RegulatoryAgent,
-    "Finance": FinanceAgent,
-    "Marketing Analyst": MarketingAgent,
-    "IP Analyst": IPAnalystAgent,
-    "Planner": PlannerAgent,
-    "Synthesizer": SynthesizerAgent,
-    "Mechanical Systems Lead": MechanicalSystemsLeadAgent,
-    "HRM": HRMAgent,
-    "Materials Engineer": MaterialsEngineerAgent,
-    "Reflection": ReflectionAgent,
-    "Chief Scientist": ChiefScientistAgent,
-    "Regulatory Specialist": RegulatorySpecialistAgent,
-    "Evaluation": EvaluationAgent,
-    "QA": QAAgent,
-    "Simulation": SimulationAgent,
-    "Dynamic Specialist": DynamicAgentWrapper,
+# Agent classes are imported on first lookup so that importing the registry
+# (and listing its roles) does not pull in every agent, prompt and LLM client.
+AGENT_SPECS: Dict[str, str] = {
+    "CTO": "core.agents.cto_agent:CTOAgent",
+    "Research Scientist": "core.agents.research_scientist_agent:ResearchScientistAgent",
+    "Regulatory": "core.agents.regulatory_agent:RegulatoryAgent",
+    "Finance": "core.agents.finance_agent:FinanceAgent",
+    "Marketing Analyst": "core.agents.marketing_agent:MarketingAgent",
+    "IP Analyst": "core.agents.ip_analyst_agent:IPAnalystAgent",
+    "Planner": "core.agents.planner_agent:PlannerAgent",
+    "Synthesizer": "core.agents.synthesizer_agent:SynthesizerAgent",
+    "Mechanical Systems Lead": (
+        "core.agents.mechanical_systems_lead_agent:MechanicalSystemsLeadAgent"
+    ),
+    "HRM": "core.agents.hrm_agent:HRMAgent",
+    "Materials Engineer": "core.agents.materials_engineer_agent:MaterialsEngineerAgent",
+    "Reflection": "core.agents.reflection_agent:ReflectionAgent",
+    "Chief Scientist": "core.agents.chief_scientist_agent:ChiefScientistAgent",
+    "Regulatory Specialist": "core.agents.regulatory_specialist_agent:RegulatorySpecialistAgent",
+    "Evaluation": "core.agents.evaluation_agent:EvaluationAgent",
+    "QA": "core.agents.qa_agent:QAAgent",
+    "Simulation": "core.agents.simulation_agent:SimulationAgent",
+    "Dynamic Specialist": "core.agents.dynamic_agent_wrapper:DynamicAgentWrapper",
 }
 
+AGENT_REGISTRY: Dict[str, Type[BaseAgent]] = LazyMapping(AGENT_SPECS)  # type: ignore[assignment]
+
 # Backwards compatibility alias
 AGENTS = AGENT_REGISTRY
 
@@ -62,6 +51,12 @@ def get_agent_class(role: str) -> Optional[Type[BaseAgent]]:
     return AGENT_REGISTRY.get(role)
 
 
+def select_model(*args, **kwargs) -> str:
+    from core.llm import select_model as _select_model
+
+    return _select_model(*args, **kwargs)
+
+
 def get_agent(name: str) -> BaseAgent:
     if name in CACHE:
         return CACHE[name]
@@ -77,6 +72,8 @@ def get_agent(name: str) -> BaseAgent:
 
 
 def validate_registry(strict: bool | None = None) -> dict:
+    from core.agents.invoke import resolve_invoker
+
     ok: list[str] = []
     errors: list[tuple[str, str]] = []
     for name, cls in AGENT_REGISTRY.items():
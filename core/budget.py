@@ -1,6 +1,23 @@
 import math
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
+
+from core import tokenizer
+
+Prompt = Union[str, List[dict]]
+
+
+def prompt_tokens(model_id: str, est_prompt_tokens: int, prompt: Optional[Prompt]) -> int:
+    """Count ``prompt`` (text or chat messages) for ``model_id``; else keep the estimate."""
+    if prompt is None:
+        return est_prompt_tokens
+    if isinstance(prompt, str):
+        return tokenizer.count(prompt, model_id)
+    return tokenizer.count_messages(prompt, model_id)
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised before a call whose estimated cost no longer fits the budget."""
 
 
 @dataclass
@@ -30,17 +47,27 @@ class BudgetManager:
         self.web_search_calls = 0
         self.retrieval_tokens = 0
         self.skipped_due_to_budget = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.stage_cached_tokens: Dict[str, int] = {}
 
     # ------------------------------------------------------------------
     def _price(self, model_id: str) -> Dict[str, float]:
         models = self.price_table.get("models", {})
         return models.get(model_id, models.get("default", {"in_per_1k": 0.0, "out_per_1k": 0.0}))
 
-    def cost_of(self, model_id: str, prompt_tokens: int, completion_tokens: int) -> float:
+    def cost_of(
+        self, model_id: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+    ) -> float:
+        """Dollar cost; ``cached_tokens`` of the prompt bill at ``cached_in_per_1k`` if priced."""
         p = self._price(model_id)
-        return (prompt_tokens / 1000.0) * p.get("in_per_1k", 0.0) + (
-            completion_tokens / 1000.0
-        ) * p.get("out_per_1k", 0.0)
+        in_rate = p.get("in_per_1k", 0.0)
+        cached_rate = p.get("cached_in_per_1k", in_rate)
+        return (
+            ((prompt_tokens - cached_tokens) / 1000.0) * in_rate
+            + (cached_tokens / 1000.0) * cached_rate
+            + (completion_tokens / 1000.0) * p.get("out_per_1k", 0.0)
+        )
 
     # ------------------------------------------------------------------
     def remaining_usd(self) -> float:
@@ -67,7 +94,10 @@ class BudgetManager:
         model_id: str,
         est_prompt_tokens: int,
         est_completion_tokens: int,
+        prompt: Optional[Prompt] = None,
     ) -> bool:
+        """Whether the next call fits; pass ``prompt`` to count its tokens exactly."""
+        est_prompt_tokens = prompt_tokens(model_id, est_prompt_tokens, prompt)
         cost = self.cost_of(model_id, est_prompt_tokens, est_completion_tokens)
         return cost <= self.remaining_usd() and cost <= self._remaining_stage_usd(next_stage_name)
 
@@ -77,7 +107,9 @@ class BudgetManager:
         model_id: str,
         est_prompt_tokens: int,
         est_completion_tokens: int,
+        prompt: Optional[Prompt] = None,
     ) -> Reservation:
+        est_prompt_tokens = prompt_tokens(model_id, est_prompt_tokens, prompt)
         cost = self.cost_of(model_id, est_prompt_tokens, est_completion_tokens)
         self.stage_spend[next_stage_name] = self.stage_spend.get(next_stage_name, 0.0) + cost
         self.spend += cost
@@ -89,11 +121,15 @@ class BudgetManager:
         actual_completion_tokens: int,
         model_id: str,
         stage: Optional[str] = None,
+        cached_tokens: int = 0,
     ) -> float:
-        cost = self.cost_of(model_id, actual_prompt_tokens, actual_completion_tokens)
+        cost = self.cost_of(model_id, actual_prompt_tokens, actual_completion_tokens, cached_tokens)
         self.spend += cost
+        self.prompt_tokens += actual_prompt_tokens
+        self.cached_tokens += cached_tokens
         if stage:
             self.stage_spend[stage] = self.stage_spend.get(stage, 0.0) + cost
+            self.stage_cached_tokens[stage] = self.stage_cached_tokens.get(stage, 0) + cached_tokens
         return cost
 
 
@@ -114,16 +150,26 @@ class CostTracker:
         self.web_search_calls = 0
         self.retrieval_tokens = 0
         self.skipped_due_to_budget = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.stage_cached_tokens: Dict[str, int] = {}
 
     def _price(self, model_id: str) -> Dict[str, float]:
         models = self.price_table.get("models", {})
         return models.get(model_id, models.get("default", {"in_per_1k": 0.0, "out_per_1k": 0.0}))
 
-    def cost_of(self, model_id: str, prompt_tokens: int, completion_tokens: int) -> float:
+    def cost_of(
+        self, model_id: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+    ) -> float:
+        """Dollar cost; ``cached_tokens`` of the prompt bill at ``cached_in_per_1k`` if priced."""
         p = self._price(model_id)
-        return (prompt_tokens / 1000.0) * p.get("in_per_1k", 0.0) + (
-            completion_tokens / 1000.0
-        ) * p.get("out_per_1k", 0.0)
+        in_rate = p.get("in_per_1k", 0.0)
+        cached_rate = p.get("cached_in_per_1k", in_rate)
+        return (
+            ((prompt_tokens - cached_tokens) / 1000.0) * in_rate
+            + (cached_tokens / 1000.0) * cached_rate
+            + (completion_tokens / 1000.0) * p.get("out_per_1k", 0.0)
+        )
 
     def can_afford(self, *args, **kwargs) -> bool:  # pragma: no cover - always true
         return True
@@ -137,9 +183,13 @@ class CostTracker:
         actual_completion_tokens: int,
         model_id: str,
         stage: Optional[str] = None,
+        cached_tokens: int = 0,
     ) -> float:
-        cost = self.cost_of(model_id, actual_prompt_tokens, actual_completion_tokens)
+        cost = self.cost_of(model_id, actual_prompt_tokens, actual_completion_tokens, cached_tokens)
         self.spend += cost
+        self.prompt_tokens += actual_prompt_tokens
+        self.cached_tokens += cached_tokens
         if stage:
             self.stage_spend[stage] = self.stage_spend.get(stage, 0.0) + cost
+            self.stage_cached_tokens[stage] = self.stage_cached_tokens.get(stage, 0) + cached_tokens
         return cost
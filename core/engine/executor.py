@@ -3,14 +3,19 @@
 The :func:`run_tasks` helper schedules independent tasks for concurrent
 execution while ensuring deterministic merging of results.  It purposefully
 avoids mutating shared state from worker threads; only the orchestrator thread
-performs state mutations.  The unified orchestrator uses this helper when
-``PARALLEL_EXEC_ENABLED`` is set to ``True``.
+performs state mutations.
+
+:func:`run_dag` is the dependency-aware scheduler used by the unified
+orchestrator when ``PARALLEL_EXEC_ENABLED`` is set to ``True``.  It keeps a
+bounded worker pool full, submitting each task as soon as its ``depends_on``
+entries resolve, honours per-role concurrency caps and hands results back in
+the deterministic ``_sort_key`` order.
 """
 
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from typing import Any
 
 from utils.telemetry import tasks_executable
@@ -89,3 +94,162 @@ def run_tasks(
         executed.append((task, score))
 
     return {"executed": executed, "pending": pending}
+
+
+def _task_id(task: Task, index: int) -> str:
+    return str(task.get("id") or f"T{index + 1:02d}")
+
+
+def topological_waves(tasks: list[Task]) -> tuple[list[list[Task]], list[Task]]:
+    """Group ``tasks`` into dependency waves.
+
+    Wave ``n`` holds the tasks whose dependencies all live in waves ``< n``.
+    Dependencies on ids outside ``tasks`` are treated as already satisfied.
+    Tasks within a wave are ordered by :func:`_sort_key`.  Returns
+    ``(waves, blocked)`` where ``blocked`` lists tasks caught in a cycle.
+    """
+
+    ids = [_task_id(t, i) for i, t in enumerate(tasks)]
+    known = set(ids)
+    remaining = {
+        tid: {d for d in t.get("depends_on", []) or [] if d in known and d != tid}
+        for tid, t in zip(ids, tasks)
+    }
+    by_id = dict(zip(ids, tasks))
+    waves: list[list[Task]] = []
+    done: set[str] = set()
+    while remaining:
+        wave = [tid for tid, deps in remaining.items() if deps <= done]
+        if not wave:
+            break
+        for tid in wave:
+            del remaining[tid]
+        done.update(wave)
+        waves.append(sorted((by_id[tid] for tid in wave), key=lambda t: _sort_key((t, None, 0.0))))
+    blocked = [by_id[tid] for tid in ids if tid in remaining]
+    return waves, blocked
+
+
+def run_dag(
+    tasks: list[Task],
+    execute: Callable[[Task], tuple[Any, float]],
+    *,
+    max_workers: int = 4,
+    role_limits: dict[str, int] | None = None,
+    default_role_limit: int | None = None,
+    on_result: Callable[[Task, Any, float], None] | None = None,
+    check: Callable[[], None] | None = None,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Execute ``tasks`` as a dependency DAG on a bounded worker pool.
+
+    ``execute`` runs in worker threads and returns ``(result, score)``.  A task
+    is submitted as soon as every id in its ``depends_on`` has finished and a
+    worker slot is free, so the pool refills whenever any dependency resolves
+    rather than once per wave.  ``role_limits`` caps the number of in-flight
+    tasks per ``role``; roles without an entry use ``default_role_limit``
+    (unbounded when ``None``).
+
+    ``on_result`` is invoked on the calling thread in the deterministic merge
+    order (wave, then :func:`_sort_key`) regardless of completion order.
+    ``check`` is called before each submission and may raise to abort; any
+    exception cancels tasks that have not started and is re-raised once
+    running tasks finish.
+
+    Returns a dict with ``executed`` (``(task, result, score)`` tuples in merge
+    order), ``pending`` (tasks blocked by a dependency cycle) and ``waves``.
+    """
+
+    if not tasks:
+        tasks_executable(0)
+        return {"executed": [], "pending": [], "waves": 0}
+
+    waves, blocked = topological_waves(tasks)
+    order = [t for wave in waves for t in wave]
+    ids = {id(t): _task_id(t, i) for i, t in enumerate(tasks)}
+    rank = {ids[id(t)]: i for i, t in enumerate(order)}
+    known = set(rank)
+    waiting = {
+        ids[id(t)]: {d for d in t.get("depends_on", []) or [] if d in known and d != ids[id(t)]}
+        for t in order
+    }
+    dependants: dict[str, list[str]] = {tid: [] for tid in rank}
+    for tid, deps in waiting.items():
+        for d in deps:
+            dependants[d].append(tid)
+    by_id = {ids[id(t)]: t for t in order}
+    limits = role_limits or {}
+
+    def _limit(role: str) -> int | None:
+        return limits.get(role, default_role_limit)
+
+    ready: list[str] = [tid for tid, deps in waiting.items() if not deps]
+    tasks_executable(len(ready))
+    in_flight: dict[Future, str] = {}
+    per_role: dict[str, int] = {}
+    finished: dict[str, tuple[Any, float]] = {}
+    executed: list[TaskResult] = []
+    next_commit = 0
+    error: BaseException | None = None
+
+    def _commit() -> None:
+        nonlocal next_commit
+        while next_commit < len(order):
+            tid = ids[id(order[next_commit])]
+            if tid not in finished:
+                return
+            res, score = finished[tid]
+            task = by_id[tid]
+            executed.append((task, res, score))
+            if on_result:
+                on_result(task, res, score)
+            next_commit += 1
+
+    workers = max(1, min(int(max_workers), len(order) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while (ready or in_flight) and error is None:
+            ready.sort(key=rank.__getitem__)
+            for tid in list(ready):
+                if len(in_flight) >= workers:
+                    break
+                task = by_id[tid]
+                role = str(task.get("role", ""))
+                cap = _limit(role)
+                if cap is not None and per_role.get(role, 0) >= max(1, cap):
+                    continue
+                try:
+                    if check:
+                        check()
+                except BaseException as exc:  # noqa: BLE001 - propagate after drain
+                    error = exc
+                    break
+                ready.remove(tid)
+                per_role[role] = per_role.get(role, 0) + 1
+                if log:
+                    log(f"▶️ {role} – {str(task.get('task') or task.get('title', ''))[:60]}…")
+                in_flight[pool.submit(execute, task)] = tid
+            if error is not None or not in_flight:
+                break
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for fut in done:
+                tid = in_flight.pop(fut)
+                role = str(by_id[tid].get("role", ""))
+                per_role[role] -= 1
+                try:
+                    finished[tid] = fut.result()
+                except BaseException as exc:  # noqa: BLE001 - propagate after drain
+                    error = error or exc
+                    continue
+                for child in dependants[tid]:
+                    waiting[child].discard(tid)
+                    if not waiting[child]:
+                        ready.append(child)
+            if error is None:
+                _commit()
+        if error is not None:
+            for fut in in_flight:
+                fut.cancel()
+    if error is not None:
+        raise error
+    _commit()
+    return {"executed": executed, "pending": blocked, "waves": len(waves)}
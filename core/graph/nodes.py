@@ -181,10 +181,16 @@ def tool_node(state: GraphState) -> GraphState:
     from core import tool_router
 
     before = list(tool_router.get_provenance())
+    calls = task.tool_request.get("calls")
     try:
-        result = tool_router.call_tool(
-            task.role or "", task.tool_request.get("tool"), task.tool_request.get("params", {})
-        )
+        if isinstance(calls, list):
+            result = tool_router.call_tools_batch(
+                task.role or "", [(c.get("tool"), c.get("params", {})) for c in calls]
+            )
+        else:
+            result = tool_router.call_tool(
+                task.role or "", task.tool_request.get("tool"), task.tool_request.get("params", {})
+            )
     except Exception as e:  # pylint: disable=broad-except
         result = {"error": str(e)}
     after = list(tool_router.get_provenance())
@@ -6,16 +6,23 @@ from dataclasses import dataclass
 from utils.logging import logger, safe_exc
 
 from config import feature_flags
-from core.llm_client import call_openai
+from core.llm_client import call_openai, prompt_text
 from core.prompt_utils import coerce_user_content
 from core.privacy import redact_for_logging
 from .model_router import RouteContext, choose_model
 
 
 def select_model(
-    purpose: str, ui_model: str | None = None, agent_name: str | None = None
+    purpose: str,
+    ui_model: str | None = None,
+    agent_name: str | None = None,
+    prompt: str | None = None,
 ) -> str:
-    """Resolve the model to use based on UI, agent, or env settings."""
+    """Resolve the model to use based on UI, agent, or env settings.
+
+    ``prompt`` is the text about to be sent; when routing decides, it is
+    counted per candidate model to check context windows and budgets.
+    """
 
     model: str | None = ui_model.strip() if ui_model else None
 
@@ -42,7 +49,12 @@ def select_model(
         and feature_flags.MODEL_ROUTING_ENABLED
         and purpose in {"plan", "exec", "synth"}
     ):
-        ctx = RouteContext(role=agent_name, purpose=purpose, budget_profile=feature_flags.BUDGET_PROFILE)
+        ctx = RouteContext(
+            role=agent_name,
+            purpose=purpose,
+            budget_profile=feature_flags.BUDGET_PROFILE,
+            prompt=prompt,
+        )
         decision = choose_model(ctx)
         model = decision.model
     if not model:
@@ -110,12 +122,12 @@ def _validate_messages(messages: list):
 def complete(
     system_prompt: t.Any, user_prompt: t.Any, *, model: t.Optional[str] = None, **kwargs
 ) -> ChatResult:
-    mdl = select_model("general", model)
     messages = [
         {"role": "system", "content": coerce_user_content(system_prompt)},
         {"role": "user", "content": coerce_user_content(user_prompt)},
     ]
     _validate_messages(messages)
+    mdl = select_model("general", model, prompt=prompt_text(messages))
 
     scrub = dict(kwargs)
     if scrub.get("stream_options") and not scrub.get("stream"):
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from config import feature_flags
+from core import tokenizer
 from dr_rd.telemetry import metrics
 
 # Paths
@@ -47,6 +48,9 @@ class RouteContext:
     retrieval_policy: Optional[str] = None
     budget_profile: Optional[str] = None
     size_hint: int = 0
+    # When set, token estimates come from counting this text per candidate
+    # model instead of trusting ``size_hint``.
+    prompt: Optional[str] = None
     latency_target_ms: Optional[int] = None
     flags: Dict[str, Any] | None = None
 
@@ -114,9 +118,17 @@ def list_candidates(purpose: str, role: Optional[str] = None) -> Dict[str, List[
 
 def estimate_tokens(prompt_meta: Optional[Dict[str, Any]] = None) -> int:
     prompt_meta = prompt_meta or {}
+    if "tokens" not in prompt_meta and prompt_meta.get("text"):
+        return tokenizer.count(str(prompt_meta["text"]), prompt_meta.get("model"))
     return int(prompt_meta.get("tokens", prompt_meta.get("size_hint", 0)))
 
 
+def _prompt_tokens(ctx: RouteContext, spec: ModelSpec) -> int:
+    if ctx.prompt:
+        return tokenizer.count(ctx.prompt, spec.name)
+    return ctx.size_hint
+
+
 def _cost_risk(spec: ModelSpec, tokens: int, ctx: RouteContext) -> bool:
     profile = ctx.budget_profile or feature_flags.BUDGET_PROFILE
     budget = _budgets_cfg.get(profile, {}).get(ctx.purpose, {}) if _budgets_cfg else {}
@@ -132,9 +144,8 @@ def choose_model(ctx: RouteContext) -> RouteDecision:
     preferred_specs = [_model_from_id(mid) for mid in routing.get("preferred", [])]
     backup_specs = [_model_from_id(mid) for mid in routing.get("backups", [])]
 
-    est_tokens = ctx.size_hint
-    preferred_specs = [m for m in preferred_specs if m.ctx >= est_tokens]
-    backup_specs = [m for m in backup_specs if m.ctx >= est_tokens]
+    preferred_specs = [m for m in preferred_specs if m.ctx >= _prompt_tokens(ctx, m)]
+    backup_specs = [m for m in backup_specs if m.ctx >= _prompt_tokens(ctx, m)]
 
     if not preferred_specs and backup_specs:
         chosen = backup_specs.pop(0)
@@ -144,6 +155,7 @@ def choose_model(ctx: RouteContext) -> RouteDecision:
         reason = "preferred"
         backup_specs = preferred_specs[1:] + backup_specs
 
+    est_tokens = _prompt_tokens(ctx, chosen)
     if _cost_risk(chosen, est_tokens, ctx):
         cheaper = sorted(
             _provider_models_for_purpose(chosen.provider, ctx.purpose),
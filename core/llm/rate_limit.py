@@ -0,0 +1,389 @@
+"""Provider-level concurrency and RPM/TPM shaping for LLM requests.
+
+Each ``provider/model`` pair gets a requests-per-minute and a tokens-per-minute
+bucket sized from ``config/models.yaml`` (per-model ``rpm``/``tpm`` or the
+``rate_limits.defaults`` block); in-flight requests are capped per provider
+by ``rate_limits.max_concurrency``.  Calls reserve their estimated tokens up
+front and reconcile against reported usage afterwards, so the TPM bucket
+tracks what the provider actually counted.  A 429 pauses the buckets for the
+``Retry-After`` interval so every worker backs off together instead of
+retrying blind.
+
+Buckets are process-wide by default.  Setting ``rate_limits.shared_dir`` (or
+``LLM_RATE_LIMIT_DIR``) keeps their state in ``flock``-guarded files so
+several processes, e.g. ``scripts/batch_run.py`` workers, share one budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple
+
+import yaml
+
+from core import tokenizer
+from dr_rd.telemetry import metrics
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except Exception:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+_CFG_PATH = Path(__file__).resolve().parents[2] / "config" / "models.yaml"
+DEFAULT_OUTPUT_TOKENS = 512
+_POLL_S = 0.01
+
+_cfg: Dict[str, Any] | None = None
+_limiters: Dict[str, "Limiter"] = {}
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_registry_lock = threading.Lock()
+
+
+def _load_cfg() -> Dict[str, Any]:
+    global _cfg
+    if _cfg is None:
+        try:
+            with open(_CFG_PATH, "r", encoding="utf-8") as fh:
+                _cfg = yaml.safe_load(fh) or {}
+        except Exception:
+            _cfg = {}
+    return _cfg
+
+
+class TokenBucket:
+    """Refilling bucket whose balance may go negative to record reservations.
+
+    :meth:`reserve` debits immediately and returns how long the caller must
+    wait for the debt to be repaid, which keeps reservations FIFO without a
+    queue.  With ``state_path`` the balance lives in a locked JSON file shared
+    between processes.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: float | None = None,
+        state_path: Path | None = None,
+    ) -> None:
+        self.rate = float(per_minute) / 60.0
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self.state_path = state_path if fcntl is not None else None
+        self._tokens = self.capacity
+        self._ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _state(self) -> Iterator[list]:
+        with self._lock:
+            if self.state_path is None:
+                state = [self._tokens, self._ts]
+                yield state
+                self._tokens, self._ts = state
+                return
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, "a+", encoding="utf-8") as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    fh.seek(0)
+                    try:
+                        tokens, ts = json.loads(fh.read())
+                    except Exception:
+                        tokens, ts = self.capacity, time.time()
+                    state = [tokens, ts]
+                    yield state
+                    fh.seek(0)
+                    fh.truncate()
+                    fh.write(json.dumps(state))
+                    fh.flush()
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _now(self) -> float:
+        # Wall clock for shared state so timestamps agree across processes.
+        return time.time() if self.state_path is not None else time.monotonic()
+
+    def _refill(self, state: list) -> None:
+        now = self._now()
+        state[0] = min(self.capacity, state[0] + (now - state[1]) * self.rate)
+        state[1] = now
+
+    def reserve(self, amount: float) -> float:
+        """Debit ``amount`` and return seconds until the balance is non-negative."""
+        with self._state() as state:
+            self._refill(state)
+            state[0] -= amount
+            return max(0.0, -state[0] / self.rate) if self.rate > 0 else 0.0
+
+    def adjust(self, amount: float) -> None:
+        """Credit (positive) or debit (negative) ``amount`` without waiting."""
+        with self._state() as state:
+            self._refill(state)
+            state[0] = min(self.capacity, state[0] + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Ensure no new reservation is granted for ``seconds``."""
+        with self._state() as state:
+            self._refill(state)
+            state[0] = min(state[0], -seconds * self.rate)
+
+    @property
+    def available(self) -> float:
+        with self._state() as state:
+            self._refill(state)
+            return state[0]
+
+
+class Reservation:
+    """Outstanding request slot plus its estimated TPM debit."""
+
+    def __init__(self, limiter: "Limiter", tokens: int, wait_s: float) -> None:
+        self.limiter = limiter
+        self.tokens = tokens
+        self.wait_s = wait_s
+        self._settled = False
+
+    def settle(self, actual_tokens: int | None = None, exc: BaseException | None = None) -> None:
+        """Reconcile the TPM bucket and release the concurrency slot.
+
+        ``actual_tokens=None`` keeps the estimate.  A failed call refunds its
+        tokens; a 429 pauses the buckets for the provider's ``Retry-After``.
+        """
+        if self._settled:
+            return
+        self._settled = True
+        lim = self.limiter
+        try:
+            if exc is not None:
+                actual_tokens = 0
+                if _status_code(exc) == 429:
+                    lim.throttled(_retry_after(exc))
+            if actual_tokens is not None and lim.tpm is not None:
+                lim.tpm.adjust(self.tokens - actual_tokens)
+        finally:
+            if lim.slots is not None:
+                lim.slots.release()
+
+
+class Limiter:
+    """RPM/TPM buckets for one ``provider/model`` plus the provider's slots."""
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        *,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        slots: threading.BoundedSemaphore | None = None,
+        state_dir: Path | None = None,
+    ) -> None:
+        self.provider = provider
+        self.model = model
+        self.slots = slots
+
+        def bucket(kind: str, per_minute: float | None) -> TokenBucket | None:
+            if not per_minute:
+                return None
+            path = None
+            if state_dir is not None:
+                path = Path(state_dir) / f"{provider}_{model}_{kind}.json".replace("/", "_")
+            return TokenBucket(per_minute, state_path=path)
+
+        self.rpm = bucket("rpm", rpm)
+        self.tpm = bucket("tpm", tpm)
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.rpm is not None:
+            wait = max(wait, self.rpm.reserve(1))
+        if self.tpm is not None:
+            wait = max(wait, self.tpm.reserve(tokens))
+        if wait > 0:
+            metrics.observe(
+                "llm_rate_limit_wait_s", wait, provider=self.provider, model=self.model
+            )
+        return wait
+
+    def acquire(self, tokens: int) -> Reservation:
+        """Block until a slot is free and the buckets cover ``tokens``."""
+        if self.slots is not None:
+            self.slots.acquire()
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                time.sleep(wait)
+        except BaseException:
+            if self.slots is not None:
+                self.slots.release()
+            raise
+        return Reservation(self, tokens, wait)
+
+    async def aacquire(self, tokens: int) -> Reservation:
+        """Asyncio counterpart of :meth:`acquire`; never blocks the loop."""
+        if self.slots is not None:
+            while not self.slots.acquire(blocking=False):
+                await asyncio.sleep(_POLL_S)
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            if self.slots is not None:
+                self.slots.release()
+            raise
+        return Reservation(self, tokens, wait)
+
+    def throttled(self, retry_after: float | None) -> None:
+        seconds = retry_after if retry_after is not None else 1.0
+        metrics.inc("llm_rate_limited", provider=self.provider, model=self.model)
+        for b in (self.rpm, self.tpm):
+            if b is not None:
+                b.pause(seconds)
+
+
+def _status_code(exc: BaseException) -> int | None:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    for name in ("retry-after-ms", "retry-after"):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000.0 if name.endswith("-ms") else seconds
+    return None
+
+
+def estimate_tokens(
+    prompt: str, max_output_tokens: int | None = None, model: str | None = None
+) -> int:
+    """Pre-call token estimate: counted prompt tokens plus the output allowance."""
+    out = max_output_tokens if max_output_tokens else DEFAULT_OUTPUT_TOKENS
+    return tokenizer.count(prompt or "", model) + int(out)
+
+
+def usage_tokens(resp: Any) -> int | None:
+    """Return total tokens reported for ``resp`` (Responses or Chat shape)."""
+    usage = getattr(resp, "usage", None)
+    if usage is None and isinstance(resp, dict):
+        usage = resp.get("usage")
+    if usage is None:
+        return None
+
+    def field(name: str) -> Any:
+        return usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+
+    total = field("total_tokens")
+    if isinstance(total, (int, float)):
+        return int(total)
+    parts = [field(n) for n in ("input_tokens", "output_tokens", "prompt_tokens", "completion_tokens")]
+    nums = [int(p) for p in parts if isinstance(p, (int, float))]
+    return sum(nums) if nums else None
+
+
+def _model_limits(cfg: Dict[str, Any], provider: str, model: str) -> Tuple[Any, Any]:
+    defaults = (cfg.get("rate_limits") or {}).get("defaults") or {}
+    for m in ((cfg.get("providers") or {}).get(provider) or {}).get("models", []) or []:
+        if m.get("name") == model:
+            return m.get("rpm", defaults.get("rpm")), m.get("tpm", defaults.get("tpm"))
+    return defaults.get("rpm"), defaults.get("tpm")
+
+
+def get_limiter(provider: str, model: str) -> Limiter | None:
+    """Return the shared limiter for ``provider/model`` or ``None`` if disabled."""
+    cfg = _load_cfg()
+    rl = cfg.get("rate_limits") or {}
+    if not rl.get("enabled", False):
+        return None
+    key = f"{provider}/{model}"
+    lim = _limiters.get(key)
+    if lim is not None:
+        return lim
+    with _registry_lock:
+        lim = _limiters.get(key)
+        if lim is None:
+            slots = _semaphores.get(provider)
+            max_conc = rl.get("max_concurrency")
+            if slots is None and max_conc:
+                slots = _semaphores[provider] = threading.BoundedSemaphore(int(max_conc))
+            shared = os.getenv("LLM_RATE_LIMIT_DIR") or rl.get("shared_dir")
+            rpm, tpm = _model_limits(cfg, provider, model)
+            lim = _limiters[key] = Limiter(
+                provider,
+                model,
+                rpm=rpm,
+                tpm=tpm,
+                slots=slots,
+                state_dir=Path(shared) if shared else None,
+            )
+    return lim
+
+
+def reset() -> None:
+    """Forget cached config and limiters (tests, config reloads)."""
+    global _cfg
+    with _registry_lock:
+        _cfg = None
+        _limiters.clear()
+        _semaphores.clear()
+
+
+def limited_call(
+    provider: str, model: str, est_tokens: int, call: Callable[[], Any]
+) -> Any:
+    """Run ``call`` under the ``provider/model`` limiter and reconcile usage."""
+    lim = get_limiter(provider, model)
+    if lim is None:
+        return call()
+    res = lim.acquire(est_tokens)
+    try:
+        resp = call()
+    except BaseException as exc:
+        res.settle(exc=exc)
+        raise
+    res.settle(usage_tokens(resp))
+    return resp
+
+
+async def alimited_call(
+    provider: str, model: str, est_tokens: int, call: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Asyncio counterpart of :func:`limited_call`."""
+    lim = get_limiter(provider, model)
+    if lim is None:
+        return await call()
+    res = await lim.aacquire(est_tokens)
+    try:
+        resp = await call()
+    except BaseException as exc:
+        res.settle(exc=exc)
+        raise
+    res.settle(usage_tokens(resp))
+    return resp
+
+
+__all__ = [
+    "TokenBucket",
+    "Limiter",
+    "Reservation",
+    "estimate_tokens",
+    "usage_tokens",
+    "get_limiter",
+    "limited_call",
+    "alimited_call",
+    "reset",
+]
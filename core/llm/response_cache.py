@@ -0,0 +1,278 @@
+"""Response cache for :func:`core.llm_client.call_openai`.
+
+Responses are keyed by :func:`utils.idempotency.key` over the exact provider
+request.  A bounded in-memory LRU sits in front of the ``utils.idempotency``
+disk store; both honour the ``caching`` TTL from ``config/models.yaml`` and
+the disk store is pruned to ``caching.max_bytes``.  Identical requests that
+arrive while one is already in flight wait for that call instead of issuing
+their own (single-flight).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Tuple
+
+import yaml
+
+from utils import idempotency
+from utils.telemetry import llm_cache_hit, llm_cache_miss
+
+_CFG_PATH = Path(__file__).resolve().parents[2] / "config" / "models.yaml"
+_PRUNE_EVERY = 64
+
+_cfg: Dict[str, Any] | None = None
+_cache: "ResponseCache | None" = None
+_cache_lock = threading.Lock()
+
+
+def _load_cfg() -> Dict[str, Any]:
+    global _cfg
+    if _cfg is None:
+        try:
+            with open(_CFG_PATH, "r", encoding="utf-8") as fh:
+                data = yaml.safe_load(fh) or {}
+        except Exception:
+            data = {}
+        _cfg = data.get("caching", {}) or {}
+    return _cfg
+
+
+def request_key(provider: str, model: str, request: Mapping[str, Any]) -> str | None:
+    """Return the cache key for a prepared request, or ``None`` if uncacheable.
+
+    Requests using tools (including web search) or streaming are never cached,
+    nor are payloads that cannot be canonicalised as JSON.
+    """
+    for part in request.values():
+        if isinstance(part, Mapping) and (part.get("tools") or part.get("stream")):
+            return None
+    try:
+        return idempotency.key(provider, model, request)
+    except (TypeError, ValueError):
+        return None
+
+
+def _dump(result: Mapping[str, Any]) -> dict | None:
+    raw = result.get("raw")
+    entry: dict[str, Any] = {"text": result.get("text")}
+    if hasattr(raw, "model_dump"):
+        entry["raw"] = raw.model_dump(mode="json")
+        entry["raw_type"] = f"{type(raw).__module__}:{type(raw).__qualname__}"
+    else:
+        entry["raw"] = raw
+    try:
+        json.dumps(entry)
+    except (TypeError, ValueError):
+        return None
+    return entry
+
+
+def _load(entry: Mapping[str, Any]) -> dict | None:
+    raw = entry.get("raw")
+    raw_type = entry.get("raw_type")
+    if raw_type:
+        mod_name, _, qualname = raw_type.partition(":")
+        try:
+            cls = importlib.import_module(mod_name)
+            for part in qualname.split("."):
+                cls = getattr(cls, part)
+            raw = cls.model_validate(raw)
+        except Exception:
+            return None
+    return {"raw": raw, "text": entry.get("text")}
+
+
+class ResponseCache:
+    """Two-level LRU + disk cache with single-flight request coalescing."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        ttl_s: int | None = 300,
+        max_bytes: int | None = None,
+        disk: bool = True,
+        provider: str = "openai",
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.provider = provider
+        self._mem: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"memory": 0, "disk": 0, "inflight": 0, "miss": 0}
+
+    # -- storage -----------------------------------------------------------
+    def _get_memory(self, key: str) -> dict | None:
+        item = self._mem.get(key)
+        if item is None:
+            return None
+        ts, value = item
+        if self.ttl_s is not None and time.time() - ts > self.ttl_s:
+            del self._mem[key]
+            return None
+        self._mem.move_to_end(key)
+        return value
+
+    def _put_memory(self, key: str, value: dict) -> None:
+        self._mem[key] = (time.time(), value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _get_disk(self, key: str) -> dict | None:
+        if not self.disk:
+            return None
+        entry = idempotency.get(key, ttl_sec=self.ttl_s)
+        return _load(entry) if isinstance(entry, Mapping) else None
+
+    def _put_disk(self, key: str, value: dict) -> None:
+        if not self.disk:
+            return
+        entry = _dump(value)
+        if entry is None:
+            return
+        try:
+            idempotency.put(key, entry)
+        except OSError:
+            return
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 1:
+            idempotency.prune(self.max_bytes, self.ttl_s)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+
+    # -- lookup ------------------------------------------------------------
+    def _begin(self, key: str) -> Tuple[dict | None, str | None, Future, bool]:
+        """Return ``(value, layer, future, leader)`` for ``key``.
+
+        ``value`` is set on a memory hit.  Otherwise the caller either leads
+        the request (``leader``) or waits on ``future``.
+        """
+        with self._lock:
+            value = self._get_memory(key)
+            if value is not None:
+                return value, "memory", Future(), False
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return None, "inflight", fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            return None, None, fut, True
+
+    def _finish(self, key: str, fut: Future, value: dict | None, exc: BaseException | None) -> None:
+        with self._lock:
+            if value is not None:
+                self._put_memory(key, value)
+            self._inflight.pop(key, None)
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(value)
+
+    def _record(self, layer: str | None, model: str, meta: Mapping[str, Any] | None) -> None:
+        meta = meta or {}
+        run_id, step_id = meta.get("run_id"), meta.get("task_id")
+        self.stats[layer or "miss"] += 1
+        if layer:
+            llm_cache_hit(self.provider, model, run_id, step_id, layer=layer)
+        else:
+            llm_cache_miss(self.provider, model, run_id, step_id)
+
+    def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], dict],
+        *,
+        model: str,
+        meta: Mapping[str, Any] | None = None,
+    ) -> Tuple[dict, str | None]:
+        """Return ``(result, layer)``; ``layer`` is ``None`` when ``call`` ran."""
+        value, layer, fut, leader = self._begin(key)
+        if not leader:
+            if value is None:
+                value = fut.result()
+            self._record(layer, model, meta)
+            return value, layer
+        try:
+            value = self._get_disk(key)
+            layer = "disk" if value is not None else None
+            if value is None:
+                value = call()
+                self._put_disk(key, value)
+        except BaseException as exc:
+            self._finish(key, fut, None, exc)
+            raise
+        self._finish(key, fut, value, None)
+        self._record(layer, model, meta)
+        return value, layer
+
+    async def aget_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[dict]],
+        *,
+        model: str,
+        meta: Mapping[str, Any] | None = None,
+    ) -> Tuple[dict, str | None]:
+        """Asyncio counterpart of :meth:`get_or_call`."""
+        value, layer, fut, leader = self._begin(key)
+        if not leader:
+            if value is None:
+                value = await asyncio.wrap_future(fut)
+            self._record(layer, model, meta)
+            return value, layer
+        try:
+            value = self._get_disk(key)
+            layer = "disk" if value is not None else None
+            if value is None:
+                value = await call()
+                self._put_disk(key, value)
+        except BaseException as exc:
+            self._finish(key, fut, None, exc)
+            raise
+        self._finish(key, fut, value, None)
+        self._record(layer, model, meta)
+        return value, layer
+
+
+def get_cache() -> ResponseCache | None:
+    """Return the shared cache, or ``None`` when response caching is disabled."""
+    global _cache
+    from config import feature_flags as ff
+
+    cfg = _load_cfg()
+    if not getattr(ff, "LLM_CACHE_ENABLED", False) or not cfg.get("enabled", False):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttl = cfg.get("ttl_s")
+                max_bytes = cfg.get("max_bytes")
+                _cache = ResponseCache(
+                    max_entries=int(cfg.get("max_entries", 256)),
+                    ttl_s=int(ttl) if ttl else None,
+                    max_bytes=int(max_bytes) if max_bytes else None,
+                )
+    return _cache
+
+
+def reset_cache() -> None:
+    global _cache
+    _cache = None
+
+
+__all__ = ["ResponseCache", "request_key", "get_cache", "reset_cache"]
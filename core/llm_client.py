@@ -1,3 +1,5 @@
+import asyncio
+import contextvars
 import inspect
 import json
 import logging
@@ -5,21 +7,34 @@ import os
 import random
 import time
 import uuid
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional, Type
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, Optional, Type
 
-from core.budget import BudgetManager, CostTracker
+from core.budget import BudgetExceeded, BudgetManager, CostTracker
 from core.token_meter import TokenMeter
 from utils.clients import get_cloud_logging_client
 from utils.config import load_config
 from utils.lazy_import import lazy
 from utils.telemetry import usage_exceeded, usage_threshold_crossed
-from dr_rd.telemetry.api_call_log import instrumented_api_call
+from dr_rd.telemetry.api_call_log import (
+    ainstrumented_api_call,
+    instrumented_api_call,
+    usage_tokens,
+)
 from utils.usage import Usage, add_delta, thresholds
 
 _openai = lazy("openai")
 _client_instance: Optional[Any] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
 _SUPPORTS_RESPONSE_FORMAT: Optional[bool] = None
+_token_sink: "contextvars.ContextVar[Optional[Callable[[str], None]]]" = contextvars.ContextVar(
+    "llm_token_sink", default=None
+)
 _LOGGED_OVERRIDES: set[str] = set()
 
 logger = logging.getLogger(__name__)
@@ -46,6 +61,38 @@ def _client() -> Any:
     return _client_instance
 
 
+def _async_client() -> Any:
+    """Return an ``AsyncOpenAI`` client bound to the running event loop.
+
+    httpx connection pools cannot be shared across event loops, so one client
+    is cached per loop.
+    """
+    loop = asyncio.get_running_loop()
+    inst = _async_clients.get(loop)
+    if inst is None:
+        from dr_rd.config.env import get_env
+
+        inst = _openai.AsyncOpenAI(api_key=get_env("OPENAI_API_KEY", "test"))
+        _async_clients[loop] = inst
+    return inst
+
+
+def _api_key_configured() -> bool:
+    from dr_rd.config.env import get_env
+
+    if get_env("OPENAI_API_KEY"):
+        return True
+    message = "OPENAI_API_KEY not configured"
+    logger.error(message)
+    try:
+        client = get_cloud_logging_client()
+        if client:
+            client.logger("drrd").log_text(message, severity="ERROR")
+    except Exception:
+        pass
+    return False
+
+
 class _ClientProxy:
     """Lazy proxy exposing attributes of the OpenAI client."""
 
@@ -292,10 +339,438 @@ def responses_json_schema_from_file(path: str) -> dict:
     return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}, "strict": True}
 
 
-def call_openai(
+def prompt_text(messages: list[dict[str, Any]]) -> str:
+    """The text parts of ``messages`` joined, as counted and logged for a call."""
+    return " \n".join(
+        m.get("content", "") if isinstance(m.get("content", ""), str) else "" for m in messages
+    )
+
+
+def _route_model(messages: list[dict[str, Any]], meta: dict[str, Any]) -> str:
+    from core.llm import select_model
+
+    return select_model(
+        meta.get("purpose") or "general",
+        agent_name=meta.get("agent"),
+        prompt=prompt_text(messages),
+    )
+
+
+def _prepare_request(
+    *,
+    model: str,
+    messages: list[dict[str, Any]],
+    response_format: dict[str, Any] | None,
+    params: dict[str, Any],
+    tools: list[dict[str, Any]] | None,
+    tool_choice: Any | None,
+    web_search_requested: bool,
+) -> dict[str, Any]:
+    """Translate ``call_openai`` arguments into provider request kwargs.
+
+    Returns one of ``{"result": ...}`` for dry-run short circuits,
+    ``{"seeded": kwargs}`` for seeded Chat Completions requests, or
+    ``{"payload": ..., "chat_params": ...}`` for the Responses API with its
+    Chat fallback.  ``compiled_prompt`` is always included for logging.
+    """
+    compiled_prompt = prompt_text(messages)
+    if os.getenv("DRRD_DRY_RUN", "").lower() in ("1", "true", "yes"):
+        stub = _dry_stub(compiled_prompt)
+        return {"result": {"raw": {}, "text": stub["text"]}, "compiled_prompt": compiled_prompt}
+
+    cfg = load_config()
+    if cfg.get("dry_run", {}).get("enabled", False):
+        fixtures_dir = Path(cfg.get("dry_run", {}).get("fixtures_dir", "tests/fixtures"))
+        path = fixtures_dir / "llm" / "plan_seed.json"
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            result = {"raw": data, "text": data.get("text", "")}
+        except Exception:
+            result = {"raw": {}, "text": ""}
+        return {"result": result, "compiled_prompt": compiled_prompt}
+
+    if web_search_requested:
+        tools = [{"type": "web_search_preview"}]
+        if tool_choice is None:
+            tool_choice = "auto"
+
+    params = _strip_provider_overrides(params)
+    for k in ["json_strict", "tool_use", "extra_keys"]:
+        params.pop(k, None)
+    if "llm_hints" in params:
+        params.pop("llm_hints", None)
+        logger.debug("Ignoring unsupported param: llm_hints")
+    if tools is not None:
+        params["tools"] = tools
+    if tool_choice is not None:
+        params["tool_choice"] = tool_choice
+    use_chat_for_seed = os.getenv("DRRD_USE_CHAT_FOR_SEEDED", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    seed = params.get("seed")
+    if seed is not None and use_chat_for_seed and response_format is None:
+        chat_params = {k: v for k, v in params.items() if k != "seed"}
+        return {
+            "seeded": {
+                "model": model,
+                "messages": _to_chat_messages(messages),
+                "seed": seed,
+                **chat_params,
+            },
+            "compiled_prompt": compiled_prompt,
+        }
+
+    params = _sanitize_responses_params(params)
+    if response_format is not None and _supports_response_format():
+        params["response_format"] = response_format
+    mode = os.getenv("MODE")
+    if params.get("temperature") is None and mode == "test":
+        params["temperature"] = 0.0
+    if "max_tokens" in params and "max_output_tokens" not in params:
+        params["max_output_tokens"] = params.pop("max_tokens")
+
+    resp_params = {k: v for k, v in params.items() if k != "temperature"}
+    payload = {
+        "model": model,
+        "input": _to_responses_input(messages),
+        **resp_params,
+    }
+    payload = _strip_provider_overrides(payload)
+    payload = _sanitize_responses_payload(payload)
+
+    chat_params = {k: v for k, v in params.items()}
+    if response_format is not None:
+        chat_params["response_format"] = response_format
+    if "max_output_tokens" in chat_params and "max_tokens" not in chat_params:
+        chat_params["max_tokens"] = chat_params.pop("max_output_tokens")
+    return {"payload": payload, "chat_params": chat_params, "compiled_prompt": compiled_prompt}
+
+
+def _retry_action(exc: Exception, attempt: int) -> tuple[str, int | None]:
+    """Classify a Responses API failure as ``retry``, ``fallback`` or ``raise``.
+
+    The second element is the HTTP status when ``exc`` carries one.
+    """
+    if isinstance(exc, _openai.APIStatusError):
+        status = exc.status_code
+        if status not in (404, 429, 500, 502, 503, 504):
+            return "raise", status
+        if status == 404:
+            return "fallback", status
+        return ("raise" if attempt == 3 else "retry"), status
+    if "404" not in str(exc).lower():
+        return ("raise" if attempt == 3 else "retry"), None
+    return "fallback", None
+
+
+def _backoff_delay(backoff: float) -> float:
+    return backoff + random.uniform(0, backoff)
+
+
+def _cached_request(req: dict[str, Any]) -> dict[str, Any]:
+    if "seeded" in req:
+        return {"seeded": req["seeded"]}
+    return {"payload": req["payload"], "chat_params": req["chat_params"]}
+
+
+class StreamReset(str):
+    """Sent to a token sink when a streamed attempt fails after some deltas.
+
+    The last ``chars`` characters delivered for the call are void; the retry
+    (or Chat fallback) delivers the text again from the start.  It is an empty
+    string, so sinks that merely concatenate are unaffected.
+    """
+
+    chars: int
+
+    def __new__(cls, chars: int) -> "StreamReset":
+        obj = super().__new__(cls, "")
+        obj.chars = chars
+        return obj
+
+
+class _AttemptSink:
+    """Forward deltas to ``sink``, counting what the current attempt sent."""
+
+    def __init__(self, sink: Callable[[str], None]) -> None:
+        self.sink = sink
+        self.emitted = 0
+
+    def __call__(self, delta: str) -> None:
+        self.emitted += len(delta)
+        self.sink(delta)
+
+    def reset(self) -> None:
+        if self.emitted:
+            self.sink(StreamReset(self.emitted))
+            self.emitted = 0
+
+
+@contextmanager
+def stream_tokens(sink: Callable[[str], None]) -> Iterator[None]:
+    """Stream text deltas of LLM calls made in this context to ``sink``.
+
+    Responses API calls switch to ``stream=True``; calls that cannot stream
+    (seeded Chat requests, the Chat fallback, cache hits) deliver their whole
+    text to ``sink`` once they complete.  If a stream fails part-way, ``sink``
+    receives a :class:`StreamReset` before the call's text is sent again.
+    """
+    token = _token_sink.set(sink)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+def _stream_event(event: Any, chunks: list[str], sink: Callable[[str], None] | None) -> Any:
+    """Handle one Responses stream event; return the final response if present."""
+    etype = getattr(event, "type", "")
+    if etype == "response.output_text.delta":
+        delta = getattr(event, "delta", "") or ""
+        if delta:
+            chunks.append(delta)
+            if sink is not None:
+                sink(delta)
+    elif etype in ("response.completed", "response.incomplete"):
+        return getattr(event, "response", None)
+    elif etype in ("response.failed", "error"):
+        err = getattr(getattr(event, "response", None), "error", None) or getattr(
+            event, "message", None
+        )
+        raise RuntimeError(f"Responses stream failed: {err}")
+    return None
+
+
+def _stream_result(final: Any, chunks: list[str]) -> Any:
+    # The completed event carries usage; fall back to a bare stand-in if the
+    # stream ended without one.
+    if final is not None:
+        return final
+    return SimpleNamespace(output_text="".join(chunks), output=[], usage=None)
+
+
+def _consume_stream(stream: Any, sink: Callable[[str], None] | None) -> Any:
+    chunks: list[str] = []
+    final = None
+    for event in stream:
+        final = _stream_event(event, chunks, sink) or final
+    return _stream_result(final, chunks)
+
+
+async def _aconsume_stream(stream: Any, sink: Callable[[str], None] | None) -> Any:
+    chunks: list[str] = []
+    final = None
+    async for event in stream:
+        final = _stream_event(event, chunks, sink) or final
+    return _stream_result(final, chunks)
+
+
+def _flush_to_sink(result: dict[str, Any], status: dict[str, Any]) -> None:
+    """Hand non-streamed text to the active token sink in one piece."""
+    sink = _token_sink.get()
+    if sink is None or (status.get("streamed") and not result.get("cached")):
+        return
+    if result.get("text"):
+        sink(result["text"])
+
+
+def _max_output_tokens(req: dict[str, Any]) -> int | None:
+    if "seeded" in req:
+        return req["seeded"].get("max_tokens")
+    return req["payload"].get("max_output_tokens")
+
+
+def _dispatch(
+    req: dict[str, Any],
+    *,
+    model: str,
+    messages: list[dict[str, Any]],
+    meta: dict[str, Any],
+    status: dict[str, Any],
+) -> dict[str, Any]:
+    """Send a prepared request, retrying Responses before falling back to Chat.
+
+    ``status["code"]`` tracks the last HTTP status for the end-of-call log.
+    Every provider request passes through :mod:`core.llm.rate_limit`.
+    """
+    from core.llm import rate_limit
+
+    compiled_prompt = req["compiled_prompt"]
+    est = rate_limit.estimate_tokens(compiled_prompt, _max_output_tokens(req), model)
+
+    def limited(call: Any) -> Any:
+        return rate_limit.limited_call("openai", model, est, call)
+
+    if "seeded" in req:
+        logger.info("Using chat.completions for seeded request")
+        client = _client()
+        resp = limited(lambda: client.chat.completions.create(**req["seeded"]))
+        status["code"] = getattr(resp, "http_status", 200)
+        text = extract_text(resp)
+        return {"raw": resp, "text": text}
+
+    payload = req["payload"]
+    sink = _token_sink.get()
+    attempt_sink = _AttemptSink(sink) if sink is not None else None
+    streaming = sink is not None or bool(payload.get("stream"))
+    if streaming:
+        payload = {**payload, "stream": True}
+    logger.info("call_openai: model=%s api=Responses stream=%s", model, streaming)
+    backoff = 0.1
+    client = _client()
+
+    def create() -> Any:
+        if streaming:
+            return _consume_stream(client.responses.create(**payload), attempt_sink)
+        return client.responses.create(**payload)
+
+    for attempt in range(4):
+        try:
+            resp = instrumented_api_call(
+                api_name="openai.responses",
+                endpoint="/responses",
+                params=payload,
+                prompt_text=compiled_prompt,
+                call=lambda: limited(create),
+                task_id=meta.get("task_id", ""),
+                agent=meta.get("agent", ""),
+            )
+            status["code"] = getattr(resp, "http_status", 200)
+            status["streamed"] = streaming
+            text = extract_text(resp)
+            return {"raw": resp, "text": text}
+        except TypeError:
+            logger.error("OpenAI kwargs error", extra={"keys": sorted(payload.keys())})
+            raise
+        except Exception as e:
+            if attempt_sink is not None:
+                attempt_sink.reset()
+            action, code = _retry_action(e, attempt)
+            if code is not None:
+                status["code"] = code
+            if action == "raise":
+                raise
+            if action == "fallback":
+                break
+            time.sleep(_backoff_delay(backoff))
+            backoff *= 2
+
+    chat_params = req["chat_params"]
+    logger.info("call_openai: model=%s api=Chat", model)
+    client = _client()
+    resp = instrumented_api_call(
+        api_name="openai.chat.completions",
+        endpoint="/chat/completions",
+        params={"model": model, "messages": _to_chat_messages(messages), **chat_params},
+        prompt_text=compiled_prompt,
+        call=lambda: limited(
+            lambda: client.chat.completions.create(
+                model=model, messages=_to_chat_messages(messages), **chat_params
+            )
+        ),
+        task_id=meta.get("task_id", ""),
+        agent=meta.get("agent", ""),
+    )
+    status["code"] = getattr(resp, "http_status", 200)
+    text = extract_text(resp)
+    return {"raw": resp, "text": text}
+
+
+async def _adispatch(
+    req: dict[str, Any],
     *,
     model: str,
     messages: list[dict[str, Any]],
+    meta: dict[str, Any],
+    status: dict[str, Any],
+) -> dict[str, Any]:
+    """Asyncio counterpart of :func:`_dispatch`."""
+    from core.llm import rate_limit
+
+    compiled_prompt = req["compiled_prompt"]
+    est = rate_limit.estimate_tokens(compiled_prompt, _max_output_tokens(req), model)
+
+    def limited(call: Any) -> Any:
+        return rate_limit.alimited_call("openai", model, est, call)
+
+    client = _async_client()
+    if "seeded" in req:
+        logger.info("Using chat.completions for seeded request")
+        resp = await limited(lambda: client.chat.completions.create(**req["seeded"]))
+        status["code"] = getattr(resp, "http_status", 200)
+        return {"raw": resp, "text": extract_text(resp)}
+
+    payload = req["payload"]
+    sink = _token_sink.get()
+    attempt_sink = _AttemptSink(sink) if sink is not None else None
+    streaming = sink is not None or bool(payload.get("stream"))
+    if streaming:
+        payload = {**payload, "stream": True}
+    logger.info("acall_openai: model=%s api=Responses stream=%s", model, streaming)
+    backoff = 0.1
+
+    async def create() -> Any:
+        if streaming:
+            return await _aconsume_stream(await client.responses.create(**payload), attempt_sink)
+        return await client.responses.create(**payload)
+
+    for attempt in range(4):
+        try:
+            resp = await ainstrumented_api_call(
+                api_name="openai.responses",
+                endpoint="/responses",
+                params=payload,
+                prompt_text=compiled_prompt,
+                call=lambda: limited(create),
+                task_id=meta.get("task_id", ""),
+                agent=meta.get("agent", ""),
+            )
+            status["code"] = getattr(resp, "http_status", 200)
+            status["streamed"] = streaming
+            return {"raw": resp, "text": extract_text(resp)}
+        except TypeError:
+            logger.error("OpenAI kwargs error", extra={"keys": sorted(payload.keys())})
+            raise
+        except Exception as e:
+            if attempt_sink is not None:
+                attempt_sink.reset()
+            action, code = _retry_action(e, attempt)
+            if code is not None:
+                status["code"] = code
+            if action == "raise":
+                raise
+            if action == "fallback":
+                break
+            await asyncio.sleep(_backoff_delay(backoff))
+            backoff *= 2
+
+    chat_params = req["chat_params"]
+    chat_messages = _to_chat_messages(messages)
+    logger.info("acall_openai: model=%s api=Chat", model)
+    resp = await ainstrumented_api_call(
+        api_name="openai.chat.completions",
+        endpoint="/chat/completions",
+        params={"model": model, "messages": chat_messages, **chat_params},
+        prompt_text=compiled_prompt,
+        call=lambda: limited(
+            lambda: client.chat.completions.create(
+                model=model, messages=chat_messages, **chat_params
+            )
+        ),
+        task_id=meta.get("task_id", ""),
+        agent=meta.get("agent", ""),
+    )
+    status["code"] = getattr(resp, "http_status", 200)
+    return {"raw": resp, "text": extract_text(resp)}
+
+
+def call_openai(
+    *,
+    model: str | None = None,
+    messages: list[dict[str, Any]],
     response_format: dict[str, Any] | None = None,
     meta: dict[str, Any] | None = None,
     response_params: dict[str, Any] | None = None,
@@ -304,30 +779,28 @@ def call_openai(
     enable_web_search: bool | None = None,
     **kwargs,
 ) -> dict[str, Any]:
-    """Call OpenAI with automatic routing between Responses and Chat APIs."""
-    from dr_rd.config.env import get_env
-
-    api_key = get_env("OPENAI_API_KEY")
-    if not api_key:
-        message = "OPENAI_API_KEY not configured"
-        logger.error(message)
-        try:
-            client = get_cloud_logging_client()
-            if client:
-                client.logger("drrd").log_text(message, severity="ERROR")
-        except Exception:
-            pass
+    """Call OpenAI with automatic routing between Responses and Chat APIs.
+
+    When ``LLM_CACHE_ENABLED`` is set, identical requests are served from
+    :mod:`core.llm.response_cache` and the result carries ``cached`` naming
+    the layer that answered (``memory``, ``disk`` or ``inflight``).  Inside
+    :func:`stream_tokens` the Responses call streams and text deltas are
+    forwarded as they arrive; the returned ``raw`` is the completed response.
+    Without ``model`` the router picks one for ``meta["purpose"]``, sized to
+    the prompt.
+    """
+    if not _api_key_configured():
         return {"raw": {}, "text": ""}
 
     request_id = uuid.uuid4().hex
     t0 = time.monotonic()
     meta = meta or {}
+    if not model:
+        model = _route_model(messages, meta)
     kwargs.pop("api", None)
     params = {**(response_params or {}), **kwargs}
     params.pop("provider", None)
-    tool_use = params.get("tool_use")
     web_search_requested = _openai_web_search_requested(enable_web_search)
-    kwargs.pop("api", "Responses")
 
     logger.info(
         "LLM start req=%s model=%s purpose=%s agent=%s",
@@ -337,150 +810,123 @@ def call_openai(
         meta.get("agent"),
     )
 
-    http_status_or_exc: int | str = "EXC"
+    status: dict[str, Any] = {"code": "EXC"}
     try:
-        compiled_prompt = " \n".join(
-            m.get("content", "") if isinstance(m.get("content", ""), str) else "" for m in messages
+        req = _prepare_request(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            params=params,
+            tools=tools,
+            tool_choice=tool_choice,
+            web_search_requested=web_search_requested,
         )
-        if os.getenv("DRRD_DRY_RUN", "").lower() in ("1", "true", "yes"):
-            stub = _dry_stub(compiled_prompt)
-            http_status_or_exc = 0
-            return {"raw": {}, "text": stub["text"]}
-
-        cfg = load_config()
-        if cfg.get("dry_run", {}).get("enabled", False):
-            fixtures_dir = Path(cfg.get("dry_run", {}).get("fixtures_dir", "tests/fixtures"))
-            path = fixtures_dir / "llm" / "plan_seed.json"
-            try:
-                with open(path, encoding="utf-8") as fh:
-                    data = json.load(fh)
-                http_status_or_exc = 0
-                return {"raw": data, "text": data.get("text", "")}
-            except Exception:
-                http_status_or_exc = 0
-                return {"raw": {}, "text": ""}
-
-        if web_search_requested:
-            tools = [{"type": "web_search_preview"}]
-            if tool_choice is None:
-                tool_choice = "auto"
-
-        params = _strip_provider_overrides(params)
-        for k in ["json_strict", "tool_use", "extra_keys"]:
-            params.pop(k, None)
-        if "llm_hints" in params:
-            params.pop("llm_hints", None)
-            logger.debug("Ignoring unsupported param: llm_hints")
-        if tools is not None:
-            params["tools"] = tools
-        if tool_choice is not None:
-            params["tool_choice"] = tool_choice
-        use_chat_for_seed = os.getenv("DRRD_USE_CHAT_FOR_SEEDED", "false").lower() in (
-            "1",
-            "true",
-            "yes",
+        if "result" in req:
+            status["code"] = 0
+            return req["result"]
+
+        def send() -> dict[str, Any]:
+            return _dispatch(req, model=model, messages=messages, meta=meta, status=status)
+
+        from core.llm import response_cache
+
+        cache = response_cache.get_cache()
+        key = response_cache.request_key("openai", model, _cached_request(req)) if cache else None
+        if key is None:
+            result = send()
+        else:
+            result, layer = cache.get_or_call(key, send, model=model, meta=meta)
+            if layer is not None:
+                status["code"] = f"cache:{layer}"
+                result = {**result, "cached": layer}
+        _flush_to_sink(result, status)
+        return result
+    finally:
+        duration_ms = int((time.monotonic() - t0) * 1000)
+        logger.info(
+            "LLM end   req=%s status=%s duration_ms=%d",
+            request_id,
+            status["code"],
+            duration_ms,
         )
-        seed = params.get("seed")
-        if seed is not None and use_chat_for_seed and response_format is None:
-            chat_params = {k: v for k, v in params.items() if k != "seed"}
-            logger.info("Using chat.completions for seeded request")
-            client = _client()
-            resp = client.chat.completions.create(
-                model=model,
-                messages=_to_chat_messages(messages),
-                seed=seed,
-                **chat_params,
-            )
-            http_status_or_exc = getattr(resp, "http_status", 200)
-            text = extract_text(resp)
-            return {"raw": resp, "text": text}
 
-        params = _sanitize_responses_params(params)
-        if response_format is not None and _supports_response_format():
-            params["response_format"] = response_format
-        mode = os.getenv("MODE")
-        if params.get("temperature") is None and mode == "test":
-            params["temperature"] = 0.0
-        if "max_tokens" in params and "max_output_tokens" not in params:
-            params["max_output_tokens"] = params.pop("max_tokens")
-
-        resp_params = {k: v for k, v in params.items() if k != "temperature"}
-        payload = {
-            "model": model,
-            "input": _to_responses_input(messages),
-            **resp_params,
-        }
-        payload = _strip_provider_overrides(payload)
-        payload = _sanitize_responses_payload(payload)
-        logger.info("call_openai: model=%s api=Responses", model)
-        backoff = 0.1
-        client = _client()
-        for attempt in range(4):
-            try:
-                resp = instrumented_api_call(
-                    api_name="openai.responses",
-                    endpoint="/responses",
-                    params=payload,
-                    prompt_text=compiled_prompt,
-                    call=lambda: client.responses.create(**payload),
-                    task_id=meta.get("task_id", "") if meta else "",
-                    agent=meta.get("agent", "") if meta else "",
-                )
-                http_status_or_exc = getattr(resp, "http_status", 200)
-                text = extract_text(resp)
-                return {"raw": resp, "text": text}
-            except TypeError as e:
-                logger.error("OpenAI kwargs error", extra={"keys": sorted(payload.keys())})
-                raise
-            except _openai.APIStatusError as e:
-                http_status_or_exc = e.status_code
-                if e.status_code not in (404, 429, 500, 502, 503, 504):
-                    raise
-                if e.status_code == 404:
-                    break
-                if attempt == 3:
-                    raise
-                time.sleep(backoff + random.uniform(0, backoff))
-                backoff *= 2
-            except Exception as e:
-                msg = str(e).lower()
-                if "404" not in msg:
-                    if attempt == 3:
-                        raise
-                    time.sleep(backoff + random.uniform(0, backoff))
-                    backoff *= 2
-                    continue
-                break
 
-        chat_params = {k: v for k, v in params.items()}
-        if response_format is not None:
-            chat_params["response_format"] = response_format
-        if "max_output_tokens" in chat_params and "max_tokens" not in chat_params:
-            chat_params["max_tokens"] = chat_params.pop("max_output_tokens")
-        logger.info("call_openai: model=%s api=Chat", model)
-        client = _client()
-        resp = instrumented_api_call(
-            api_name="openai.chat.completions",
-            endpoint="/chat/completions",
-            params={"model": model, "messages": _to_chat_messages(messages), **chat_params},
-            prompt_text=compiled_prompt,
-            call=lambda: client.chat.completions.create(
-                model=model, messages=_to_chat_messages(messages), **chat_params
-            ),
-            task_id=meta.get("task_id", "") if meta else "",
-            agent=meta.get("agent", "") if meta else "",
+async def acall_openai(
+    *,
+    model: str | None = None,
+    messages: list[dict[str, Any]],
+    response_format: dict[str, Any] | None = None,
+    meta: dict[str, Any] | None = None,
+    response_params: dict[str, Any] | None = None,
+    tools: list[dict[str, Any]] | None = None,
+    tool_choice: Any | None = None,
+    enable_web_search: bool | None = None,
+    **kwargs,
+) -> dict[str, Any]:
+    """Asyncio counterpart of :func:`call_openai` backed by ``AsyncOpenAI``.
+
+    Request shaping, retry policy, the Chat Completions fallback and response
+    caching match the blocking path; backoff uses ``asyncio.sleep`` so
+    concurrent calls share a single event loop instead of one thread each.
+    """
+    if not _api_key_configured():
+        return {"raw": {}, "text": ""}
+
+    request_id = uuid.uuid4().hex
+    t0 = time.monotonic()
+    meta = meta or {}
+    if not model:
+        model = _route_model(messages, meta)
+    kwargs.pop("api", None)
+    params = {**(response_params or {}), **kwargs}
+    params.pop("provider", None)
+    web_search_requested = _openai_web_search_requested(enable_web_search)
+
+    logger.info(
+        "LLM start req=%s model=%s purpose=%s agent=%s async=1",
+        request_id,
+        model,
+        meta.get("purpose"),
+        meta.get("agent"),
+    )
+
+    status: dict[str, Any] = {"code": "EXC"}
+    try:
+        req = _prepare_request(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            params=params,
+            tools=tools,
+            tool_choice=tool_choice,
+            web_search_requested=web_search_requested,
         )
-        http_status_or_exc = getattr(resp, "http_status", 200)
-        text = extract_text(resp)
-        return {"raw": resp, "text": text}
-    except Exception:
-        raise
+        if "result" in req:
+            status["code"] = 0
+            return req["result"]
+
+        def send() -> Any:
+            return _adispatch(req, model=model, messages=messages, meta=meta, status=status)
+
+        from core.llm import response_cache
+
+        cache = response_cache.get_cache()
+        key = response_cache.request_key("openai", model, _cached_request(req)) if cache else None
+        if key is None:
+            result = await send()
+        else:
+            result, layer = await cache.aget_or_call(key, send, model=model, meta=meta)
+            if layer is not None:
+                status["code"] = f"cache:{layer}"
+                result = {**result, "cached": layer}
+        _flush_to_sink(result, status)
+        return result
     finally:
         duration_ms = int((time.monotonic() - t0) * 1000)
         logger.info(
             "LLM end   req=%s status=%s duration_ms=%d",
             request_id,
-            http_status_or_exc,
+            status["code"],
             duration_ms,
         )
 
@@ -496,10 +942,30 @@ ALLOWED_PARAMS = {
 }
 
 
-def set_budget_manager(budget: BudgetManager | CostTracker | None) -> None:
-    """Install a cost tracker for logging only."""
-    global BUDGET
+def set_budget_manager(budget: BudgetManager | CostTracker | None, enforce: bool = False) -> None:
+    """Install a cost tracker; with ``enforce`` calls that cannot be afforded raise."""
+    global BUDGET, ENFORCE_BUDGET
     BUDGET = budget
+    ENFORCE_BUDGET = enforce
+
+
+def _check_budget(call_kwargs: dict[str, Any], stage: str, params: dict[str, Any]) -> None:
+    """Raise :class:`BudgetExceeded` if the counted prompt no longer fits ``BUDGET``."""
+    if not ENFORCE_BUDGET or BUDGET is None:
+        return
+    from core.llm import rate_limit
+
+    out = params.get("max_output_tokens") or params.get("max_tokens")
+    model = call_kwargs["model"]
+    if not BUDGET.can_afford(
+        stage,
+        model,
+        0,
+        int(out or rate_limit.DEFAULT_OUTPUT_TOKENS),
+        prompt=call_kwargs["messages"],
+    ):
+        BUDGET.skipped_due_to_budget += 1
+        raise BudgetExceeded(f"budget exhausted before {stage} call to {model}")
 
 
 def log_usage(stage, model, pt, ct, cost=0.0):
@@ -578,18 +1044,15 @@ def log_usage(stage, model, pt, ct, cost=0.0):
     }
 
 
-def llm_call(
-    client,
+def _llm_call_kwargs(
     model_id: str,
-    stage: str,
     messages: list,
-    seed: int | None = None,
-    temperature: float | None = None,
-    enable_web_search: bool | None = None,
-    enforce_json: bool = False,
-    **params,
-):
-    """Backward-compatible wrapper around :func:`call_openai`."""
+    seed: int | None,
+    temperature: float | None,
+    enable_web_search: bool | None,
+    enforce_json: bool,
+    params: dict[str, Any],
+) -> dict[str, Any]:
     tool_use = params.get("tool_use")
     provider = params.get("provider", "openai")
     safe = {k: v for k, v in params.items() if k in ALLOWED_PARAMS}
@@ -601,16 +1064,23 @@ def llm_call(
     response_format = (
         {"type": "json_object"} if enforce_json else safe.pop("response_format", None)
     )
-    chosen_model = _choose_model_for_search(provider, model_id, tool_use)
-    result = call_openai(
-        model=chosen_model,
-        messages=messages,
-        response_format=response_format,
-        response_params=safe,
-        enable_web_search=enable_web_search,
-    )
-    resp = result["raw"]
+    return {
+        "model": _choose_model_for_search(provider, model_id, tool_use),
+        "messages": messages,
+        "response_format": response_format,
+        "response_params": safe,
+        "enable_web_search": enable_web_search,
+    }
+
+
+def _account_usage(resp: Any, model: str, stage: str, cached: bool = False) -> Any:
+    """Record token usage and cost for ``resp`` and annotate it in place.
 
+    Cached responses consumed no provider tokens, so they are annotated with
+    their original token counts but not charged to ``METER``/``BUDGET``.
+    Prompt tokens the provider served from its prefix cache are reported as
+    ``cached_tokens`` so the hit rate can be tracked per stage.
+    """
     usage_obj = getattr(resp, "usage", None)
     if usage_obj is None and getattr(resp, "choices", None):
         usage_obj = getattr(resp.choices[0], "usage", None)
@@ -626,19 +1096,72 @@ def llm_call(
             "completion_tokens": getattr(usage_obj, "completion_tokens", 0),
             "total_tokens": getattr(usage_obj, "total_tokens", 0),
         }
+    usage["cached_tokens"] = usage_tokens(usage_obj)[1]
 
     cost = 0.0
-    METER.add_usage(chosen_model, stage, usage)
-    if BUDGET:
-        cost = BUDGET.consume(
-            usage["prompt_tokens"], usage["completion_tokens"], chosen_model, stage=stage
-        )
-
-    log_usage(stage, chosen_model, usage["prompt_tokens"], usage["completion_tokens"], cost)
+    if not cached:
+        METER.add_usage(model, stage, usage)
+        if BUDGET:
+            cost = BUDGET.consume(
+                usage["prompt_tokens"],
+                usage["completion_tokens"],
+                model,
+                stage=stage,
+                cached_tokens=usage["cached_tokens"],
+            )
+        log_usage(stage, model, usage["prompt_tokens"], usage["completion_tokens"], cost)
     try:
         resp.tokens_in = usage["prompt_tokens"]
         resp.tokens_out = usage["completion_tokens"]
+        resp.cached_tokens = usage["cached_tokens"]
         resp.cost_usd = cost
     except Exception:
         pass
     return resp
+
+
+def llm_call(
+    client,
+    model_id: str,
+    stage: str,
+    messages: list,
+    seed: int | None = None,
+    temperature: float | None = None,
+    enable_web_search: bool | None = None,
+    enforce_json: bool = False,
+    **params,
+):
+    """Backward-compatible wrapper around :func:`call_openai`."""
+    call_kwargs = _llm_call_kwargs(
+        model_id, messages, seed, temperature, enable_web_search, enforce_json, params
+    )
+    _check_budget(call_kwargs, stage, params)
+    result = call_openai(**call_kwargs)
+    return _account_usage(
+        result["raw"], call_kwargs["model"], stage, cached=bool(result.get("cached"))
+    )
+
+
+async def allm_call(
+    model_id: str,
+    stage: str,
+    messages: list,
+    seed: int | None = None,
+    temperature: float | None = None,
+    enable_web_search: bool | None = None,
+    enforce_json: bool = False,
+    **params,
+):
+    """Asyncio counterpart of :func:`llm_call` using :func:`acall_openai`.
+
+    Usage is recorded through the same ``METER``/``BUDGET``/``log_usage``
+    accounting as the blocking path.
+    """
+    call_kwargs = _llm_call_kwargs(
+        model_id, messages, seed, temperature, enable_web_search, enforce_json, params
+    )
+    _check_budget(call_kwargs, stage, params)
+    result = await acall_openai(**call_kwargs)
+    return _account_usage(
+        result["raw"], call_kwargs["model"], stage, cached=bool(result.get("cached"))
+    )
@@ -1,6 +1,9 @@
+import contextvars
 import json
 import os
+import queue
 import re
+import threading
 from collections import defaultdict
 from dataclasses import asdict, dataclass
 from datetime import datetime
@@ -11,12 +14,13 @@ from typing import Any
 import streamlit as st
 
 import config.feature_flags as ff
+from config import MAX_CONCURRENCY
 from core.agents.evaluation_agent import EvaluationAgent
 from core.agents.runtime import invoke_agent_safely
 from core.agents.unified_registry import AGENT_REGISTRY
 from core.evaluation.self_check import PLACEHOLDER_RETRY_MSG, validate_and_retry
 from core.llm import complete, select_model
-from core.llm_client import responses_json_schema_for
+from core.llm_client import StreamReset, responses_json_schema_for, stream_tokens
 from core.observability import (
     AgentTraceCollector,
     EvidenceSet,
@@ -43,6 +47,7 @@ from utils.telemetry import (
     resume_failed,
     run_resumed,
     safety_flagged_step,
+    stream_chunked,
     stream_completed,
     stream_started,
     tasks_normalized,
@@ -1220,29 +1225,33 @@ def execute_plan(
         qa_tasks = [t for t in norm_tasks if (t.get("role") == "QA")]
         exec_only = [t for t in norm_tasks if t.get("role") != "QA"]
         if ff.PARALLEL_EXEC_ENABLED:
-            from types import SimpleNamespace
-
-            from core.engine.executor import run_tasks
+            from core.engine.executor import run_dag
 
             exec_tasks: list[dict[str, str]] = []
             for i, t in enumerate(exec_only, 1):
                 tmp = dict(t)
                 tmp.setdefault("id", f"T{i:02d}")
                 tmp.setdefault("task", tmp.get("description", ""))
+                tmp.setdefault("created_at", i)
                 exec_tasks.append(tmp)
 
-            class _State:
-                def __init__(self):
-                    self.ws = SimpleNamespace(
-                        read=lambda: {"results": {}},
-                        save_result=lambda _id, _res, _score: None,
-                    )
-
-                def _execute(self, task: dict[str, str]):
-                    _run_task(task)
-                    return None, 0.0
-
-            run_tasks(exec_tasks, state=_State())
+            def _execute(task: dict[str, str]):
+                _run_task(task)
+                return None, 0.0
+
+            # Agents are cached per role in ``agents`` and append to
+            # ``answers[role]``, so each role runs one task at a time.
+            dag = run_dag(
+                exec_tasks,
+                _execute,
+                max_workers=MAX_CONCURRENCY,
+                default_role_limit=1,
+                check=_check,
+            )
+            for t in dag["pending"]:
+                logger.warning("executor.dependency_cycle task=%s", t.get("id"))
+                _run_task(t)
+                _check()
         else:
             for t in exec_only:
                 _run_task(t)
@@ -1901,6 +1910,66 @@ def orchestrate(*args, resume_from: str | None = None, **kwargs):
     return final
 
 
+def _stream_phase(phase: str, fn, run_id: str | None = None):
+    """Run ``fn`` on a worker thread, yielding its LLM text as ``token`` events.
+
+    Use with ``yield from``; evaluates to ``fn()``'s return value and re-raises
+    its exception.  Deltas that arrive together are coalesced into one event.
+    A stream that failed part-way yields ``token_reset`` with ``meta["chars"]``:
+    consumers drop that many trailing characters before the retried call
+    streams its text again.
+    """
+    q: queue.Queue = queue.Queue()
+    done = object()
+    box: dict[str, Any] = {}
+
+    def target() -> None:
+        try:
+            with stream_tokens(q.put):
+                box["result"] = fn()
+        except BaseException as exc:  # re-raised on the generator side
+            box["error"] = exc
+        finally:
+            q.put(done)
+
+    ctx = contextvars.copy_context()
+    worker = threading.Thread(target=ctx.run, args=(target,), name=f"stream-{phase}", daemon=True)
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+        add_script_run_ctx(worker)
+    except Exception:
+        pass
+    worker.start()
+    chunks = 0
+    finished = False
+    while not finished:
+        pieces = [q.get()]
+        while not q.empty():
+            pieces.append(q.get_nowait())
+        if pieces[-1] is done:
+            pieces.pop()
+            finished = True
+        text = ""
+        for piece in pieces:
+            if isinstance(piece, StreamReset):
+                drop = piece.chars - len(text)
+                text = text[: max(0, len(text) - piece.chars)]
+                if drop > 0:  # part of the void text was already yielded
+                    yield Event("token_reset", phase=phase, meta={"chars": drop})
+            else:
+                chunks += 1
+                text += piece
+        if text:
+            yield Event("token", phase=phase, text=text)
+    worker.join()
+    if chunks and run_id:
+        stream_chunked(run_id, chunks)
+    if "error" in box:
+        raise box["error"]
+    return box.get("result")
+
+
 def run_stream(
     idea: str,
     *,
@@ -1937,7 +2006,13 @@ def run_stream(
                 ) as span:
                     span.add_event("step.start", {"step_id": "planner"})
                     try:
-                        generate_plan(idea, cancel=cancel, deadline_ts=deadline_ts, run_ctx=run_ctx)
+                        yield from _stream_phase(
+                            "planner",
+                            lambda: generate_plan(
+                                idea, cancel=cancel, deadline_ts=deadline_ts, run_ctx=run_ctx
+                            ),
+                            run_id,
+                        )
                         tasks = st.session_state.get("plan_tasks", [])
                     except TimeoutError as exc:
                         span.set_attribute("status", "timeout")
@@ -2105,11 +2180,15 @@ def run_stream(
                 ) as span:
                     span.add_event("step.start", {"step_id": "synth"})
                     try:
-                        final = compose_final_proposal(
-                            idea,
-                            answers,
-                            cancel=cancel,
-                            deadline_ts=deadline_ts,
+                        final = yield from _stream_phase(
+                            "synth",
+                            lambda: compose_final_proposal(
+                                idea,
+                                answers,
+                                cancel=cancel,
+                                deadline_ts=deadline_ts,
+                            ),
+                            run_id,
                         )
                     except TimeoutError as exc:
                         span.set_attribute("status", "timeout")
@@ -0,0 +1,175 @@
+"""Shared multi-pattern scanner for the PII, secret and safety detectors.
+
+A :class:`PatternScanner` holds a named set of compiled regexes and reports
+their matches as :class:`Span` objects; each caller (redaction, safety checks,
+upload screening, compartment checks) applies its own policy to the spans.
+
+Most text matches none of the patterns, so a scan first answers "can this
+pattern match at all?" as cheaply as possible:
+
+* a pattern with a *prefilter* (a small regex that every match must contain,
+  e.g. ``@`` for e-mail addresses) is only run when the prefilter is found;
+* the remaining patterns are compiled into one alternation, and a single
+  search over the text rules all of them out at once.
+
+Only the patterns that survive are run with ``finditer``.  An alternation
+reports one match per position, so it cannot list matches of one pattern that
+overlap an earlier match of another; the per-pattern pass keeps the spans
+identical to running every pattern on its own.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
+
+PatternLike = Union[str, "re.Pattern[str]"]
+
+_GLOBAL_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+
+@dataclass(frozen=True)
+class Span:
+    category: Hashable
+    start: int
+    end: int
+    text: str
+
+
+def _compile(pattern: PatternLike, flags: int) -> "re.Pattern[str]":
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern, flags)
+
+
+def _scoped(pattern: "re.Pattern[str]") -> str:
+    """``pattern`` as a group carrying its own flags, for use inside an alternation."""
+    source = _GLOBAL_FLAGS_RE.sub("", pattern.pattern, count=1)
+    flags = "".join(ch for flag, ch in _SCOPED_FLAGS if pattern.flags & flag)
+    if pattern.flags & re.VERBOSE:
+        source += "\n"  # a trailing comment must not swallow the closing paren
+    return f"(?{flags}:{source})" if flags else f"(?:{source})"
+
+
+def _alternation(patterns: Iterable["re.Pattern[str]"]) -> Optional["re.Pattern[str]"]:
+    patterns = list(patterns)
+    if not patterns or any(_BACKREF_RE.search(p.pattern) for p in patterns):
+        return None  # group numbers shift once patterns are joined
+    try:
+        return re.compile("|".join(_scoped(p) for p in patterns))
+    except re.error:  # e.g. the same group name in two patterns
+        return None
+
+
+class PatternScanner:
+    """Scan text against ``patterns`` (category -> regex) in insertion order.
+
+    ``prefilters`` maps a category to a regex that every match of its pattern
+    is guaranteed to contain.  A wrong prefilter hides matches, so keep them
+    to literals the pattern cannot match without.
+    """
+
+    def __init__(
+        self,
+        patterns: Mapping[Hashable, PatternLike],
+        prefilters: Optional[Mapping[Hashable, PatternLike]] = None,
+        flags: int = 0,
+    ) -> None:
+        self.patterns: Dict[Hashable, "re.Pattern[str]"] = {
+            cat: _compile(p, flags) for cat, p in patterns.items()
+        }
+        self.prefilters: Dict[Hashable, "re.Pattern[str]"] = {
+            cat: _compile(p, 0) for cat, p in (prefilters or {}).items() if cat in self.patterns
+        }
+        self._combined: Dict[Tuple[Hashable, ...], Optional["re.Pattern[str]"]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def categories(self) -> Tuple[Hashable, ...]:
+        return tuple(self.patterns)
+
+    def _select(self, categories: Optional[Iterable[Hashable]]) -> List[Hashable]:
+        if categories is None:
+            return list(self.patterns)
+        return [c for c in categories if c in self.patterns]
+
+    def _alternation_for(self, cats: Tuple[Hashable, ...]) -> Optional["re.Pattern[str]"]:
+        with self._lock:
+            if cats not in self._combined:
+                self._combined[cats] = _alternation(self.patterns[c] for c in cats)
+            return self._combined[cats]
+
+    def candidates(
+        self, text: str, categories: Optional[Iterable[Hashable]] = None
+    ) -> List[Hashable]:
+        """Categories (in order) whose pattern may match ``text``; the rest cannot."""
+        cats = self._select(categories)
+        if not text or not cats:
+            return []
+        out = []
+        rest = []
+        for cat in cats:
+            pre = self.prefilters.get(cat)
+            if pre is None:
+                rest.append(cat)
+            elif pre.search(text):
+                out.append(cat)
+        if rest:
+            combined = self._alternation_for(tuple(rest))
+            if combined is None or combined.search(text):
+                out.extend(rest)
+        if len(out) > 1:
+            out.sort(key=cats.index)
+        return out
+
+    def scan(self, text: str, categories: Optional[Iterable[Hashable]] = None) -> List[Span]:
+        """Every match, ordered by category and then by position."""
+        spans: List[Span] = []
+        for cat in self.candidates(text, categories):
+            spans.extend(
+                Span(cat, m.start(), m.end(), m.group(0)) for m in self.patterns[cat].finditer(text)
+            )
+        return spans
+
+    def first(
+        self, text: str, categories: Optional[Iterable[Hashable]] = None
+    ) -> Dict[Hashable, Span]:
+        """The first match of each category that matches ``text``."""
+        found: Dict[Hashable, Span] = {}
+        for cat in self.candidates(text, categories):
+            m = self.patterns[cat].search(text)
+            if m:
+                found[cat] = Span(cat, m.start(), m.end(), m.group(0))
+        return found
+
+    def any(self, text: str, categories: Optional[Iterable[Hashable]] = None) -> bool:
+        return any(self.patterns[cat].search(text) for cat in self.candidates(text, categories))
+
+    def sub(self, text: str, token: str, categories: Optional[Iterable[Hashable]] = None) -> str:
+        """Replace every region matched by any category with ``token``.
+
+        Overlapping and adjacent matches are merged so each region is
+        replaced once, and the result is built in a single join.
+        """
+        spans = sorted(self.scan(text, categories), key=lambda s: (s.start, s.end))
+        if not spans:
+            return text
+        parts: List[str] = []
+        pos = 0
+        start, end = spans[0].start, spans[0].end
+        for span in spans[1:]:
+            if span.start <= end:
+                end = max(end, span.end)
+                continue
+            parts += [text[pos:start], token]
+            pos = end
+            start, end = span.start, span.end
+        parts += [text[pos:start], token, text[end:]]
+        return "".join(parts)
+
+
+__all__ = ["PatternScanner", "Span"]
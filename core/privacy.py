@@ -1,6 +1,6 @@
 # core/privacy.py
 from typing import Any, Dict, Iterable, Tuple, Optional
-from core.redaction import Redactor
+from core.redaction import Redactor, alias_pattern, replace_aliases
 
 _MODEL_REDACTOR = Redactor()
 _LOG_REDACTOR = Redactor()
@@ -51,12 +51,11 @@ def redact_for_logging(obj: Any) -> Any:
 
 def rehydrate_output(obj: Any, alias_map: Dict[str,str]) -> Any:
     rev = {v: k for k, v in alias_map.items()}
+    pattern = alias_pattern(rev)
 
     def walk(x):
         if isinstance(x, str):
-            for a, real in rev.items():
-                x = x.replace(a, real)
-            return x
+            return replace_aliases(x, rev, pattern)
         if isinstance(x, list):
             return [walk(i) for i in x]
         if isinstance(x, dict):
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
 import time
 import uuid
+from contextvars import ContextVar
 from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -14,12 +17,15 @@ from core.trace_models import RunMeta
 from core.audit_log import _hmac
 
 RUN_ID = time.strftime("%Y%m%d-%H%M%S")
-_BASE = Path("runs") / RUN_ID
+_BASE = Path(os.getenv("PROVENANCE_LOG_DIR", "runs")) / RUN_ID
 _FILE = _BASE / "provenance.jsonl"
 _REDACTIONS_FILE = _BASE / "provenance_redactions.jsonl"
 _RUN_META_FILE = _BASE / "run_meta.json"
 _EVENTS: List[Dict[str, Any]] = []
-_STACK: List[str] = []
+# Open span ids per execution context, so spans started on worker threads
+# (run under a copied context) nest under the span that was open at submit time.
+_STACK: ContextVar[tuple[str, ...]] = ContextVar("provenance_stack", default=())
+_WRITE_LOCK = threading.Lock()
 
 
 def _ensure_dir() -> None:
@@ -48,17 +54,18 @@ def start_span(name: str, meta: Optional[Dict[str, Any]] = None) -> str:
         return ""
     _ensure_dir()
     span_id = uuid.uuid4().hex
+    stack = _STACK.get()
     evt = {
         "id": span_id,
         "name": name,
-        "parent_id": _STACK[-1] if _STACK else None,
+        "parent_id": stack[-1] if stack else None,
         "t_start": time.time(),
         "agent": meta.get("agent") if meta else None,
         "tool": meta.get("tool") if meta else None,
         "meta": meta or {},
     }
     _EVENTS.append(evt)
-    _STACK.append(span_id)
+    _STACK.set(stack + (span_id,))
     return span_id
 
 
@@ -73,11 +80,13 @@ def end_span(span_id: str, ok: bool = True, meta: Optional[Dict[str, Any]] = Non
             evt["ok"] = ok
             if meta:
                 evt.setdefault("meta", {}).update(meta)
-            with _FILE.open("a", encoding="utf-8") as fh:
-                fh.write(json.dumps(evt) + "\n")
+            line = json.dumps(evt) + "\n"
+            with _WRITE_LOCK, _FILE.open("a", encoding="utf-8") as fh:
+                fh.write(line)
             break
-    if _STACK and _STACK[-1] == span_id:
-        _STACK.pop()
+    stack = _STACK.get()
+    if stack and stack[-1] == span_id:
+        _STACK.set(stack[:-1])
 
 
 def record_tool_provenance(
@@ -98,7 +107,7 @@ def get_events() -> List[Dict[str, Any]]:
 
 def reset() -> None:
     _EVENTS.clear()
-    _STACK.clear()
+    _STACK.set(())
 
 
 def append_redaction_event(target_hash: str, reason: str, redaction_token: str) -> None:
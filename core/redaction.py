@@ -1,10 +1,13 @@
 # core/redaction.py
 from __future__ import annotations
+import functools
 import re
 import random
 from dataclasses import dataclass, field
 from typing import Dict, Set, Tuple, Optional, Iterable
 
+from core.pattern_scan import PatternScanner
+
 PLACEHOLDER_RE = re.compile(r'^\[(SECRET|EMAIL|PHONE|IPV6|IP|ADDRESS|PERSON|ORG|DEVICE)_\d+\]$')
 TOKEN_FINDER_RE = re.compile(r'\[(PERSON|ORG|ADDRESS|IP|DEVICE)_\d+\]')
 
@@ -23,6 +26,46 @@ PATTERNS = {
     "DEVICE": re.compile(r'\b([A-Z]{2,}-\d{2,}|\bv\d+\.\d+\b|Rev\s+[A-Z])\b', re.I),
 }
 
+# Text every match of the pattern must contain; lets a scan skip a category
+# without running its (more expensive) pattern.
+PREFILTERS = {
+    "SECRET": re.compile(r'sk-|api', re.I),
+    "EMAIL": re.compile(r'@'),
+    "PHONE": re.compile(r'\d{3}[-.\s]\d{4}'),
+    "IP": re.compile(r'\d\.\d'),
+    "IPV6": re.compile(r'[A-F0-9]:[A-F0-9]', re.I),
+    "ADDRESS": re.compile(r'\b(?:St|Street|Rd|Road|Ave|Avenue|Blvd|Lane|Ln|Dr|Drive)\b', re.I),
+    "PERSON": re.compile(r'[A-Z][a-z]+\s+[A-Z][a-z]'),
+    "ORG": re.compile(r'Inc|LLC|Corp|Ltd|GmbH|AG|SA|Co'),
+    "DEVICE": re.compile(r'[A-Z]{2}-\d{2}|v\d+\.\d|Rev\s', re.I),
+}
+SCANNER = PatternScanner(PATTERNS, PREFILTERS)
+
+# Categories redacted in every mode except ``logging``.
+BASE_CATEGORIES = ["SECRET", "EMAIL", "PHONE", "IP", "IPV6"]
+
+
+@functools.lru_cache(maxsize=64)
+def _alias_regex(aliases: Tuple[str, ...]) -> "re.Pattern[str]":
+    return re.compile("|".join(map(re.escape, aliases)))
+
+
+def alias_pattern(aliases: Iterable[str]) -> Optional["re.Pattern[str]"]:
+    """One regex matching any of ``aliases``, longest first so ``AliceX1``
+    never matches inside ``AliceX12``.  Cached per alias set."""
+    ordered = tuple(sorted({a for a in aliases if a}, key=lambda a: (-len(a), a)))
+    return _alias_regex(ordered) if ordered else None
+
+
+def replace_aliases(
+    text: str, mapping: Dict[str, str], pattern: Optional["re.Pattern[str]"] = None
+) -> str:
+    """Replace every key of ``mapping`` found in ``text`` in a single pass."""
+    pattern = pattern or alias_pattern(mapping)
+    if pattern is None or not text:
+        return text
+    return pattern.sub(lambda m: mapping[m.group(0)], text)
+
 ROLE_NAMES = {
     "Planner",
     "CTO",
@@ -195,7 +238,7 @@ class Redactor:
         if categories is not None:
             order = list(categories)
         else:
-            order = ["SECRET", "EMAIL", "PHONE", "IP", "IPV6"]
+            order = list(BASE_CATEGORIES)
             if mode == "heavy":
                 order += ["PERSON", "ORG", "ADDRESS", "DEVICE"]
             elif mode == "logging":
@@ -208,7 +251,11 @@ class Redactor:
 
         out = text
         descriptive = mode != "heavy"
-        for cat in order:
+        # Categories run one after another so later ones see earlier
+        # placeholders; placeholders never create new matches, so categories
+        # that cannot match the input are skipped up front.
+        present = set(SCANNER.candidates(text, order))
+        for cat in (c for c in order if c in present):
             out = self._replace(out, cat, role, placeholders_seen, descriptive)
         return out, dict(self.alias_map), placeholders_seen
 
@@ -55,7 +55,7 @@ def openai_web_search(query: str, *, max_results: int = 5) -> Dict[str, Any]:
 
 
 def serpapi_web_search(query: str, *, max_results: int = 5) -> Dict[str, Any]:
-    import requests
+    from dr_rd.connectors.commons import http_get
 
     key = get_env("SERPAPI_API_KEY")
     if not key:
@@ -76,9 +76,7 @@ def serpapi_web_search(query: str, *, max_results: int = 5) -> Dict[str, Any]:
         }
     try:
         params = {"engine": "google", "q": query, "num": max_results, "api_key": key}
-        r = requests.get("https://serpapi.com/search", params=params, timeout=30)
-        r.raise_for_status()
-        js = r.json()
+        js = http_get("https://serpapi.com/search", params=params, retries=1, timeout=30).json()
         organic = js.get("organic_results", [])
         results = [
             {"title": x.get("title"), "url": x.get("link"), "snippet": x.get("snippet")}
@@ -6,12 +6,17 @@ class TokenMeter:
         self.total_tokens = 0
         self.per_model = defaultdict(int)
         self.per_stage = defaultdict(int)
+        # Prompt tokens and the share served from the provider's prefix cache.
+        self.prompt_per_stage = defaultdict(int)
+        self.cached_per_stage = defaultdict(int)
 
     def add_usage(self, model_id: str, stage: str, usage: dict):
         t = int(usage.get("total_tokens", 0) or 0)
         self.total_tokens += t
         self.per_model[model_id] += t
         self.per_stage[stage] += t
+        self.prompt_per_stage[stage] += int(usage.get("prompt_tokens", 0) or 0)
+        self.cached_per_stage[stage] += int(usage.get("cached_tokens", 0) or 0)
 
     def total(self):
         return self.total_tokens
@@ -22,6 +27,19 @@ class TokenMeter:
     def by_stage(self):
         return dict(self.per_stage)
 
+    def cached_tokens(self, stage: str | None = None) -> int:
+        if stage is None:
+            return sum(self.cached_per_stage.values())
+        return self.cached_per_stage.get(stage, 0)
+
+    def cache_hit_rate(self, stage: str | None = None) -> float:
+        """Fraction of prompt tokens served from the provider's prompt cache."""
+        if stage is None:
+            prompt = sum(self.prompt_per_stage.values())
+        else:
+            prompt = self.prompt_per_stage.get(stage, 0)
+        return self.cached_tokens(stage) / prompt if prompt else 0.0
+
 
 def dollars_from_usage(model_id: str, prompt_tokens: int, completion_tokens: int) -> float:
     from app.price_loader import cost_usd
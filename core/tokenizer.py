@@ -0,0 +1,154 @@
+"""Shared token counting for routing, budgeting and prompt packing.
+
+Counts use the ``tiktoken`` encoding of the model family when that optional
+package is installed (``o200k_base`` for GPT-4o/4.1/5 and the o-series,
+``cl100k_base`` for GPT-4/3.5 and embeddings).  Other providers, or a missing
+``tiktoken``, fall back to the ~4 characters per token heuristic the callers
+used before.  Exact counts are kept in an LRU cache keyed by a hash of the
+text so repeated prompts, examples and snippets are encoded once.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Sequence
+
+HEURISTIC = "heuristic"
+DEFAULT_ENCODING = "o200k_base"
+# First match wins, so specific prefixes come before ``gpt-4``.  Names are
+# compared without a ``provider/`` prefix.
+ENCODING_PREFIXES = (
+    ("gpt-4o", "o200k_base"),
+    ("gpt-4.1", "o200k_base"),
+    ("gpt-4.5", "o200k_base"),
+    ("gpt-5", "o200k_base"),
+    ("chatgpt-4o", "o200k_base"),
+    ("o1", "o200k_base"),
+    ("o3", "o200k_base"),
+    ("o4", "o200k_base"),
+    ("gpt-4", "cl100k_base"),
+    ("gpt-3.5", "cl100k_base"),
+    ("text-embedding", "cl100k_base"),
+)
+# Per-message framing overhead of the chat format.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "8192"))
+
+logger = logging.getLogger(__name__)
+
+
+def encoding_name(model: Optional[str] = None) -> str:
+    """Return the encoding used to count tokens for ``model``."""
+    if not model:
+        return DEFAULT_ENCODING
+    name = model.split("/", 1)[-1].lower()
+    for prefix, enc in ENCODING_PREFIXES:
+        if name.startswith(prefix):
+            return enc
+    return HEURISTIC
+
+
+@functools.lru_cache(maxsize=None)
+def _encoder(name: str) -> Any:
+    if name == HEURISTIC:
+        return None
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception as exc:  # not installed, or the BPE file cannot be fetched
+        logger.warning(
+            "tiktoken encoding %s unavailable (%s); token counts use the len/4 heuristic",
+            name,
+            exc,
+        )
+        return None
+
+
+def _heuristic(text: str) -> int:
+    return len(text) // 4
+
+
+class _LRU:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: int) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_CACHE = _LRU(CACHE_SIZE)
+
+
+def _key(enc: str, text: str) -> tuple:
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return enc, digest
+
+
+def count_batch(texts: Sequence[str], model: Optional[str] = None) -> List[int]:
+    """Token counts for ``texts``; cache misses are encoded in one batch."""
+    enc_name = encoding_name(model)
+    encoder = _encoder(enc_name)
+    if encoder is None:  # the heuristic is cheaper than hashing for the cache
+        return [_heuristic(t or "") for t in texts]
+    keys = [_key(enc_name, t or "") for t in texts]
+    out: List[Optional[int]] = [_CACHE.get(k) for k in keys]
+    missing = [i for i, n in enumerate(out) if n is None]
+    if missing:
+        encoded = encoder.encode_batch([texts[i] or "" for i in missing], disallowed_special=())
+        counts = [len(tokens) for tokens in encoded]
+        for i, n in zip(missing, counts):
+            _CACHE.put(keys[i], n)
+            out[i] = n
+    return out  # type: ignore[return-value]
+
+
+def count(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens in ``text`` for ``model``."""
+    return count_batch([text], model)[0]
+
+
+def count_messages(messages: Iterable[dict], model: Optional[str] = None) -> int:
+    """Prompt tokens for a chat ``messages`` list, including message framing."""
+    contents = [m.get("content") for m in messages]
+    texts = [c if isinstance(c, str) else str(c or "") for c in contents]
+    return sum(count_batch(texts, model)) + TOKENS_PER_MESSAGE * len(texts) + TOKENS_PER_REPLY
+
+
+def cache_clear() -> None:
+    _CACHE.clear()
+
+
+__all__ = [
+    "count",
+    "count_batch",
+    "count_messages",
+    "encoding_name",
+    "cache_clear",
+]
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import contextvars
 import hashlib
 import json
+import os
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import jsonschema
 import yaml
@@ -58,6 +63,10 @@ class ToolMeta:
 _REGISTRY: Dict[str, ToolMeta] = {}
 _ALLOWLIST: Dict[str, set[str]] = defaultdict(set)
 _CACHE = FileCache(Path(".cache") / "tools")
+_CALLS_LOCK = threading.Lock()
+_POOLS: Dict[str, ThreadPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+DEFAULT_POOL_SIZE = int(os.getenv("TOOL_POOL_SIZE", "4"))
 
 
 def register_tool(
@@ -88,9 +97,23 @@ def _hash_dict(d: Dict[str, Any]) -> str:
     return hashlib.sha256(json.dumps(d, sort_keys=True, default=str).encode()).hexdigest()
 
 
-def call_tool(
-    agent: str, tool_name: str, params: Dict[str, Any], budget: Optional[Dict[str, Any]] = None
-) -> Any:
+@dataclass
+class _Call:
+    """One admitted tool invocation: resolved config, budgets and cache key."""
+
+    agent: str
+    tool_name: str
+    params: Dict[str, Any]
+    meta: ToolMeta
+    max_calls: Optional[int]
+    max_runtime: Optional[int]
+    cache_ttl: Optional[int]
+    cache_key: str
+
+
+def _resolve(
+    agent: str, tool_name: str, params: Dict[str, Any], budget: Optional[Dict[str, Any]]
+) -> _Call:
     if tool_name not in _REGISTRY:
         raise KeyError(f"Tool {tool_name} not registered")
     if tool_name not in _ALLOWLIST.get(agent, set()):
@@ -104,41 +127,140 @@ def call_tool(
     max_calls = cfg.get("max_calls")
     if budget and budget.get("max_tool_calls") is not None:
         max_calls = min(int(max_calls or 1e9), int(budget["max_tool_calls"]))
-    if max_calls is not None and meta.calls >= int(max_calls):
-        return {"ok": False, "error": "max_tool_calls exceeded"}
-    cache_ttl = cfg.get("ttl_s")
-    cache_key = f"{tool_name}:{_hash_dict(params)}"
-    if cache_ttl:
-        cached = _CACHE.get(cache_key, cache_ttl)
-        if cached is not None:
-            if feature_flags.PROVENANCE_ENABLED:
-                span = provenance.start_span(
-                    tool_name,
-                    {
-                        "agent": agent,
-                        "tool": tool_name,
-                        "cached": True,
-                        "args_digest": _hash_dict(params),
-                    },
-                )
-                provenance.end_span(
-                    span,
-                    meta={"cached": True, "output_digest": _hash_dict(cached), "elapsed_ms": 0},
-                )
-            return cached
-    span = None
-    if feature_flags.PROVENANCE_ENABLED:
+    max_runtime = cfg.get("max_runtime_ms")
+    if budget and budget.get("max_runtime_ms") is not None:
+        max_runtime = min(int(max_runtime or 1e9), int(budget["max_runtime_ms"]))
+    return _Call(
+        agent=agent,
+        tool_name=tool_name,
+        params=params,
+        meta=meta,
+        max_calls=int(max_calls) if max_calls is not None else None,
+        max_runtime=int(max_runtime) if max_runtime is not None else None,
+        cache_ttl=cfg.get("ttl_s"),
+        cache_key=f"{tool_name}:{_hash_dict(params)}",
+    )
+
+
+def _reserve(call: _Call) -> bool:
+    """Atomically take one of the tool's ``max_calls`` slots."""
+    with _CALLS_LOCK:
+        if call.max_calls is not None and call.meta.calls >= call.max_calls:
+            return False
+        call.meta.calls += 1
+        return True
+
+
+def _refund(call: _Call) -> None:
+    with _CALLS_LOCK:
+        call.meta.calls -= 1
+
+
+def _pool(call: _Call) -> ThreadPoolExecutor:
+    """Return the bounded worker pool for ``call``'s tool (created on first use)."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(call.tool_name)
+        if pool is None:
+            cfg = TOOL_CONFIG.get(call.meta.config_key, {})
+            size = int(cfg.get("max_concurrency") or DEFAULT_POOL_SIZE)
+            pool = _POOLS[call.tool_name] = ThreadPoolExecutor(
+                max_workers=size, thread_name_prefix=f"tool-{call.tool_name}"
+            )
+        return pool
+
+
+def _cached_result(call: _Call) -> Any:
+    if not call.cache_ttl:
+        return None
+    cached = _CACHE.get(call.cache_key, call.cache_ttl)
+    if cached is not None and feature_flags.PROVENANCE_ENABLED:
         span = provenance.start_span(
-            tool_name, {"agent": agent, "tool": tool_name, "args_digest": _hash_dict(params)}
+            call.tool_name,
+            {
+                "agent": call.agent,
+                "tool": call.tool_name,
+                "cached": True,
+                "args_digest": _hash_dict(call.params),
+            },
         )
-    start = time.time()
-    result = meta.fn(**params)
-    elapsed_ms = int((time.time() - start) * 1000)
-    metrics.inc("tool_calls_total", tool=tool_name, agent=agent)
-    metrics.observe("tool_call_latency_ms", elapsed_ms, tool=tool_name, agent=agent)
-    if feature_flags.PROVENANCE_ENABLED and span is not None:
         provenance.end_span(
             span,
+            meta={"cached": True, "output_digest": _hash_dict(cached), "elapsed_ms": 0},
+        )
+    return cached
+
+
+class _Pending:
+    """A tool call running on its pool under a copy of the caller's context.
+
+    The provenance span is opened inside that context, so the span nests under
+    whatever span was open at submit time and anything the tool records nests
+    under the tool span, even when several calls run at once.
+    """
+
+    def __init__(self, call: _Call, inline: bool) -> None:
+        self.call = call
+        self.ctx = contextvars.copy_context()
+        self.span = None
+        if feature_flags.PROVENANCE_ENABLED:
+            self.span = self.ctx.run(
+                provenance.start_span,
+                call.tool_name,
+                {
+                    "agent": call.agent,
+                    "tool": call.tool_name,
+                    "args_digest": _hash_dict(call.params),
+                },
+            )
+        self.started = threading.Event()
+        self.t0 = 0.0
+        if inline:
+            self.future: Future = Future()
+            self._invoke_inline()
+        else:
+            self.future = _pool(call).submit(self.ctx.run, self._invoke)
+
+    def _invoke(self) -> Any:
+        self.t0 = time.monotonic()
+        self.started.set()
+        return self.call.meta.fn(**self.call.params)
+
+    def _invoke_inline(self) -> None:
+        try:
+            self.future.set_result(self.ctx.run(self._invoke))
+        except BaseException as exc:  # delivered through result()
+            self.future.set_exception(exc)
+
+    def result(self) -> Any:
+        call = self.call
+        timed_out = False
+        try:
+            if call.max_runtime is None:
+                result = self.future.result()
+            else:
+                # Threads cannot be killed: a call still queued behind busy
+                # workers is cancelled, a running one is abandoned.
+                budget_s = call.max_runtime / 1000
+                if self.started.wait(budget_s):
+                    remaining = self.t0 + budget_s - time.monotonic()
+                else:
+                    remaining = 0.0
+                try:
+                    result = self.future.result(timeout=max(0.0, remaining))
+                except FuturesTimeout:
+                    timed_out = True
+                    self.future.cancel()
+        except BaseException as exc:
+            _refund(call)
+            self._end(ok=False, meta={"error": str(exc)})
+            raise
+        elapsed_ms = int((time.monotonic() - self.t0) * 1000) if self.t0 else 0
+        metrics.inc("tool_calls_total", tool=call.tool_name, agent=call.agent)
+        metrics.observe("tool_call_latency_ms", elapsed_ms, tool=call.tool_name, agent=call.agent)
+        if timed_out:
+            self._end(ok=False, meta={"error": "max_runtime_ms exceeded", "elapsed_ms": elapsed_ms})
+            return {"ok": False, "error": "max_runtime_ms exceeded"}
+        self._end(
             meta={
                 "output_digest": _hash_dict(
                     result if isinstance(result, dict) else {"result": result}
@@ -146,17 +268,82 @@ def call_tool(
                 "elapsed_ms": elapsed_ms,
             },
         )
-    meta.calls += 1
-    max_runtime = cfg.get("max_runtime_ms")
-    if budget and budget.get("max_runtime_ms") is not None:
-        max_runtime = min(int(max_runtime or 1e9), int(budget["max_runtime_ms"]))
-    if max_runtime is not None and elapsed_ms > int(max_runtime):
-        return {"ok": False, "error": "max_runtime_ms exceeded"}
-    if meta.output_schema:
-        jsonschema.validate(result, meta.output_schema)
-    if cache_ttl:
-        _CACHE.set(cache_key, result)
-    return result
+        if call.meta.output_schema:
+            jsonschema.validate(result, call.meta.output_schema)
+        if call.cache_ttl:
+            _CACHE.set(call.cache_key, result)
+        return result
+
+    def _end(self, ok: bool = True, meta: Optional[Dict[str, Any]] = None) -> None:
+        if feature_flags.PROVENANCE_ENABLED and self.span is not None:
+            provenance.end_span(self.span, ok=ok, meta=meta)
+
+
+def _start(
+    agent: str,
+    tool_name: str,
+    params: Dict[str, Any],
+    budget: Optional[Dict[str, Any]],
+    inline: bool,
+) -> _Pending | Any:
+    call = _resolve(agent, tool_name, params, budget)
+    cached = _cached_result(call)
+    if cached is not None:
+        return cached  # cache hits do not consume the call budget
+    if not _reserve(call):
+        return {"ok": False, "error": "max_tool_calls exceeded"}
+    return _Pending(call, inline=inline and call.max_runtime is None)
+
+
+def call_tool(
+    agent: str, tool_name: str, params: Dict[str, Any], budget: Optional[Dict[str, Any]] = None
+) -> Any:
+    """Run ``tool_name`` for ``agent`` within its call and runtime budgets.
+
+    Tools with a ``max_runtime_ms`` run on their worker pool and are abandoned
+    (``{"ok": False, "error": "max_runtime_ms exceeded"}``) once it elapses;
+    others run in the calling thread.
+    """
+    pending = _start(agent, tool_name, params, budget, inline=True)
+    return pending.result() if isinstance(pending, _Pending) else pending
+
+
+@dataclass
+class _Failed:
+    exc: Exception
+
+
+def call_tools_batch(
+    agent: str,
+    calls: Sequence[Tuple[str, Dict[str, Any]]],
+    budget: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """Run independent ``(tool_name, params)`` calls concurrently.
+
+    Each tool runs on its own bounded pool with the same admission, caching and
+    timeout rules as :func:`call_tool`.  Results come back in input order; a
+    call that raises yields ``{"ok": False, "error": ...}`` in its slot so one
+    failure does not discard the others.
+    """
+    started: List[Any] = []
+    for tool_name, params in calls:
+        try:
+            started.append(_start(agent, tool_name, params, budget, inline=False))
+        except Exception as exc:
+            started.append(_Failed(exc))
+    results: List[Any] = []
+    for item in started:
+        if isinstance(item, _Failed):
+            results.append({"ok": False, "error": str(item.exc)})
+            continue
+        if not isinstance(item, _Pending):
+            results.append(item)
+            continue
+        try:
+            results.append(item.result())
+        except Exception as exc:
+            results.append({"ok": False, "error": str(exc)})
+    return results
 
 
 def get_provenance() -> list[Dict[str, Any]]:
@@ -252,5 +439,6 @@ __all__ = [
     "register_tool",
     "allow_tools",
     "call_tool",
+    "call_tools_batch",
     "get_provenance",
 ]
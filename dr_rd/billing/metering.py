@@ -6,8 +6,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Tuple
 
+from dr_rd.telemetry import warehouse
+
 from .models import UsageEvent
 
+_FIELDS = ("tokens_in", "tokens_out", "tool_calls", "tool_runtime_ms")
+
 
 def _parse_line(data: dict) -> UsageEvent:
     ts = datetime.fromisoformat(data["ts"])
@@ -38,18 +42,8 @@ def collect_usage(log_paths: Sequence[Path | str]) -> List[UsageEvent]:
     log_paths: list of file paths containing JSON lines.
     """
 
-    events: List[UsageEvent] = []
-    for path in log_paths:
-        p = Path(path)
-        if not p.exists():
-            continue
-        with p.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                if not line.strip():
-                    continue
-                data = json.loads(line)
-                events.append(_parse_line(data))
-    return events
+    paths = [Path(p) for p in log_paths if Path(p).exists()]
+    return [_parse_line(data) for data in warehouse.events(paths)] if paths else []
 
 
 def aggregate_month(events: Iterable[UsageEvent]) -> Dict[Tuple[str, str], Dict[str, Dict[str, int]]]:
@@ -79,14 +73,47 @@ def aggregate_month(events: Iterable[UsageEvent]) -> Dict[Tuple[str, str], Dict[
     return result
 
 
+def aggregate_usage(
+    log_paths: Sequence[Path | str], period: str | None = None
+) -> Dict[Tuple[str, str], Dict[str, Dict[str, int]]]:
+    """Return ``aggregate_month(collect_usage(log_paths))`` from warehouse rollups.
+
+    ``period`` (``YYYY-MM``) restricts the result to one month.
+    """
+    paths = [Path(p) for p in log_paths if Path(p).exists()]
+    if not paths:
+        return {}
+    since = until = None
+    if period:
+        since, until = f"{period}-01", f"{period}-31"
+    result: Dict[Tuple[str, str], Dict[str, Dict[str, int]]] = {}
+    for row in warehouse.usage(paths, since_day=since, until_day=until):
+        key = (row["org_id"], row["workspace_id"])
+        agg = result.setdefault(key, {"monthly": dict.fromkeys(_FIELDS, 0), "daily": {}})
+        day = agg["daily"].setdefault(row["day"], dict.fromkeys(_FIELDS, 0))
+        for f in _FIELDS:
+            day[f] += row[f]
+            agg["monthly"][f] += row[f]
+    return result
+
+
 def persist_monthly_usage(
     tenant_key: Tuple[str, str],
     period: str,
-    events: Iterable[UsageEvent],
+    log_paths: Sequence[Path | str],
     base_dir: Path | str = Path(".dr_rd"),
-) -> None:
-    """Persist usage events and monthly summary for a tenant."""
+) -> Dict[str, Dict[str, int]]:
+    """Persist a tenant's usage events and monthly summary for ``period``.
+
+    The summary comes from the warehouse rollups (:func:`aggregate_usage`) and
+    is returned as well as written.
+    """
     org, ws = tenant_key
+    events = [
+        ev
+        for ev in collect_usage(log_paths)
+        if (ev.org_id, ev.workspace_id) == tenant_key and ev.ts.strftime("%Y-%m") == period
+    ]
     base = Path(base_dir) / "tenants" / org / ws / "billing"
     base.mkdir(parents=True, exist_ok=True)
     usage_path = base / f"usage_{period}.jsonl"
@@ -111,9 +138,12 @@ def persist_monthly_usage(
                 + "\n"
             )
 
-    agg = aggregate_month(events)[tenant_key]
+    agg = aggregate_usage(log_paths, period=period).get(
+        tenant_key, {"monthly": dict.fromkeys(_FIELDS, 0), "daily": {}}
+    )
     with summary_path.open("w", encoding="utf-8") as fh:
         json.dump(agg, fh, indent=2, sort_keys=True)
+    return agg
 
 
-__all__ = ["collect_usage", "aggregate_month", "persist_monthly_usage"]
+__all__ = ["collect_usage", "aggregate_month", "aggregate_usage", "persist_monthly_usage"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Any, Callable, Optional
@@ -35,7 +36,10 @@ class FileCache:
     def set(self, key: str, value: Any) -> None:
         path = self._path(key)
         payload = {"ts": time.time(), "value": value}
-        path.write_text(json.dumps(payload))
+        # Write-then-rename so concurrent readers never see a partial file.
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, path)
 
 
 def cached(ttl_s: int, cache: FileCache | None = None) -> Callable:
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import functools
+import os
+import threading
 import time
-from typing import Any, Callable, Dict, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
 
 
 class MemoCache:
@@ -31,3 +37,42 @@ class MemoCache:
         value = builder()
         self.set(key, value)
         return value
+
+
+def file_stamp(path: Union[str, Path]) -> Optional[Tuple[int, int, int]]:
+    """Return ``(inode, mtime_ns, size)`` for ``path`` or ``None`` when it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def file_memo(path: Callable[[], Union[str, Path]]) -> Callable[[Callable[[], T]], Callable[[], T]]:
+    """Memoize a zero-argument file loader until the file changes on disk.
+
+    ``path`` is called on every lookup so tests that patch a module-level path
+    constant keep working.  The loaded value is shared between callers and
+    must be treated as read-only; ``cache_clear()`` drops it.
+    """
+
+    def decorator(loader: Callable[[], T]) -> Callable[[], T]:
+        lock = threading.Lock()
+        entry: Dict[str, Any] = {}
+
+        @functools.wraps(loader)
+        def wrapper() -> T:
+            target = str(path())
+            key = (target, file_stamp(target))
+            if entry.get("key") == key:
+                return entry["value"]
+            with lock:
+                if entry.get("key") != key:
+                    entry["value"] = loader()
+                    entry["key"] = key
+                return entry["value"]
+
+        wrapper.cache_clear = entry.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
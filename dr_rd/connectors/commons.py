@@ -1,52 +1,225 @@
 from __future__ import annotations
 
+import atexit
+import importlib.util
 import json
 import os
 import random
+import re
+import threading
 import time
-from collections import defaultdict
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
 
-import requests
+import httpx
 
 from dr_rd.config.env import get_env
-from dr_rd.cache.file_cache import cached
+from dr_rd.cache.file_cache import FileCache, cached
+from dr_rd.telemetry import metrics
 
-_RATE_LIMITS: dict[str, list[float]] = defaultdict(list)
+# Connector quotas are token buckets whose state lives in flock-guarded files
+# under CONNECTOR_RATE_LIMIT_DIR, so every process on the host (batch_run
+# workers, Streamlit sessions) draws from the same budget.  Callers queue for a
+# slot up to CONNECTOR_RATE_LIMIT_MAX_WAIT_S instead of failing immediately.
+RATE_LIMIT_DIR = Path(os.getenv("CONNECTOR_RATE_LIMIT_DIR", ".dr_rd/ratelimits"))
+RATE_LIMIT_MAX_WAIT_S = float(os.getenv("CONNECTOR_RATE_LIMIT_MAX_WAIT_S", "30"))
+_BUCKETS: dict[str, Any] = {}
+_BUCKETS_LOCK = threading.Lock()
 
 
-def ratelimit_guard(key: str, limit: int, period_s: int = 60) -> None:
-    """Simple in-process rate limit guard."""
-    now = time.time()
-    window = [t for t in _RATE_LIMITS[key] if now - t < period_s]
-    if len(window) >= limit:
-        raise RuntimeError("rate limit exceeded")
-    window.append(now)
-    _RATE_LIMITS[key] = window
+class RateLimitExceeded(RuntimeError):
+    """Raised when a connector slot cannot be granted before the deadline."""
+
+
+def _bucket(key: str, limit: int, period_s: int) -> Any:
+    from core.llm.rate_limit import TokenBucket
+
+    per_minute = limit * 60.0 / period_s
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(key)
+        if bucket is None or bucket.capacity != limit or bucket.rate != per_minute / 60.0:
+            bucket = _BUCKETS[key] = TokenBucket(
+                per_minute, capacity=limit, state_path=RATE_LIMIT_DIR / f"{key}.json"
+            )
+        return bucket
+
+
+def ratelimit_guard(
+    key: str, limit: int, period_s: int = 60, max_wait_s: float | None = None
+) -> float:
+    """Wait for one of ``limit`` calls per ``period_s`` on ``key``'s shared quota.
+
+    Returns the seconds spent queued.  Raises :class:`RateLimitExceeded` when
+    the next slot is further away than ``max_wait_s``.
+    """
+    bucket = _bucket(key, limit, period_s)
+    wait = bucket.reserve(1)
+    deadline = RATE_LIMIT_MAX_WAIT_S if max_wait_s is None else max_wait_s
+    if wait > deadline:
+        bucket.adjust(1)
+        metrics.inc("connector_rate_limited", connector=key)
+        raise RateLimitExceeded(f"rate limit exceeded for {key}; next slot in {wait:.1f}s")
+    if wait > 0:
+        time.sleep(wait)
+    metrics.observe("connector_rate_limit_wait_ms", wait * 1000, connector=key)
+    return wait
+
+
+def _retry_after(resp: httpx.Response | None) -> float | None:
+    value = resp.headers.get("retry-after") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 def _backoff(attempt: int) -> float:
     return (2**attempt) + random.random()
 
 
+# Connectors talk to a handful of hosts, so each host gets one long-lived,
+# thread-safe client: its keep-alive pool makes repeat calls skip the TCP/TLS
+# handshake, ``max_connections`` caps concurrent sockets per host, and HTTP/2
+# is negotiated when the optional ``h2`` package is installed.
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("CONNECTOR_MAX_CONNECTIONS_PER_HOST", "10"))
+HTTP2 = os.getenv("CONNECTOR_HTTP2", "true").lower() == "true" and bool(
+    importlib.util.find_spec("h2")
+)
+_CLIENTS: dict[str, httpx.Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(url: str) -> httpx.Client:
+    """Return the shared pooled client for ``url``'s scheme and host."""
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}"
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=MAX_CONNECTIONS_PER_HOST,
+                keepalive_expiry=60,
+            )
+            client = _CLIENTS[key] = httpx.Client(
+                limits=limits, http2=HTTP2, follow_redirects=True
+            )
+        return client
+
+
+@atexit.register
+def close_clients() -> None:
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+# Responses carrying an ETag or Last-Modified are kept on disk.  While
+# ``Cache-Control: max-age`` says they are fresh they are served without a
+# request; afterwards they are revalidated with If-None-Match /
+# If-Modified-Since and a ``304`` reuses the stored body.
+HTTP_CACHE_TTL_S = int(os.getenv("CONNECTOR_HTTP_CACHE_TTL_S", str(7 * 86400)))
+_HTTP_CACHE = FileCache(Path(os.getenv("DRRD_CACHE_DIR", ".cache")) / "http")
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def _cache_key(url: str, params: dict[str, Any] | None, headers: dict[str, str] | None) -> str:
+    return json.dumps([url, params or {}, headers or {}], sort_keys=True, default=str)
+
+
+def _max_age(cache_control: str) -> int:
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    m = _MAX_AGE.search(cache_control)
+    return int(m.group(1)) if m else 0
+
+
+def _from_cache(entry: dict[str, Any], request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, content=entry["body"].encode("utf-8"), headers=entry["headers"], request=request
+    )
+
+
+def _conditional_get(
+    url: str,
+    params: dict[str, Any] | None,
+    headers: dict[str, str] | None,
+    timeout: int,
+) -> httpx.Response:
+    key = _cache_key(url, params, headers)
+    entry = _HTTP_CACHE.get(key, HTTP_CACHE_TTL_S)
+    client = get_client(url)
+    if entry and time.time() < entry["fresh_until"]:
+        return _from_cache(entry, client.build_request("GET", url, params=params))
+    req_headers = dict(headers or {})
+    if entry:
+        if entry["headers"].get("etag"):
+            req_headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            req_headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+    resp = client.get(url, params=params, headers=req_headers, timeout=timeout)
+    if resp.status_code == 304 and entry:
+        cache_control = resp.headers.get("cache-control", entry["headers"].get("cache-control", ""))
+        entry["fresh_until"] = time.time() + _max_age(cache_control)
+        _HTTP_CACHE.set(key, entry)
+        return _from_cache(entry, resp.request)
+    cache_control = resp.headers.get("cache-control", "")
+    if (
+        resp.status_code == 200
+        and "no-store" not in cache_control
+        and ("etag" in resp.headers or "last-modified" in resp.headers)
+    ):
+        _HTTP_CACHE.set(
+            key,
+            {
+                "body": resp.text,
+                "headers": {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers},
+                "fresh_until": time.time() + _max_age(cache_control),
+            },
+        )
+    return resp
+
+
 def http_get(
     url: str,
     params: dict[str, Any] | None = None,
     headers: dict[str, str] | None = None,
     retries: int = 3,
     timeout: int = 10,
-) -> requests.Response:
-    """HTTP GET with basic retry and exponential jitter."""
+    rate_key: str | None = None,
+) -> httpx.Response:
+    """HTTP GET over the pooled client with revalidation, retry and exponential jitter.
+
+    A ``429``/``503`` with ``Retry-After`` waits that long before retrying and,
+    given ``rate_key``, pauses that connector's shared quota for everyone.
+    """
     for attempt in range(retries):
         try:
-            resp = requests.get(url, params=params, headers=headers, timeout=timeout)
+            resp = _conditional_get(url, params, headers, timeout)
             resp.raise_for_status()
             return resp
-        except Exception:
+        except Exception as exc:
             if attempt == retries - 1:
                 raise
-            time.sleep(_backoff(attempt))
+            delay = None
+            if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in (429, 503):
+                delay = _retry_after(exc.response)
+            if delay is not None and rate_key and rate_key in _BUCKETS:
+                _BUCKETS[rate_key].pause(delay)
+            if delay is None:
+                delay = _backoff(attempt)
+            time.sleep(min(delay, RATE_LIMIT_MAX_WAIT_S))
     raise RuntimeError("unreachable")
 
 
@@ -56,13 +229,16 @@ def http_json(
     headers: dict[str, str] | None = None,
     retries: int = 3,
     timeout: int = 10,
+    rate_key: str | None = None,
 ) -> dict[str, Any]:
     if use_fixtures():
         name = os.path.basename(url).split("?")[0]
         fixture = load_fixture(name)
         if fixture is not None:
             return fixture
-    resp = http_get(url, params=params, headers=headers, retries=retries, timeout=timeout)
+    resp = http_get(
+        url, params=params, headers=headers, retries=retries, timeout=timeout, rate_key=rate_key
+    )
     return resp.json()
 
 
@@ -98,9 +274,12 @@ def load_fixture(name: str) -> Optional[Dict[str, Any]]:
 
 __all__ = [
     "cached",
+    "close_clients",
+    "get_client",
     "http_get",
     "http_json",
     "ratelimit_guard",
+    "RateLimitExceeded",
     "signed_headers",
     "use_fixtures",
     "load_fixture",
@@ -32,7 +32,7 @@ def search_devices(query: str) -> Dict[str, Any]:
     ratelimit_guard("fda_device_search", 5)
     params = {"search": query}
     headers = signed_headers("FDA_API_KEY")
-    data = http_json(BASE_URL, params=params, headers=headers)
+    data = http_json(BASE_URL, params=params, headers=headers, rate_key="fda_device_search")
     records = [_normalize(r) for r in data.get("results", [])]
     return {"items": records}
 
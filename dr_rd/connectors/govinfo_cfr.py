@@ -26,7 +26,7 @@ def lookup_cfr(title: str, part: str, section: str) -> Dict[str, Any]:
     ratelimit_guard("govinfo_cfr", 5)
     params = {"title": title, "part": part, "section": section}
     headers = signed_headers("GOVINFO_API_KEY")
-    data = http_json(BASE_URL, params=params, headers=headers)
+    data = http_json(BASE_URL, params=params, headers=headers, rate_key="govinfo_cfr")
     return {
         "title": title,
         "part": part,
@@ -34,7 +34,7 @@ def search_documents(query: str) -> Dict[str, Any]:
     ratelimit_guard("reg_gov_search", 5)
     params = {"q": query}
     headers = signed_headers("REG_GOV_API_KEY")
-    data = http_json(BASE_URL, params=params, headers=headers)
+    data = http_json(BASE_URL, params=params, headers=headers, rate_key="reg_gov_search")
     records = [_normalize(d) for d in data.get("data", [])]
     return {"items": records}
 
@@ -45,7 +45,7 @@ def fetch_document(document_id: str) -> Dict[str, Any]:
         return load_fixture("reg_fetch") or {"record": {}}
     ratelimit_guard("reg_gov_fetch", 5)
     headers = signed_headers("REG_GOV_API_KEY")
-    data = http_json(f"{BASE_URL}/{document_id}", headers=headers)
+    data = http_json(f"{BASE_URL}/{document_id}", headers=headers, rate_key="reg_gov_fetch")
     return {"record": _normalize(data.get("data", {}))}
 
 
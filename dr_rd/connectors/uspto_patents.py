@@ -41,7 +41,7 @@ def search_patents(query: str) -> Dict[str, Any]:
     ratelimit_guard("uspto_search", 5)
     params = {"q": query}
     headers = signed_headers("USPTO_API_KEY")
-    data = http_json(BASE_URL, params=params, headers=headers)
+    data = http_json(BASE_URL, params=params, headers=headers, rate_key="uspto_search")
     records = [_normalize(r) for r in data.get("results", [])]
     return {"items": records}
 
@@ -60,7 +60,7 @@ def fetch_patent(
     if app_number:
         params["app_number"] = app_number
     headers = signed_headers("USPTO_API_KEY")
-    data = http_json(FETCH_URL, params=params, headers=headers)
+    data = http_json(FETCH_URL, params=params, headers=headers, rate_key="uspto_fetch")
     records = [_normalize(data.get("result", {}))]
     return {"record": records[0]}
 
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 import re
 from typing import Any, Iterable, Mapping, Sequence
 
+from core.pattern_scan import PatternScanner
+
 
 _REDACTION_TOKEN = "[REDACTED_SCOPE]"
 
@@ -183,18 +185,26 @@ def _scan(
     redactions: dict[tuple[str, ...], list[re.Pattern[str]]] = defaultdict(list)
     seen: set[tuple[tuple[str, ...], str, str]] = set()
     current = current_role.lower()
+    active = [
+        idx
+        for idx, rule in enumerate(rules)
+        if not (
+            rule.reason == "cross_role_reference"
+            and rule.label
+            and current
+            and rule.label.lower() == current
+        )
+    ]
+    # One scanner per payload: strings that mention no rule are ruled out by a
+    # single combined search instead of one search per rule.
+    scanner = PatternScanner({idx: rules[idx].pattern for idx in active})
     for path, text in _iter_strings(payload):
         trimmed = text.strip()
         if not trimmed:
             continue
-        for rule in rules:
-            if rule.reason == "cross_role_reference" and rule.label and current:
-                if rule.label.lower() == current:
-                    continue
-            match = rule.pattern.search(trimmed)
-            if not match:
-                continue
-            snippet = match.group(0)
+        for idx, match in scanner.first(trimmed).items():
+            rule = rules[idx]
+            snippet = match.text
             key = (path, rule.reason, snippet.lower())
             if key in seen:
                 continue
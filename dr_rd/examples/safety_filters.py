@@ -7,6 +7,8 @@ from typing import Dict, List
 
 import yaml
 
+from dr_rd.cache.memo import file_memo
+
 POLICY_PATH = Path(__file__).with_name("policies.yaml")
 
 _email_re = re.compile(r"\b[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}\b")
@@ -14,6 +16,7 @@ _phone_re = re.compile(r"\b\d{3}-\d{3}-\d{4}\b")
 _secret_re = re.compile(r"sk-[A-Za-z0-9]{10,}")
 
 
+@file_memo(lambda: POLICY_PATH)
 def load_policies() -> Dict:
     with open(POLICY_PATH, "r", encoding="utf-8") as fh:
         return yaml.safe_load(fh) or {}
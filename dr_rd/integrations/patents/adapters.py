@@ -2,16 +2,13 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-import requests
-
 from dr_rd.config.env import get_env
+from dr_rd.connectors.commons import http_get
 from . import normalizer
 
 
 def _http_get_json(url: str, params: Dict[str, Any], timeout: int) -> Dict[str, Any]:
-    resp = requests.get(url, params=params, timeout=timeout)
-    resp.raise_for_status()
-    return resp.json()
+    return http_get(url, params=params, retries=1, timeout=timeout).json()
 
 
 def _search_patentsview(query: Dict[str, Any], caps: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -31,9 +28,7 @@ def _search_epo_ops(query: Dict[str, Any], caps: Dict[str, Any]) -> List[Dict[st
     key = get_env("EPO_OPS_KEY")
     if key:
         headers["Authorization"] = f"Bearer {key}"
-    resp = requests.get(url, params=params, headers=headers, timeout=timeout)
-    resp.raise_for_status()
-    data = resp.json()
+    data = http_get(url, params=params, headers=headers, retries=1, timeout=timeout).json()
     records = data.get("ops:world-patent-data", {}).get("ops:biblio-search", {}).get("ops:search-result", {}).get("ops:publication-reference", [])
     return [normalizer.normalize_patent("epo_ops", r) for r in records]
 
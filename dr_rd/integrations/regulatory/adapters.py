@@ -1,15 +1,13 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List
-import requests
 
+from dr_rd.connectors.commons import http_get
 from . import normalizer
 
 
 def _http_get_json(url: str, params: Dict[str, Any], timeout: int) -> Dict[str, Any]:
-    resp = requests.get(url, params=params, timeout=timeout)
-    resp.raise_for_status()
-    return resp.json()
+    return http_get(url, params=params, retries=1, timeout=timeout).json()
 
 
 def _search_federal_register(query: Dict[str, Any], caps: Dict[str, Any]) -> List[Dict[str, Any]]:
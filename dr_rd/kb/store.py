@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import uuid
+from contextlib import closing
 from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
@@ -27,20 +29,87 @@ def _coerce_inputs(value: Any) -> Dict[str, Any]:
     return {"value": value}
 
 
+# ``kb.jsonl`` stays the append-only record of truth and export format.  A
+# SQLite sidecar (``kb.sqlite``) indexes it by id, role, run and timestamp and
+# is caught up incrementally from the last ingested byte offset, so lookups
+# never re-parse the whole file.
+DDL = """
+PRAGMA auto_vacuum=INCREMENTAL;
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS records (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT, run_id TEXT, agent_role TEXT, ts REAL, data TEXT);
+CREATE INDEX IF NOT EXISTS records_id ON records(id);
+CREATE INDEX IF NOT EXISTS records_role ON records(agent_role);
+CREATE INDEX IF NOT EXISTS records_run ON records(run_id);
+CREATE INDEX IF NOT EXISTS records_ts ON records(ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+"""
+INDEXED_COLUMNS = ("id", "agent_role", "run_id", "ts")
+
+
+def _db_path() -> Path:
+    return STORE_PATH.with_suffix(".sqlite")
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(_db_path(), timeout=30, isolation_level=None)
+    for stmt in filter(None, (s.strip() for s in DDL.split(";"))):
+        conn.execute(stmt)
+    return conn
+
+
+def _decode(line: str) -> Optional[KBRecord]:
+    try:
+        data = json.loads(line)
+        data["sources"] = [KBSource(**s) for s in data.get("sources", [])]
+        return KBRecord(**data)
+    except Exception:
+        return None
+
+
+def _offset(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE key='offset'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _sync(conn: sqlite3.Connection) -> None:
+    """Index lines appended to ``kb.jsonl`` since the last sync.
+
+    A store that shrank (rewritten outside :func:`compact`) is re-indexed from
+    scratch.  A trailing partial line is left for the next sync.
+    """
+    size = STORE_PATH.stat().st_size if STORE_PATH.exists() else 0
+    if size == _offset(conn):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        offset = _offset(conn)
+        if size < offset:
+            conn.execute("DELETE FROM records")
+            offset = 0
+        rows = []
+        if size > offset:
+            with open(STORE_PATH, "rb") as fh:
+                fh.seek(offset)
+                chunk = fh.read(size - offset)
+            end = chunk.rfind(b"\n") + 1
+            for raw in chunk[:end].splitlines():
+                line = raw.decode("utf-8", errors="replace")
+                rec = _decode(line)
+                if rec is not None:
+                    rows.append((rec.id, rec.run_id, rec.agent_role, rec.ts, line))
+            offset += end
+        conn.executemany(
+            "INSERT INTO records (id, run_id, agent_role, ts, data) VALUES (?,?,?,?,?)", rows
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('offset', ?)", (offset,))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
 def _read_all() -> List[KBRecord]:
-    if not STORE_PATH.exists():
-        return []
-    out: List[KBRecord] = []
-    with open(STORE_PATH, "r", encoding="utf-8") as fh:
-        for line in fh:
-            try:
-                data = json.loads(line)
-                sources = [KBSource(**s) for s in data.get("sources", [])]
-                data["sources"] = sources
-                out.append(KBRecord(**data))
-            except Exception:
-                continue
-    return out
+    return query({}, limit=0)
 
 
 def add(record: KBRecord) -> str:
@@ -49,37 +118,75 @@ def add(record: KBRecord) -> str:
         record.id = uuid.uuid4().hex
     with open(STORE_PATH, "a", encoding="utf-8") as fh:
         fh.write(json.dumps(record.asdict(), ensure_ascii=False) + "\n")
+    with closing(_connect()) as conn:
+        _sync(conn)
     return record.id
 
 
 def get(rid: str) -> Optional[KBRecord]:
-    for rec in _read_all():
-        if rec.id == rid:
-            return rec
+    with closing(_connect()) as conn:
+        _sync(conn)
+        rows = conn.execute("SELECT data FROM records WHERE id=? ORDER BY seq", (rid,))
+        for (line,) in rows:
+            rec = _decode(line)
+            if rec is not None:
+                return rec
     return None
 
 
 def query(filters: Dict[str, Any], limit: int = 50) -> List[KBRecord]:
+    """Return records whose attributes equal ``filters``, in insertion order.
+
+    ``id``, ``agent_role``, ``run_id`` and ``ts`` are resolved through the
+    SQLite index; other keys are checked on the decoded records.
+    """
+    where = [(k, v) for k, v in filters.items() if k in INDEXED_COLUMNS and v is not None]
+    rest = [(k, v) for k, v in filters.items() if (k, v) not in where]
+    sql = "SELECT data FROM records"
+    if where:
+        sql += " WHERE " + " AND ".join(f"{k}=?" for k, _ in where)
+    sql += " ORDER BY seq"
     out: List[KBRecord] = []
-    for rec in _read_all():
-        ok = True
-        for k, v in filters.items():
-            if getattr(rec, k, None) != v:
-                ok = False
-                break
-        if ok:
+    with closing(_connect()) as conn:
+        _sync(conn)
+        for (line,) in conn.execute(sql, [v for _, v in where]):
+            rec = _decode(line)
+            if rec is None or any(getattr(rec, k, None) != v for k, v in rest):
+                continue
             out.append(rec)
-        if 0 < limit <= len(out):
-            break
+            if 0 < limit <= len(out):
+                break
     return out
 
 
 def compact() -> None:
-    """Rewrite the JSONL store removing duplicate ids."""
-    records = {rec.id: rec for rec in _read_all()}
-    with open(STORE_PATH, "w", encoding="utf-8") as fh:
-        for rec in records.values():
-            fh.write(json.dumps(rec.asdict(), ensure_ascii=False) + "\n")
+    """Drop superseded duplicate ids and reclaim space without blocking readers.
+
+    The newest row per id is kept.  ``kb.jsonl`` is rewritten atomically from
+    the index, and freed SQLite pages are released with an incremental vacuum
+    so concurrent readers (WAL mode) are never locked out.
+    """
+    with closing(_connect()) as conn:
+        _sync(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM records WHERE seq NOT IN (SELECT MAX(seq) FROM records GROUP BY id)"
+            )
+            tmp = STORE_PATH.with_suffix(".jsonl.tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                for (line,) in conn.execute("SELECT data FROM records ORDER BY seq"):
+                    fh.write(line + "\n")
+            os.replace(tmp, STORE_PATH)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('offset', ?)",
+                (STORE_PATH.stat().st_size,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA incremental_vacuum")
 
 
 def kb_maybe_persist(agent_output: Dict[str, Any], route_meta: Dict[str, Any], provenance_spans: Iterable[Dict[str, Any]]) -> None:
@@ -9,4 +9,13 @@ def evaluate(summary: Dict[str, Any], targets: Dict[str, float] | None = None) -
         remaining = budget.get("remaining", 0)
         if remaining < 0:
             breaches.append({"sli": key, "remaining": remaining, "target": target})
+    latency_targets = targets.get("latency_p95_ms")
+    if isinstance(latency_targets, dict):
+        p95 = summary.get("sli_values", {}).get("latency_p95_ms", {})
+        for phase, target in latency_targets.items():
+            value = p95.get(phase)
+            if isinstance(value, (int, float)) and value > target:
+                breaches.append(
+                    {"sli": f"latency_p95_ms.{phase}", "remaining": target - value, "target": target}
+                )
     return {"sli_values": summary.get("sli_values", {}), "budget_remaining": summary.get("budget_remaining", {}), "breaches": breaches}
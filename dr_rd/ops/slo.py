@@ -1,53 +1,107 @@
-import json
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
+from dr_rd.telemetry import warehouse
+from dr_rd.telemetry.sketch import QuantileSketch
+
+COUNTERS = (
+    "runs_started",
+    "runs_succeeded",
+    "runs_failed",
+    "citations_missing",
+    "schema_validation_failures",
+)
+# Latency series reported as p50/p95/p99, keyed by the label they are split on.
+LATENCY_SERIES = {
+    "phase": "phase_latency_ms",
+    "model": "model_call_latency_ms",
+    "tool": "tool_call_latency_ms",
+}
+QUANTILES = (0.5, 0.95, 0.99)
+
 
 def load_events(paths: Iterable[Path]) -> List[Dict[str, Any]]:
-    events: List[Dict[str, Any]] = []
-    for p in paths:
-        if not p.exists():
-            continue
-        with open(p, "r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    return events
+    return warehouse.events([p for p in paths if Path(p).exists()])
 
 
 def compute_slo(events: List[Dict[str, Any]], targets: Dict[str, Any]) -> Dict[str, Any]:
-    runs_started = sum(e.get("value", 0) for e in events if e.get("name") == "runs_started")
-    runs_succeeded = sum(e.get("value", 0) for e in events if e.get("name") == "runs_succeeded")
-    runs_failed = sum(e.get("value", 0) for e in events if e.get("name") == "runs_failed")
-    availability = 0.0
-    if runs_started:
-        availability = 100.0 * runs_succeeded / runs_started
-
+    totals: Dict[str, float] = dict.fromkeys(COUNTERS, 0)
     phase_lat: Dict[str, List[float]] = {}
     for e in events:
-        if e.get("name") == "phase_latency_ms":
+        if e.get("name") in totals:
+            totals[e["name"]] += e.get("value", 0)
+        elif e.get("name") == "phase_latency_ms" and e.get("type") != "sketch":
             phase = e.get("labels", {}).get("phase") or "unknown"
             phase_lat.setdefault(phase, []).append(float(e.get("value", 0.0)))
-    latency_p95: Dict[str, float] = {}
+    merged = {by: merge_sketches(events, name, by) for by, name in LATENCY_SERIES.items()}
+    latency: Dict[str, Dict[str, Dict[float, float]]] = {
+        by: {k: {q: sk.quantile(q) for q in QUANTILES} for k, sk in groups.items()}
+        for by, groups in merged.items()
+    }
     for phase, vals in phase_lat.items():
-        if not vals:
-            latency_p95[phase] = 0.0
+        if phase in merged["phase"]:
+            sk = merged["phase"][phase]
+            for v in vals:
+                sk.add(v)
+            latency["phase"][phase] = {q: sk.quantile(q) for q in QUANTILES}
         else:
             vals = sorted(vals)
-            k = int(0.95 * (len(vals) - 1))
-            latency_p95[phase] = vals[k]
-
-    missing_citations = sum(
-        e.get("value", 0) for e in events if e.get("name") == "citations_missing"
-    )
-    schema_fail = sum(
-        e.get("value", 0) for e in events if e.get("name") == "schema_validation_failures"
-    )
+            latency["phase"][phase] = {q: vals[int(q * (len(vals) - 1))] for q in QUANTILES}
+    return _summary(totals, latency, targets)
+
+
+def merge_sketches(
+    events: Iterable[Dict[str, Any]], name: str, by: str
+) -> Dict[str, QuantileSketch]:
+    """Merge the ``type: sketch`` snapshots of ``name`` per value of label ``by``.
+
+    Snapshots from any number of processes and days combine into one sketch
+    per group, so quantiles never need the raw samples.
+    """
+    out: Dict[str, QuantileSketch] = {}
+    for e in events:
+        if e.get("type") != "sketch" or e.get("name") != name:
+            continue
+        group = str((e.get("labels") or {}).get(by) or "unknown")
+        sk = QuantileSketch.from_dict(e.get("sketch") or {})
+        out[group] = out[group].merge(sk) if group in out else sk
+    return out
+
+
+def summarize(paths: Iterable[Path], targets: Dict[str, Any]) -> Dict[str, Any]:
+    """Same result as ``compute_slo(load_events(paths), targets)`` from warehouse rollups.
+
+    Raw phase-latency samples stay exact; sketch snapshots are merged across
+    files (processes and days) without loading individual events.
+    """
+    paths = [p for p in paths if Path(p).exists()]
+    if not paths:
+        return _summary({}, {}, targets)
+    totals = warehouse.metric_totals(paths, COUNTERS)
+    latency = {
+        by: {
+            k: {q: sk.quantile(q) for q in QUANTILES}
+            for k, sk in warehouse.sketches(paths, name, by=by).items()
+        }
+        for by, name in LATENCY_SERIES.items()
+    }
+    latency["phase"] = warehouse.percentiles(paths, LATENCY_SERIES["phase"], QUANTILES)
+    return _summary(totals, latency, targets)
+
+
+def _summary(
+    totals: Dict[str, float],
+    latency: Dict[str, Dict[str, Dict[float, float]]],
+    targets: Dict[str, Any],
+) -> Dict[str, Any]:
+    runs_started = totals.get("runs_started", 0)
+    runs_succeeded = totals.get("runs_succeeded", 0)
+    availability = 0.0
+    if runs_started:
+        availability = 100.0 * runs_succeeded / runs_started
+
+    missing_citations = totals.get("citations_missing", 0)
+    schema_fail = totals.get("schema_validation_failures", 0)
     quality = 100.0
     validity = 100.0
     if runs_started:
@@ -56,7 +110,13 @@ def compute_slo(events: List[Dict[str, Any]], targets: Dict[str, Any]) -> Dict[s
 
     sli_values = {
         "availability": availability,
-        "latency_p95_ms": latency_p95,
+        "latency_p95_ms": {phase: qs[0.95] for phase, qs in latency.get("phase", {}).items()},
+        "latency_quantiles_ms": {
+            by: {
+                k: {f"p{round(q * 100)}": v for q, v in qs.items()} for k, qs in groups.items()
+            }
+            for by, groups in latency.items()
+        },
         "quality": quality,
         "validity": validity,
     }
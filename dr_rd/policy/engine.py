@@ -7,11 +7,14 @@ from typing import Dict, Iterable, List, Set, Any
 
 import yaml
 
+from dr_rd.cache.memo import file_memo
+
 POLICY_PATH = Path(__file__).resolve().parent / "policies.yaml"
 
 
+@file_memo(lambda: POLICY_PATH)
 def load_policies() -> Dict[str, Dict[str, str]]:
-    """Load policy configuration from ``policies.yaml``."""
+    """Load policy configuration from ``policies.yaml`` (cached until the file changes)."""
     data = yaml.safe_load(POLICY_PATH.read_text())
     return data or {}
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 import re
 from pathlib import Path
@@ -7,6 +8,7 @@ from typing import Any, Dict
 
 import yaml
 
+from core.pattern_scan import PatternScanner
 from dr_rd.safety.filters import PII_PATTERNS as SAFETY_PATTERNS
 
 _CFG_PATH = Path("config/retention.yaml")
@@ -33,10 +35,13 @@ def get_pii_patterns() -> Dict[str, re.Pattern]:
     return pats
 
 
+@functools.lru_cache(maxsize=1)
+def pii_scanner() -> PatternScanner:
+    return PatternScanner(get_pii_patterns())
+
+
 def redact_text(text: str, redaction_token: str) -> str:
-    for pat in get_pii_patterns().values():
-        text = pat.sub(redaction_token, text)
-    return text
+    return pii_scanner().sub(text, redaction_token)
 
 
 def redact_json(obj: Any, redaction_token: str) -> Any:
@@ -63,13 +63,19 @@ def sweep_ttl(tenant: tuple[str, str], now: datetime, cfg: Dict[str, Any]) -> Di
             continue
         path = root / _DEF_REGISTRY.get(store, store)
         cutoff = now - timedelta(days=int(ttl))
-        removed = 0
+        removed = []
         if path.exists():
             for f in path.rglob("*"):
                 if f.is_file() and datetime.fromtimestamp(f.stat().st_mtime) < cutoff:
                     f.unlink()
-                    removed += 1
-        report[store] = removed
+                    removed.append(f)
+        if store == "telemetry":
+            logs = [f for f in removed if ".jsonl" in f.name]
+            if logs:
+                from dr_rd.telemetry import warehouse
+
+                warehouse.invalidate(logs)
+        report[store] = len(removed)
     _write_receipt(tenant, "sweep_ttl", report)
     return report
 
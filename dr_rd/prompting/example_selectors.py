@@ -6,6 +6,7 @@ from typing import Dict, List
 
 import yaml
 
+from core import tokenizer
 from dr_rd.cache.memo import MemoCache
 from dr_rd.examples import catalog
 from dr_rd.kb import store
@@ -75,5 +76,5 @@ def pack_for_provider(cands: List[Dict], provider: str, json_mode: bool) -> Dict
             messages.append({"role": "assistant", "content": out_text})
         else:  # gemini
             messages.append({"name": "example", "args": inp, "response": out_text})
-    tokens_est = sum(len(json.dumps(m)) for m in messages) // 4
+    tokens_est = sum(tokenizer.count_batch([json.dumps(m) for m in messages]))
     return {"provider": provider, "messages": messages, "summary": {"n": len(cands), "tokens_est": tokens_est}}
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import re
 from pathlib import Path
@@ -10,8 +11,10 @@ from typing import Any
 import importlib
 
 import yaml
-from jinja2 import Environment, meta
+from jinja2 import Environment, Template, meta
 
+from core import tokenizer
+from dr_rd.cache.memo import file_memo
 from dr_rd.examples import safety_filters
 from dr_rd.prompting import example_selectors
 from dr_rd.prompting.sanitizers import (
@@ -30,13 +33,104 @@ from .prompt_registry import (
 )
 
 CONFIG_PATH = Path("config/reporting.yaml")
-CONFIG = yaml.safe_load(CONFIG_PATH.read_text()) if CONFIG_PATH.exists() else {}
-RAG_CFG = (
-    yaml.safe_load(Path("config/rag.yaml").read_text()) if Path("config/rag.yaml").exists() else {}
-)
+RAG_CONFIG_PATH = Path("config/rag.yaml")
 PLACEHOLDER_TOKEN_RE = re.compile(r"\[(PERSON|ORG|ADDRESS|IP|DEVICE)_\d+\]")
+PLACEHOLDER_NOTE = "Placeholders like [PERSON_1], [ORG_1] are aliases. Use them verbatim."
 JINJA_ENV = Environment()
 
+
+def _load_yaml(path: Path) -> dict[str, Any]:
+    return (yaml.safe_load(path.read_text()) or {}) if path.exists() else {}
+
+
+@file_memo(lambda: CONFIG_PATH)
+def _reporting_config() -> dict[str, Any]:
+    return _load_yaml(CONFIG_PATH)
+
+
+@file_memo(lambda: RAG_CONFIG_PATH)
+def _rag_config() -> dict[str, Any]:
+    return _load_yaml(RAG_CONFIG_PATH)
+
+
+CONFIG = _reporting_config()
+RAG_CFG = _rag_config()
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(
+    role: str | None, task_key: str | None, version: str, user_template: str
+) -> tuple[Template, frozenset[str]]:
+    """Parse a user template once and return it compiled with its undeclared variables.
+
+    Keyed by role, task key and template version; the source is part of the key
+    so a template re-registered under the same version is still recompiled.
+    """
+    ast = JINJA_ENV.parse(user_template)
+    return JINJA_ENV.from_string(ast), frozenset(meta.find_undeclared_variables(ast))
+
+
+_POLICY_SUMMARY: tuple[Any, str] | None = None
+
+
+def _policy_summary() -> str:
+    """Summarise the safety policies, recomputed only when the policy file is reloaded."""
+    global _POLICY_SUMMARY
+    from dr_rd.policy.engine import load_policies
+
+    pol = load_policies()
+    if _POLICY_SUMMARY is None or _POLICY_SUMMARY[0] is not pol:
+        summary = ", ".join(f"{k}:{v['action']}" for k, v in pol.items())
+        _POLICY_SUMMARY = (pol, summary)
+    return _POLICY_SUMMARY[1]
+
+
+@functools.lru_cache(maxsize=512)
+def _system_prefix(
+    system: str,
+    policy_summary: str | None,
+    strict: bool,
+    retrieval_policy: RetrievalPolicy | None,
+    plan_topk: int,
+    io_schema_ref: str,
+) -> str:
+    """Return the static part of a system prompt.
+
+    Everything here depends only on the template, the flags and the loaded
+    policy/RAG config, so each role's prefix is built once per configuration.
+    ``policy_summary`` is ``None`` when safety is disabled and
+    ``retrieval_policy`` is ``None`` when retrieval is off.
+    """
+    system = system.strip()
+    if policy_summary is not None:
+        system += f" Policies: {policy_summary}. Sanitize or refuse."
+        if strict:
+            system += " Redact PII/secrets."
+    if retrieval_policy is not None:
+        policy_meta = RETRIEVAL_POLICY_META[retrieval_policy]
+        system += (
+            f" Retrieval policy {retrieval_policy.name}: use up to {plan_topk} items from "
+            f"{', '.join(policy_meta['source_types'])}; budget {policy_meta['budget_hint']}."
+            " Provide inline numbered citations and a final sources list."
+        )
+    system += f" Return only JSON conforming to {io_schema_ref}. Do not include chain of thought."
+    return system
+
+
+def _render_examples(messages: list[dict[str, Any]]) -> str:
+    """Render packed few-shot messages as text for the end of a cache-layout system prompt."""
+    lines = ["Examples:"]
+    for m in messages:
+        if m.get("role") == "user":
+            lines.append(f"Input: {m.get('content', '')}")
+        elif m.get("role") == "assistant":
+            lines.append(f"Output: {m.get('content', '')}")
+        elif "args" in m:
+            lines.append(f"Input: {m['args']}")
+            lines.append(f"Output: {m.get('response', '')}")
+    return "\n".join(lines)
+
+
 _PLANNER_POSTPROCESSOR_INSTALLED = False
 
 
@@ -190,16 +284,16 @@ class PromptFactory:
             provider_hints = template.provider_hints or {}
             system = template.system
             user_template = template.user_template or ""
-            ast = JINJA_ENV.parse(user_template)
-            placeholders = meta.find_undeclared_variables(ast) if user_template else set()
-            missing = [k for k in placeholders if k not in inputs]
-            if missing:
-                raise ValueError(
-                    "Missing required fields in PromptAgent inputs: " + ", ".join(sorted(missing))
-                )
-            user_prompt = (
-                JINJA_ENV.from_string(user_template).render(**inputs) if user_template else ""
-            )
+            user_prompt = ""
+            if user_template:
+                compiled, placeholders = _compile(role, task_key, template.version, user_template)
+                missing = [k for k in placeholders if k not in inputs]
+                if missing:
+                    raise ValueError(
+                        "Missing required fields in PromptAgent inputs: "
+                        + ", ".join(sorted(missing))
+                    )
+                user_prompt = compiled.render(**inputs)
         else:
             io_schema_ref = spec.get("io_schema_ref") or "unknown"
             retrieval_policy = spec.get("retrieval_policy") or RetrievalPolicy.NONE
@@ -210,17 +304,7 @@ class PromptFactory:
 
         evaluation_hooks = evaluation_hooks or ["self_check_minimal"]
 
-        system = system.strip()
-
         from config import feature_flags
-        from dr_rd.policy.engine import load_policies
-
-        if getattr(feature_flags, "SAFETY_ENABLED", True):
-            pol = load_policies()
-            summary = ", ".join(f"{k}:{v['action']}" for k, v in pol.items())
-            system += f" Policies: {summary}. Sanitize or refuse."
-            if getattr(feature_flags, "FILTERS_STRICT_MODE", True):
-                system += " Redact PII/secrets."
 
         retrieval_enabled = bool(
             getattr(feature_flags, "RAG_ENABLED", False)
@@ -231,7 +315,7 @@ class PromptFactory:
             retrieval_policy, RETRIEVAL_POLICY_META[RetrievalPolicy.NONE]
         )
 
-        topk_map = RAG_CFG.get("topk_defaults", {})
+        topk_map = _rag_config().get("topk_defaults", {})
         plan_topk = topk_map.get(retrieval_policy.name, policy_meta["top_k"])
         retrieval_plan = {
             "policy": retrieval_policy.name,
@@ -240,24 +324,29 @@ class PromptFactory:
             "budget_hint": policy_meta["budget_hint"],
         }
 
-        if retrieval_enabled and retrieval_policy != RetrievalPolicy.NONE:
-            retrieval_text = (
-                f" Retrieval policy {retrieval_policy.name}: use up to {plan_topk} items from "
-                f"{', '.join(policy_meta['source_types'])}; budget {policy_meta['budget_hint']}."
-                " Provide inline numbered citations and a final sources list."
-            )
-            system += retrieval_text
-
-        system += (
-            f" Return only JSON conforming to {io_schema_ref}. Do not include chain of thought."
+        safety = getattr(feature_flags, "SAFETY_ENABLED", True)
+        system = _system_prefix(
+            system,
+            _policy_summary() if safety else None,
+            bool(getattr(feature_flags, "FILTERS_STRICT_MODE", True)),
+            (
+                retrieval_policy
+                if retrieval_enabled and retrieval_policy != RetrievalPolicy.NONE
+                else None
+            ),
+            plan_topk,
+            io_schema_ref,
         )
 
+        # In the cache layout the system message stays byte-identical per role
+        # and everything that varies per call goes at the end of the user message.
+        cache_layout = bool(getattr(feature_flags, "PROMPT_CACHE_LAYOUT", False))
         inputs_blob = (user_prompt or "") + "\n" + (str(inputs) if inputs else "")
         if PLACEHOLDER_TOKEN_RE.search(inputs_blob):
-            system = (
-                system.rstrip()
-                + "\n\nPlaceholders like [PERSON_1], [ORG_1] are aliases. Use them verbatim."
-            )
+            if cache_layout:
+                user_prompt = user_prompt.rstrip() + "\n\n" + PLACEHOLDER_NOTE
+            else:
+                system = system.rstrip() + "\n\n" + PLACEHOLDER_NOTE
 
         llm_hints = {"provider": "auto", "json_strict": True, "tool_use": "prefer"}
         llm_hints.update(provider_hints)
@@ -275,10 +364,11 @@ class PromptFactory:
             and template
             and template.example_policy
         ):
+            config = _reporting_config()
             pol = {
-                "topk": CONFIG.get("EXAMPLE_TOPK_PER_ROLE", 0),
-                "max_tokens": CONFIG.get("EXAMPLE_MAX_TOKENS", 0),
-                "diversity_min": CONFIG.get("EXAMPLE_DIVERSITY_MIN", 0),
+                "topk": config.get("EXAMPLE_TOPK_PER_ROLE", 0),
+                "max_tokens": config.get("EXAMPLE_MAX_TOKENS", 0),
+                "diversity_min": config.get("EXAMPLE_DIVERSITY_MIN", 0),
             }
             pol.update(template.example_policy or {})
             provider = llm_hints.get("provider", "openai")
@@ -286,15 +376,15 @@ class PromptFactory:
                 provider = "openai"
             k_hint = pol.get("topk", 0)
             max_tokens = pol.get("max_tokens", 0)
-            cands = example_selectors.score_candidates(
-                role, spec.get("task_sig", ""), provider, k_hint, max_tokens
-            )
+            # Task-specific ranking would reorder the examples on every call.
+            task_sig = "" if cache_layout else spec.get("task_sig", "")
+            cands = example_selectors.score_candidates(role, task_sig, provider, k_hint, max_tokens)
             policies = safety_filters.load_policies()
             cands = safety_filters.filter_and_redact(cands, policies)
             total = 0
             trimmed = []
-            for c in cands:
-                est = len(json.dumps(c)) // 4
+            counts = tokenizer.count_batch([json.dumps(c) for c in cands], llm_hints.get("model"))
+            for c, est in zip(cands, counts):
                 if total + est > max_tokens:
                     continue
                 trimmed.append(c)
@@ -302,6 +392,11 @@ class PromptFactory:
             pack = example_selectors.pack_for_provider(
                 trimmed, provider, llm_hints.get("json_mode") or llm_hints.get("json_only")
             )
-            prompt["few_shots"] = pack
+            if cache_layout and pack["messages"]:
+                # Inlined into the cached prefix; sending them as messages too
+                # would pay for every example twice.
+                prompt["system"] += "\n\n" + _render_examples(pack["messages"])
+            else:
+                prompt["few_shots"] = pack
 
         return prompt
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 from typing import List
 
+from core import tokenizer
+
 from .types import ContextBundle, Hit
 
 
 def _estimate_tokens(text: str) -> int:
-    return max(len(text) // 4, 1)
+    return max(tokenizer.count(text), 1)
 
 
 def clip_to_budget(hits: List[Hit], token_budget: int, per_doc_token_cap: int) -> ContextBundle:
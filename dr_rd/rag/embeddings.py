@@ -3,9 +3,8 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Sequence
 
 from dr_rd.config.env import get_env
 
@@ -17,6 +16,9 @@ except Exception:  # pragma: no cover
 from dr_rd.cache.file_cache import FileCache
 
 CACHE_DIR = Path(".dr_rd_cache/embed")
+CACHE_TTL_S = 30 * 24 * 3600
+MODEL = "text-embedding-3-small"
+BATCH_SIZE = 256
 cache = FileCache(str(CACHE_DIR))
 
 
@@ -24,15 +26,38 @@ def _hash(text: str) -> str:
     return hashlib.sha1(text.encode("utf-8")).hexdigest()
 
 
-def embed(text: str) -> Dict[str, float] | None:
+def embed_batch(texts: Sequence[str], batch_size: int = BATCH_SIZE) -> List[List[float]] | None:
+    """Embed ``texts`` with one ``embeddings.create`` call per ``batch_size``.
+
+    Vectors are cached per content hash, so only unseen texts hit the API.
+    Returns ``None`` when no OpenAI client is configured.
+    """
     if not OpenAI or not get_env("OPENAI_API_KEY"):
         return None
-    key = _hash(text)
-    cached = cache.get(key)
-    if cached:
-        return json.loads(cached)
-    client = OpenAI()
-    vec = client.embeddings.create(model="text-embedding-3-small", input=text)
-    arr = {str(i): v for i, v in enumerate(vec.data[0].embedding)}
-    cache.put(key, json.dumps(arr))
-    return arr
+    out: List[Optional[List[float]]] = []
+    missing: Dict[str, List[int]] = {}
+    for i, text in enumerate(texts):
+        vec = cache.get(f"{MODEL}:{_hash(text)}", CACHE_TTL_S)
+        out.append(vec)
+        if vec is None:
+            missing.setdefault(text, []).append(i)
+    if missing:
+        client = OpenAI()
+        pending = list(missing)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+            resp = client.embeddings.create(model=MODEL, input=chunk)
+            for item in resp.data:
+                text = chunk[item.index]
+                vec = list(item.embedding)
+                cache.set(f"{MODEL}:{_hash(text)}", vec)
+                for i in missing[text]:
+                    out[i] = vec
+    return out  # type: ignore[return-value]
+
+
+def embed(text: str) -> Dict[str, float] | None:
+    vecs = embed_batch([text])
+    if not vecs:
+        return None
+    return {str(i): v for i, v in enumerate(vecs[0])}
@@ -3,10 +3,23 @@
 from __future__ import annotations
 
 import abc
-from typing import List
+import hashlib
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .types import Doc, QuerySpec
 
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
 
 class Retriever(abc.ABC):
     name: str = "base"
@@ -20,48 +33,198 @@ class Retriever(abc.ABC):
 
 
 class BM25LiteRetriever(Retriever):
-    """Very small TF-IDF/BM25 style retriever using in-memory docs."""
+    """Okapi BM25 over an in-memory inverted index.
+
+    Documents are tokenised once into postings (``term -> [(doc, tf)]``) so a
+    query only touches documents containing its terms; the top ``k`` are
+    selected with a heap.  Fewer matches than ``k`` are padded with zero-score
+    documents in corpus order.  ``add`` extends the index incrementally.
+    """
 
     name = "bm25"
 
-    def __init__(self, docs: List[Doc]):
-        self.docs = docs
+    def __init__(self, docs: List[Doc], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs: List[Doc] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        self._total_len = 0
+        self._norm: List[float] = []
+        self.add(docs)
+
+    def add(self, docs: Iterable[Doc]) -> None:
+        """Index ``docs`` in addition to those already present."""
+        for doc in docs:
+            idx = len(self.docs)
+            terms = Counter(_tokenize(doc.text))
+            for term, tf in terms.items():
+                self._postings.setdefault(term, []).append((idx, tf))
+            length = sum(terms.values())
+            self.docs.append(doc)
+            self._lengths.append(length)
+            self._total_len += length
+        self._norm = []
+
+    def _length_norm(self) -> List[float]:
+        # k1 * (1 - b + b * |d| / avgdl), recomputed only after ``add``.
+        if len(self._norm) != len(self._lengths):
+            avgdl = (self._total_len / len(self._lengths)) if self._lengths else 0.0
+            k1, b = self.k1, self.b
+            self._norm = [
+                k1 * (1 - b + b * (n / avgdl if avgdl else 0.0)) for n in self._lengths
+            ]
+        return self._norm
 
     def search(self, spec: QuerySpec) -> List[Doc]:
-        terms = spec.query.lower().split()
-        scored: List[Doc] = []
-        for doc in self.docs:
-            text = doc.text.lower()
-            score = sum(text.count(t) for t in terms)
-            d = Doc(**doc.__dict__)
-            d.meta["score"] = float(score)
-            scored.append(d)
-        scored.sort(key=lambda d: d.meta.get("score", 0.0), reverse=True)
-        return scored[: spec.top_k]
+        if spec.top_k <= 0 or not self.docs:
+            return []
+        norm = self._length_norm()
+        n_docs = len(self.docs)
+        k1 = self.k1
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(_tokenize(spec.query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for idx, tf in postings:
+                scores[idx] += idf * tf * (k1 + 1) / (tf + norm[idx])
+        top = heapq.nlargest(spec.top_k, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        if len(top) < spec.top_k:  # fill with non-matching docs, as a full ranking would
+            rest = (idx for idx in range(n_docs) if idx not in scores)
+            top += [(idx, 0.0) for idx in islice(rest, spec.top_k - len(top))]
+        return [
+            replace(self.docs[idx], meta={**self.docs[idx].meta, "score": float(score)})
+            for idx, score in top
+        ]
+
+
+def _as_vector(vec: Any) -> List[float]:
+    # Legacy embed functions return ``{"0": x0, "1": x1, ...}``.
+    if isinstance(vec, dict):
+        return [float(v) for _, v in sorted(vec.items(), key=lambda kv: int(kv[0]))]
+    return [float(v) for v in vec]
 
 
 class DenseRetriever(Retriever):
-    """Stub dense retriever that falls back if embeddings unavailable."""
+    """Dot-product retriever over a matrix of document embeddings.
+
+    Document texts are embedded once, in batches, the first time they are
+    searched, and stored as rows of a contiguous float32 matrix keyed by
+    content hash (duplicate texts share a row).  A query then costs one
+    embedding call and one matrix-vector product.  ``batch_embed_fn`` takes a
+    list of texts; when only ``embed_fn`` is given it is called per new text.
+    Texts whose embedding fails (``None``, or the wrong dimension) are retried
+    on the next search.  Without either function the retriever returns nothing.
+    """
 
     name = "dense"
 
-    def __init__(self, docs: List[Doc], embed_fn=None):
-        self.docs = docs
+    def __init__(
+        self,
+        docs: List[Doc],
+        embed_fn: Optional[Callable[[str], Any]] = None,
+        batch_embed_fn: Optional[Callable[[List[str]], Any]] = None,
+        batch_size: int = 128,
+    ):
+        self.docs: List[Doc] = []
         self.embed_fn = embed_fn
+        self.batch_embed_fn = batch_embed_fn
+        self.batch_size = batch_size
+        self._rows: Dict[str, int] = {}
+        self._hashes: List[str] = []
+        self._doc_rows: List[int] = []
+        self._matrix: Any = None
+        self._pending: List[int] = []
+        self.add(docs)
+
+    def add(self, docs: Iterable[Doc]) -> None:
+        """Queue ``docs``; they are embedded on the next :meth:`search`."""
+        for doc in docs:
+            self._pending.append(len(self.docs))
+            self.docs.append(doc)
+            self._hashes.append(hashlib.sha1((doc.text or "").encode("utf-8")).hexdigest())
+            self._doc_rows.append(-1)
+
+    def _embed_many(self, texts: List[str]) -> List[Any]:
+        out: List[Any] = []
+        for start in range(0, len(texts), self.batch_size):
+            chunk = texts[start : start + self.batch_size]
+            if self.batch_embed_fn is not None:
+                vecs = self.batch_embed_fn(chunk) or [None] * len(chunk)
+            else:
+                vecs = [self.embed_fn(t) for t in chunk]  # type: ignore[misc]
+            out.extend(vecs)
+        return out
+
+    def _index(self) -> None:
+        """Embed pending docs; those whose embedding failed stay pending."""
+        if not self._pending:
+            return
+        import numpy as np
+
+        new_texts: Dict[str, str] = {}
+        for i in self._pending:
+            h = self._hashes[i]
+            if h not in self._rows:
+                new_texts.setdefault(h, self.docs[i].text or "")
+        if new_texts:
+            vecs = [
+                _as_vector(v) if v is not None else None
+                for v in self._embed_many(list(new_texts.values()))
+            ]
+            if self._matrix is not None:
+                dim = self._matrix.shape[1]
+            else:
+                dim = next((len(v) for v in vecs if v), 0)
+            good = [(h, v) for h, v in zip(new_texts, vecs) if v and len(v) == dim]
+            if good:
+                base = 0 if self._matrix is None else self._matrix.shape[0]
+                for j, (h, _) in enumerate(good):
+                    self._rows[h] = base + j
+                block = np.asarray([v for _, v in good], dtype="float32")
+                self._matrix = (
+                    block if self._matrix is None else np.concatenate([self._matrix, block])
+                )
+        pending = []
+        for i in self._pending:
+            row = self._rows.get(self._hashes[i])
+            if row is None:
+                pending.append(i)
+            else:
+                self._doc_rows[i] = row
+        self._pending = pending
+
+    def _embed_query(self, text: str) -> Any:
+        if self.embed_fn is not None:
+            vec = self.embed_fn(text)
+        else:
+            vecs = self.batch_embed_fn([text]) if self.batch_embed_fn else None
+            vec = vecs[0] if vecs else None
+        return _as_vector(vec) if vec is not None else None
 
     def search(self, spec: QuerySpec) -> List[Doc]:
-        if not self.embed_fn:
+        if not (self.embed_fn or self.batch_embed_fn) or spec.top_k <= 0 or not self.docs:
+            return []
+        import numpy as np
+
+        q = self._embed_query(spec.query)
+        self._index()
+        if not q or self._matrix is None or len(q) != self._matrix.shape[1]:
             return []
-        q_emb = self.embed_fn(spec.query)
-        scored: List[Doc] = []
-        for doc in self.docs:
-            d_emb = self.embed_fn(doc.text)
-            score = sum(q_emb.get(k, 0) * d_emb.get(k, 0) for k in q_emb)
-            d = Doc(**doc.__dict__)
-            d.meta["score"] = float(score)
-            scored.append(d)
-        scored.sort(key=lambda d: d.meta.get("score", 0.0), reverse=True)
-        return scored[: spec.top_k]
+        row_scores = self._matrix @ np.asarray(q, dtype="float32")
+        rows = np.asarray(self._doc_rows, dtype=np.int64)
+        # Docs whose embedding has not succeeded yet score 0 until it does.
+        scores = np.where(rows >= 0, row_scores[np.maximum(rows, 0)], 0.0)
+        k = min(spec.top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = sorted(top.tolist(), key=lambda i: (-scores[i], i))
+        return [
+            replace(self.docs[i], meta={**self.docs[i].meta, "score": float(scores[i])})
+            for i in top
+        ]
 
 
 class WebSearchRetriever(Retriever):
@@ -6,6 +6,7 @@ from typing import Any, Dict, List
 
 from dr_rd.config.env import get_env
 
+from core import tokenizer
 from core.llm_client import BUDGET
 from core.retrieval import budget as rbudget
 from core.retrieval.budget import get_web_search_call_cap
@@ -55,7 +56,7 @@ def fetch_context(
         rag_snips = [getattr(h, "text", str(h)) for h in hits]
         if BUDGET and rag_hits:
             BUDGET.retrieval_calls += 1
-            BUDGET.retrieval_tokens += sum(len(s.split()) for s in rag_snips)
+            BUDGET.retrieval_tokens += sum(tokenizer.count_batch(rag_snips))
 
     vector_present = bool(cfg.get("vector_index_present"))
     reason = "ok"
@@ -12,12 +12,12 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple, Optional, Protocol
 import json
 import logging
-import httpx
 
 from core.llm_client import call_openai
 from utils.search_tools import search_google, summarize_search
 
 from dr_rd.config.env import get_env
+from dr_rd.connectors.commons import http_get
 from utils.clients import get_cloud_logging_client
 
 log = logging.getLogger("drrd")
@@ -152,10 +152,9 @@ class SerpAPIWebSearchClient:
         if not self.api_key:
             return {"text": "", "sources": []}
         params = {"engine": "google", "q": query, "num": num, "api_key": self.api_key}
-        with httpx.Client(timeout=30) as client:
-            r = client.get("https://serpapi.com/search.json", params=params)
-            r.raise_for_status()
-            data = r.json()
+        data = http_get(
+            "https://serpapi.com/search.json", params=params, retries=1, timeout=30
+        ).json()
 
         items: List[Dict[str, str]] = []
         for item in (data.get("organic_results") or []):
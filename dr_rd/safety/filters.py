@@ -7,6 +7,7 @@ from typing import Any, Dict, Tuple
 
 import yaml
 
+from core.pattern_scan import PatternScanner
 from dr_rd.policy.engine import PolicyDecision, load_policies, evaluate as policy_evaluate
 
 CFG_PATH = Path("config/safety.yaml")
@@ -20,6 +21,8 @@ SECRETS_PATTERNS = {
     name: re.compile(pattern, re.IGNORECASE)
     for name, pattern in SAFETY_CFG.get("secrets_patterns", {}).items()
 }
+PII_SCANNER = PatternScanner(PII_PATTERNS)
+SECRETS_SCANNER = PatternScanner(SECRETS_PATTERNS)
 TOXICITY_THRESHOLD = float(SAFETY_CFG.get("toxicity_threshold", 1.0))
 BLOCKED_KEYWORDS = [w.lower() for w in SAFETY_CFG.get("blocked_keywords", [])]
 ALLOWED_DOMAINS = SAFETY_CFG.get("allowed_link_domains", [])
@@ -27,21 +30,11 @@ LICENSE_MAX_QUOTE_WORDS = int(SAFETY_CFG.get("license_max_quote_words", 0))
 
 
 def detect_pii(text: str) -> Dict[str, str]:
-    matches: Dict[str, str] = {}
-    for name, pat in PII_PATTERNS.items():
-        m = pat.search(text)
-        if m:
-            matches[name] = m.group(0)
-    return matches
+    return {name: span.text for name, span in PII_SCANNER.first(text).items()}
 
 
 def detect_secrets(text: str) -> Dict[str, str]:
-    matches: Dict[str, str] = {}
-    for name, pat in SECRETS_PATTERNS.items():
-        m = pat.search(text)
-        if m:
-            matches[name] = m.group(0)
-    return matches
+    return {name: span.text for name, span in SECRETS_SCANNER.first(text).items()}
 
 
 def detect_toxicity(text: str) -> float:
@@ -5,7 +5,7 @@ import json
 import traceback
 from pathlib import Path
 from threading import Lock
-from typing import Any, Callable, List, Optional
+from typing import Any, Awaitable, Callable, List, Optional
 from time import time
 
 from pydantic import BaseModel
@@ -23,6 +23,8 @@ class APICallRecord(BaseModel):
     prompt_text: str = ""
     response_text: str = ""
     status_code: int | None = None
+    prompt_tokens: int | None = None
+    cached_tokens: int | None = None
     error: bool = False
     exception: str | None = None
     traceback: str | None = None
@@ -81,6 +83,81 @@ class APICallLogger:
             self._records.clear()
 
 
+def _field(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def usage_tokens(usage: Any) -> tuple[int, int]:
+    """Return ``(prompt_tokens, cached_tokens)`` from a Chat or Responses usage block.
+
+    Chat Completions reports ``prompt_tokens_details.cached_tokens``; the
+    Responses API reports ``input_tokens_details.cached_tokens``.
+    """
+    if usage is None:
+        return 0, 0
+    prompt = _field(usage, "prompt_tokens") or _field(usage, "input_tokens") or 0
+    details = _field(usage, "prompt_tokens_details") or _field(usage, "input_tokens_details")
+    cached = _field(details, "cached_tokens") if details is not None else 0
+    try:
+        return int(prompt), int(cached or 0)
+    except (TypeError, ValueError):
+        return 0, 0
+
+
+def _response_text(resp: Any) -> str:
+    if hasattr(resp, "model_dump_json"):
+        return resp.model_dump_json()
+    if hasattr(resp, "json"):
+        try:
+            return json.dumps(resp.json())
+        except Exception:
+            return str(resp)
+    return str(resp)
+
+
+def _log_call(
+    *,
+    api_name: str,
+    endpoint: str,
+    params: dict[str, Any] | None,
+    prompt_text: str,
+    task_id: str,
+    agent: str,
+    ts_start: float,
+    response_text: str,
+    status_code: int | None,
+    error: bool,
+    exc_txt: str | None,
+    tb_txt: str | None,
+    usage: Any = None,
+) -> None:
+    from . import loggers as _loggers
+
+    logger = _loggers.get_api_call_logger()
+    if logger is None:
+        return
+    prompt_tokens, cached_tokens = usage_tokens(usage)
+    record = APICallRecord(
+        ts_start=ts_start,
+        ts_end=time(),
+        run_id=logger.run_id,
+        task_id=task_id,
+        agent=agent,
+        api_name=api_name,
+        endpoint=endpoint,
+        params=params or {},
+        prompt_text=prompt_text,
+        response_text=response_text if not error else "",
+        status_code=status_code,
+        prompt_tokens=prompt_tokens if usage is not None else None,
+        cached_tokens=cached_tokens if usage is not None else None,
+        error=error,
+        exception=exc_txt,
+        traceback=tb_txt,
+    )
+    logger.log(record)
+
+
 def instrumented_api_call(
     api_name: str,
     endpoint: str,
@@ -92,27 +169,18 @@ def instrumented_api_call(
     agent: str = "",
 ) -> Any:
     """Execute ``call`` and log request/response to the global APICallLogger."""
-    from . import loggers as _loggers
-
-    logger = _loggers.get_api_call_logger()
     ts_start = time()
     error = False
     exc_txt: str | None = None
     tb_txt: str | None = None
     status_code: int | None = None
     response_text = ""
+    usage: Any = None
     try:
         resp = call()
         status_code = getattr(resp, "http_status", None)
-        if hasattr(resp, "model_dump_json"):
-            response_text = resp.model_dump_json()
-        elif hasattr(resp, "json"):
-            try:
-                response_text = json.dumps(resp.json())
-            except Exception:
-                response_text = str(resp)
-        else:
-            response_text = str(resp)
+        usage = getattr(resp, "usage", None)
+        response_text = _response_text(resp)
         return resp
     except Exception as e:
         error = True
@@ -120,22 +188,65 @@ def instrumented_api_call(
         tb_txt = traceback.format_exc()
         raise
     finally:
-        ts_end = time()
-        if logger is not None:
-            record = APICallRecord(
-                ts_start=ts_start,
-                ts_end=ts_end,
-                run_id=logger.run_id,
-                task_id=task_id,
-                agent=agent,
-                api_name=api_name,
-                endpoint=endpoint,
-                params=params or {},
-                prompt_text=prompt_text,
-                response_text=response_text if not error else "",
-                status_code=status_code,
-                error=error,
-                exception=exc_txt,
-                traceback=tb_txt,
-            )
-            logger.log(record)
+        _log_call(
+            api_name=api_name,
+            endpoint=endpoint,
+            params=params,
+            prompt_text=prompt_text,
+            task_id=task_id,
+            agent=agent,
+            ts_start=ts_start,
+            response_text=response_text,
+            status_code=status_code,
+            error=error,
+            exc_txt=exc_txt,
+            tb_txt=tb_txt,
+            usage=usage,
+        )
+
+
+async def ainstrumented_api_call(
+    api_name: str,
+    endpoint: str,
+    params: dict[str, Any] | None,
+    prompt_text: str,
+    call: Callable[[], Awaitable[Any]],
+    *,
+    task_id: str = "",
+    agent: str = "",
+) -> Any:
+    """Await ``call`` and log request/response like :func:`instrumented_api_call`."""
+    ts_start = time()
+    error = False
+    exc_txt: str | None = None
+    tb_txt: str | None = None
+    status_code: int | None = None
+    response_text = ""
+    usage: Any = None
+    try:
+        resp = await call()
+        status_code = getattr(resp, "http_status", None)
+        usage = getattr(resp, "usage", None)
+        response_text = _response_text(resp)
+        return resp
+    except Exception as e:
+        error = True
+        exc_txt = repr(e)
+        tb_txt = traceback.format_exc()
+        raise
+    finally:
+        _log_call(
+            api_name=api_name,
+            endpoint=endpoint,
+            params=params,
+            prompt_text=prompt_text,
+            task_id=task_id,
+            agent=agent,
+            ts_start=ts_start,
+            response_text=response_text,
+            status_code=status_code,
+            error=error,
+            exc_txt=exc_txt,
+            tb_txt=tb_txt,
+            usage=usage,
+        )
@@ -5,11 +5,17 @@ import socket
 from pathlib import Path
 from typing import Any, Dict, List
 
+from .sketch import QuantileSketch
+
 
 class Exporter:
     def write(self, event: Dict[str, Any]) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            self.write(event)
+
 
 class FileExporter(Exporter):
     def __init__(self, log_dir: Path) -> None:
@@ -21,9 +27,12 @@ class FileExporter(Exporter):
         return self.log_dir / f"{day}.jsonl"
 
     def write(self, event: Dict[str, Any]) -> None:
-        path = self._file_path()
-        with open(path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.write_batch([event])
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+        with open(self._file_path(), "a", encoding="utf-8") as fh:
+            fh.write(lines)
 
 
 class StatsDExporter(Exporter):
@@ -35,12 +44,22 @@ class StatsDExporter(Exporter):
         name = event.get("name")
         val = event.get("value", 0)
         metric_type = event.get("type", "gauge")
+        if metric_type == "sketch":
+            sk = QuantileSketch.from_dict(event.get("sketch") or {})
+            for q in (0.5, 0.95, 0.99):
+                value = sk.quantile(q)
+                if value is not None:
+                    self._send(f"{name}.p{int(q * 100)}:{value}|g")
+            return
         if metric_type == "counter":
             payload = f"{name}:{val}|c"
         elif metric_type == "histogram":
             payload = f"{name}:{val}|ms"
         else:
             payload = f"{name}:{val}|g"
+        self._send(payload)
+
+    def _send(self, payload: str) -> None:
         try:
             self.sock.sendto(payload.encode(), self.addr)
         except Exception:
@@ -1,28 +1,81 @@
+import atexit
 import json
 import os
+import threading
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from .exporters import get_exporters
 from .sampling import should_sample
+from .sketch import QuantileSketch
+from .writer import BackgroundWriter
 
 TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "true").lower() == "true"
 SAMPLING_RATE = float(os.getenv("TELEMETRY_SAMPLING_RATE", "1.0"))
+# Histograms are folded into per-(name, labels) quantile sketches and exported
+# as one ``type: sketch`` snapshot per series every SKETCH_FLUSH_S seconds.
+SKETCH_FLUSH_S = float(os.getenv("TELEMETRY_SKETCH_FLUSH_S", "60"))
 
 _exporters = get_exporters()
 
 
+def _export_batch(events: list) -> None:
+    for exp in _exporters:
+        try:
+            exp.write_batch(events)
+        except Exception:
+            pass
+
+
+_writer = BackgroundWriter(_export_batch, name="telemetry-metrics")
+
+
 def _emit(event: Dict[str, Any]) -> None:
     if not TELEMETRY_ENABLED:
         return
     if not should_sample(SAMPLING_RATE):
         return
     event.setdefault("timestamp", time.time())
-    for exp in _exporters:
-        try:
-            exp.write(event)
-        except Exception:
-            pass
+    _writer.submit(event)
+
+
+_SketchKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+_sketch_lock = threading.Lock()
+_sketches: Dict[_SketchKey, Tuple[str, Dict[str, Any], QuantileSketch]] = {}
+_sketch_state = {"pid": os.getpid(), "flushed": time.monotonic()}
+
+
+def snapshot_sketches() -> int:
+    """Export and reset every pending sketch; return how many series were sent."""
+    with _sketch_lock:
+        pending = list(_sketches.values())
+        _sketches.clear()
+        _sketch_state["flushed"] = time.monotonic()
+    now = time.time()
+    for name, labels, sk in pending:
+        _writer.submit(
+            {
+                "type": "sketch",
+                "name": name,
+                "value": sk.sum,
+                "labels": labels,
+                "sketch": sk.to_dict(),
+                "timestamp": now,
+            }
+        )
+    return len(pending)
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Snapshot sketches and hand all queued metrics to the exporters.
+
+    Returns ``False`` on timeout.
+    """
+    snapshot_sketches()
+    return _writer.flush(timeout)
+
+
+atexit.register(flush)
 
 
 def inc(name: str, value: int = 1, **labels: Any) -> None:
@@ -30,7 +83,20 @@ def inc(name: str, value: int = 1, **labels: Any) -> None:
 
 
 def observe(name: str, value: float, **labels: Any) -> None:
-    _emit({"type": "histogram", "name": name, "value": float(value), "labels": labels})
+    if not TELEMETRY_ENABLED:
+        return
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _sketch_lock:
+        if _sketch_state["pid"] != os.getpid():  # forked child: parent owns these samples
+            _sketches.clear()
+            _sketch_state["pid"] = os.getpid()
+        entry = _sketches.get(key)
+        if entry is None:
+            entry = _sketches[key] = (name, dict(labels), QuantileSketch())
+        entry[2].add(float(value))
+        due = time.monotonic() - _sketch_state["flushed"] >= SKETCH_FLUSH_S
+    if due:
+        snapshot_sketches()
 
 
 def set_gauge(name: str, value: float, **labels: Any) -> None:
@@ -0,0 +1,117 @@
+"""Mergeable quantile sketch for latency-style metrics.
+
+A DDSketch-style log-bucketed histogram: every positive value lands in bucket
+``ceil(log(v) / log(gamma))`` with ``gamma = (1 + alpha) / (1 - alpha)``, so
+any reported quantile is within ``alpha`` relative error of the true value.
+Memory is bounded by ``max_buckets`` (the lowest buckets are collapsed first),
+and two sketches merge by adding bucket counts, which makes snapshots from
+different processes or days combinable in any order.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_ALPHA = 0.01
+MAX_BUCKETS = 2048
+MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    def __init__(self, alpha: float = DEFAULT_ALPHA, max_buckets: int = MAX_BUCKETS) -> None:
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        value = float(value)
+        if value <= MIN_VALUE:
+            self.zero_count += count
+        else:
+            idx = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[idx] = self.buckets.get(idx, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self) -> None:
+        keys = sorted(self.buckets)
+        extra = len(keys) - self.max_buckets
+        folded = sum(self.buckets.pop(k) for k in keys[:extra])
+        target = keys[extra]
+        self.buckets[target] += folded
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.alpha != self.alpha:
+            raise ValueError("cannot merge sketches with different alpha")
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the value at rank ``int(q * (count - 1))`` (``None`` if empty)."""
+        if not self.count:
+            return None
+        rank = int(q * (self.count - 1))
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen > rank:
+                estimate = 2 * self._gamma**idx / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "alpha": self.alpha,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "zero": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sk = cls(alpha=float(data.get("alpha", DEFAULT_ALPHA)))
+        sk.buckets = {int(k): int(v) for k, v in (data.get("buckets") or {}).items()}
+        sk.zero_count = int(data.get("zero", 0))
+        sk.count = int(data.get("count", 0))
+        sk.sum = float(data.get("sum", 0.0))
+        if sk.count:
+            sk.min = float(data["min"])
+            sk.max = float(data["max"])
+        return sk
+
+
+def merge(snapshots: Iterable[Dict[str, Any]]) -> QuantileSketch:
+    """Merge serialised sketches (``to_dict`` output) into one sketch."""
+    out: Optional[QuantileSketch] = None
+    for snap in snapshots:
+        sk = QuantileSketch.from_dict(snap)
+        out = sk if out is None else out.merge(sk)
+    return out or QuantileSketch()
+
+
+__all__ = ["QuantileSketch", "merge"]
@@ -0,0 +1,520 @@
+"""Queryable SQLite warehouse over telemetry JSONL logs.
+
+The JSONL files stay the append-only record of truth.  ``warehouse.sqlite``
+next to them holds every ingested line, partitioned by UTC ``day``, plus
+rollups that are updated as lines are ingested:
+
+* ``rollup_usage`` – tokens, cost and tool usage per day, tenant, provider and model;
+* ``rollup_metrics`` – count and sum per day, metric name and ``phase`` label;
+* ``samples`` – raw histogram values indexed for exact percentile lookups;
+* ``sketches`` – merged quantile sketches per day, metric name and label set.
+
+Each source file is caught up from the last ingested byte offset, so readers
+only parse lines appended since the previous query.  A file is re-ingested
+from scratch when its inode changed, it shrank, or the bytes at its start or
+just before the ingested offset changed (purged, rewritten); a trailing
+partial line is left for the next sync.  Rows of files that no longer exist
+are dropped on every sync, and :func:`invalidate` drops them eagerly after
+retention deletes or rewrites a file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .sketch import QuantileSketch
+
+DB_NAME = "warehouse.sqlite"
+HEAD_BYTES = 256
+
+DDL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS sources (id INTEGER PRIMARY KEY, path TEXT UNIQUE, offset INTEGER, head TEXT, tail TEXT, stamp TEXT);
+CREATE TABLE IF NOT EXISTS events (seq INTEGER PRIMARY KEY AUTOINCREMENT, source INTEGER, day TEXT, ts REAL, kind TEXT, name TEXT, run_id TEXT, data TEXT);
+CREATE INDEX IF NOT EXISTS events_source_day ON events(source, day);
+CREATE INDEX IF NOT EXISTS events_source_ts ON events(source, ts);
+CREATE TABLE IF NOT EXISTS rollup_usage (source INTEGER, day TEXT, org_id TEXT, workspace_id TEXT, provider TEXT, model TEXT, events INTEGER, tokens_in INTEGER, tokens_out INTEGER, total_tokens INTEGER, cost_usd REAL, tool_calls INTEGER, tool_runtime_ms INTEGER, PRIMARY KEY (source, day, org_id, workspace_id, provider, model)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_metrics (source INTEGER, day TEXT, name TEXT, label TEXT, count INTEGER, total REAL, PRIMARY KEY (source, day, name, label)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS samples (source INTEGER, day TEXT, name TEXT, label TEXT, value REAL);
+CREATE INDEX IF NOT EXISTS samples_lookup ON samples(name, label, value);
+CREATE TABLE IF NOT EXISTS sketches (source INTEGER, day TEXT, name TEXT, labels TEXT, data TEXT, PRIMARY KEY (source, day, name, labels)) WITHOUT ROWID;
+"""
+USAGE_FIELDS = (
+    "events",
+    "tokens_in",
+    "tokens_out",
+    "total_tokens",
+    "cost_usd",
+    "tool_calls",
+    "tool_runtime_ms",
+)
+USAGE_KEYS = (
+    "tokens_in",
+    "tokens_out",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cost_usd",
+    "tool_calls",
+    "tool_runtime_ms",
+)
+SOURCE_TABLES = ("events", "rollup_usage", "rollup_metrics", "samples", "sketches")
+
+
+def db_path(paths: Sequence[Path | str]) -> Path:
+    """Return the warehouse serving ``paths`` (``TELEMETRY_WAREHOUSE_PATH`` overrides)."""
+    env = os.getenv("TELEMETRY_WAREHOUSE_PATH")
+    if env:
+        return Path(env)
+    base = Path(paths[0]).parent if paths else Path(".dr_rd/telemetry")
+    return base / DB_NAME
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    for stmt in filter(None, (s.strip() for s in DDL.split(";"))):
+        conn.execute(stmt)
+    return conn
+
+
+def _num(value: Any, cast=float) -> Any:
+    try:
+        return cast(value or 0)
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def _when(ev: Dict[str, Any]) -> Tuple[Optional[float], str]:
+    """Return ``(epoch seconds, day)`` for ``ev``'s ``ts``/``timestamp``."""
+    raw = ev.get("ts", ev.get("timestamp"))
+    if isinstance(raw, (int, float)):
+        dt = datetime.fromtimestamp(raw, tz=timezone.utc)
+        return float(raw), dt.strftime("%Y-%m-%d")
+    if isinstance(raw, str):
+        try:
+            dt = datetime.fromisoformat(raw)
+        except ValueError:
+            return None, ""
+        ts = (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+        return ts, dt.strftime("%Y-%m-%d")
+    return None, ""
+
+
+class _Batch:
+    """Rows and rollup deltas collected while ingesting one chunk."""
+
+    def __init__(self, source: int) -> None:
+        self.source = source
+        self.events: List[tuple] = []
+        self.samples: List[tuple] = []
+        self.usage: Dict[tuple, List[float]] = defaultdict(lambda: [0] * len(USAGE_FIELDS))
+        self.metrics: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0.0])
+        self.sketches: Dict[tuple, QuantileSketch] = {}
+
+    def add(self, line: str, ev: Dict[str, Any]) -> None:
+        ts, day = _when(ev)
+        kind = ev.get("event") or ev.get("type")
+        name = ev.get("name")
+        self.events.append((self.source, day, ts, kind, name, ev.get("run_id"), line))
+        if name is not None and "value" in ev:
+            labels = ev.get("labels") or {}
+            label = str(labels.get("phase") or "") if isinstance(labels, dict) else ""
+            acc = self.metrics[(day, name, label)]
+            if ev.get("type") == "sketch":
+                sk = QuantileSketch.from_dict(ev.get("sketch") or {})
+                acc[0] += sk.count
+                acc[1] += sk.sum
+                key = (day, name, json.dumps(labels, sort_keys=True, default=str))
+                prev = self.sketches.get(key)
+                self.sketches[key] = sk if prev is None else prev.merge(sk)
+            else:
+                value = _num(ev.get("value"))
+                acc[0] += 1
+                acc[1] += value
+                if ev.get("type") == "histogram":
+                    self.samples.append((self.source, day, name, label, value))
+        if not any(k in ev for k in USAGE_KEYS):
+            return
+        tokens_in = ev.get("tokens_in", ev.get("prompt_tokens"))
+        tokens_out = ev.get("tokens_out", ev.get("completion_tokens"))
+        tin, tout = _num(tokens_in, int), _num(tokens_out, int)
+        key = (
+            day,
+            ev.get("org_id") or "default",
+            ev.get("workspace_id") or "default",
+            ev.get("provider") or "",
+            ev.get("model") or "",
+        )
+        deltas = (
+            1,
+            tin,
+            tout,
+            _num(ev.get("total_tokens", tin + tout), int),
+            _num(ev.get("cost_usd")),
+            _num(ev.get("tool_calls"), int),
+            _num(ev.get("tool_runtime_ms"), int),
+        )
+        acc = self.usage[key]
+        for i, d in enumerate(deltas):
+            acc[i] += d
+
+    def write(self, conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT INTO events (source, day, ts, kind, name, run_id, data) VALUES (?,?,?,?,?,?,?)",
+            self.events,
+        )
+        conn.executemany(
+            "INSERT INTO samples (source, day, name, label, value) VALUES (?,?,?,?,?)",
+            self.samples,
+        )
+        cols = ", ".join(USAGE_FIELDS)
+        updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in USAGE_FIELDS)
+        conn.executemany(
+            f"INSERT INTO rollup_usage (source, day, org_id, workspace_id, provider, model, {cols}) "
+            f"VALUES (?,?,?,?,?,?,{','.join('?' * len(USAGE_FIELDS))}) "
+            f"ON CONFLICT DO UPDATE SET {updates}",
+            [(self.source, *k, *v) for k, v in self.usage.items()],
+        )
+        conn.executemany(
+            "INSERT INTO rollup_metrics (source, day, name, label, count, total) VALUES (?,?,?,?,?,?) "
+            "ON CONFLICT DO UPDATE SET count = count + excluded.count, total = total + excluded.total",
+            [(self.source, *k, *v) for k, v in self.metrics.items()],
+        )
+        for (day, name, labels), sk in self.sketches.items():
+            row = conn.execute(
+                "SELECT data FROM sketches WHERE source=? AND day=? AND name=? AND labels=?",
+                (self.source, day, name, labels),
+            ).fetchone()
+            if row:
+                sk = QuantileSketch.from_dict(json.loads(row[0])).merge(sk)
+            conn.execute(
+                "INSERT OR REPLACE INTO sketches (source, day, name, labels, data) VALUES (?,?,?,?,?)",
+                (self.source, day, name, labels, json.dumps(sk.to_dict())),
+            )
+
+
+def _drop(conn: sqlite3.Connection, source: int) -> None:
+    for table in SOURCE_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE source=?", (source,))
+
+
+def _forget(conn: sqlite3.Connection, source: int) -> None:
+    _drop(conn, source)
+    conn.execute("DELETE FROM sources WHERE id=?", (source,))
+
+
+def _stamp(st: os.stat_result) -> str:
+    return f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def _digest(fh, start: int, size: int) -> str:
+    fh.seek(start)
+    return hashlib.sha1(fh.read(size)).hexdigest()
+
+
+def _tail(fh, offset: int) -> str:
+    """Digest of the bytes just before ``offset`` (the last ones ingested)."""
+    return _digest(fh, max(0, offset - HEAD_BYTES), min(offset, HEAD_BYTES))
+
+
+def _sync_one(conn: sqlite3.Connection, p: Path) -> Optional[int]:
+    key = str(p.resolve())
+    row = conn.execute("SELECT id, stamp FROM sources WHERE path=?", (key,)).fetchone()
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        st = None
+    stamp = _stamp(st) if st else None
+    if row and stamp == row[1]:
+        return row[0]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT id, offset, head, tail, stamp FROM sources WHERE path=?", (key,)
+        ).fetchone()
+        if st is None:
+            if row:
+                _forget(conn, row[0])
+            conn.execute("COMMIT")
+            return None
+        size = st.st_size
+        if row is None:
+            cur = conn.execute("INSERT INTO sources (path, offset, head) VALUES (?, 0, '')", (key,))
+            source, offset, head, tail, old_stamp = cur.lastrowid, 0, "", "", None
+        else:
+            source, offset, head, tail, old_stamp = row
+        same_inode = bool(old_stamp) and old_stamp.split(":", 1)[0] == str(st.st_ino)
+        with p.open("rb") as fh:
+            new_head = _digest(fh, 0, HEAD_BYTES)
+            rewritten = (
+                size < offset
+                or (offset and not same_inode)
+                or (head and head != new_head)
+                or (tail and tail != _tail(fh, offset))
+            )
+            if rewritten:
+                _drop(conn, source)
+                offset = 0
+            fh.seek(offset)
+            chunk = fh.read(size - offset)
+            end = chunk.rfind(b"\n") + 1
+            if end:
+                batch = _Batch(source)
+                for raw in chunk[:end].splitlines():
+                    if not raw.strip():
+                        continue
+                    line = raw.decode("utf-8", errors="replace")
+                    try:
+                        ev = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(ev, dict):
+                        batch.add(line, ev)
+                batch.write(conn)
+                offset += end
+            new_tail = _tail(fh, offset) if offset else ""
+        if offset < HEAD_BYTES:
+            new_head = ""
+        conn.execute(
+            "UPDATE sources SET offset=?, head=?, tail=?, stamp=? WHERE id=?",
+            (offset, new_head, new_tail, stamp, source),
+        )
+        conn.execute("COMMIT")
+        return source
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _prune(conn: sqlite3.Connection) -> None:
+    """Drop the rows of source files that no longer exist (purged, swept)."""
+    rows = conn.execute("SELECT id, path FROM sources").fetchall()
+    gone = [sid for sid, path in rows if not Path(path).exists()]
+    if not gone:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for sid in gone:
+            _forget(conn, sid)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _sources(conn: sqlite3.Connection, paths: Iterable[Path | str]) -> List[int]:
+    _prune(conn)
+    out: List[int] = []
+    for p in paths:
+        source = _sync_one(conn, Path(p))
+        if source is not None:
+            out.append(source)
+    return out
+
+
+def _in(ids: Sequence[int]) -> str:
+    return "source IN (" + ",".join("?" * len(ids)) + ")"
+
+
+def sync(paths: Sequence[Path | str]) -> None:
+    """Ingest anything appended to ``paths`` since the last sync."""
+    with closing(_connect(db_path(paths))) as conn:
+        _sources(conn, paths)
+
+
+def invalidate(paths: Sequence[Path | str]) -> None:
+    """Drop everything ingested from ``paths`` (deleted or rewritten in place).
+
+    Rewritten files are ingested again on the next read.  Does nothing when
+    the warehouse has not been created.
+    """
+    paths = list(paths)
+    db = db_path(paths)
+    if not paths or not db.exists():
+        return
+    with closing(_connect(db)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for p in paths:
+                row = conn.execute(
+                    "SELECT id FROM sources WHERE path=?", (str(Path(p).resolve()),)
+                ).fetchone()
+                if row:
+                    _forget(conn, row[0])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def events(
+    paths: Sequence[Path | str],
+    *,
+    since: float | None = None,
+    until: float | None = None,
+    last: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Return the events in ``paths`` in file order.
+
+    ``since``/``until`` bound ``ts`` (epoch seconds, end exclusive); ``last``
+    keeps only the newest ``last`` events.
+    """
+    paths = list(paths)
+    with closing(_connect(db_path(paths))) as conn:
+        ids = _sources(conn, paths)
+        if not ids:
+            return []
+        sql = f"SELECT data FROM events WHERE {_in(ids)}"
+        args: List[Any] = list(ids)
+        if since is not None:
+            sql += " AND ts >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND ts < ?"
+            args.append(until)
+        if last is not None:
+            sql += " ORDER BY seq DESC LIMIT ?"
+            args.append(last)
+            rows = conn.execute(sql, args).fetchall()[::-1]
+        else:
+            rows = conn.execute(sql + " ORDER BY seq", args).fetchall()
+    return [json.loads(line) for (line,) in rows]
+
+
+def usage(
+    paths: Sequence[Path | str],
+    *,
+    since_day: str | None = None,
+    until_day: str | None = None,
+) -> List[Dict[str, Any]]:
+    """Return usage totals per day, tenant, provider and model (days inclusive)."""
+    paths = list(paths)
+    with closing(_connect(db_path(paths))) as conn:
+        ids = _sources(conn, paths)
+        if not ids:
+            return []
+        sql = (
+            "SELECT day, org_id, workspace_id, provider, model, "
+            + ", ".join(f"SUM({c})" for c in USAGE_FIELDS)
+            + f" FROM rollup_usage WHERE {_in(ids)}"
+        )
+        args: List[Any] = list(ids)
+        if since_day:
+            sql += " AND day >= ?"
+            args.append(since_day)
+        if until_day:
+            sql += " AND day <= ?"
+            args.append(until_day)
+        sql += " GROUP BY day, org_id, workspace_id, provider, model ORDER BY day"
+        keys = ("day", "org_id", "workspace_id", "provider", "model", *USAGE_FIELDS)
+        return [dict(zip(keys, row)) for row in conn.execute(sql, args)]
+
+
+def metric_totals(paths: Sequence[Path | str], names: Iterable[str]) -> Dict[str, float]:
+    """Return the summed ``value`` of each metric in ``names`` (0 when absent)."""
+    paths, names = list(paths), list(names)
+    totals = {n: 0.0 for n in names}
+    with closing(_connect(db_path(paths))) as conn:
+        ids = _sources(conn, paths)
+        if not ids or not names:
+            return totals
+        sql = (
+            f"SELECT name, SUM(total) FROM rollup_metrics WHERE {_in(ids)} "
+            f"AND name IN ({','.join('?' * len(names))}) GROUP BY name"
+        )
+        for name, total in conn.execute(sql, [*ids, *names]):
+            totals[name] = total or 0.0
+    return totals
+
+
+def sketches(
+    paths: Sequence[Path | str],
+    name: str,
+    *,
+    by: str | None = None,
+    since_day: str | None = None,
+    until_day: str | None = None,
+) -> Dict[str, QuantileSketch]:
+    """Merge the stored sketches of ``name``, grouped by label ``by`` (days inclusive)."""
+    paths = list(paths)
+    out: Dict[str, QuantileSketch] = {}
+    with closing(_connect(db_path(paths))) as conn:
+        ids = _sources(conn, paths)
+        if not ids:
+            return out
+        sql = f"SELECT labels, data FROM sketches WHERE name=? AND {_in(ids)}"
+        args: List[Any] = [name, *ids]
+        if since_day:
+            sql += " AND day >= ?"
+            args.append(since_day)
+        if until_day:
+            sql += " AND day <= ?"
+            args.append(until_day)
+        for labels, data in conn.execute(sql, args):
+            group = str(json.loads(labels).get(by) or "unknown") if by else ""
+            sk = QuantileSketch.from_dict(json.loads(data))
+            out[group] = out[group].merge(sk) if group in out else sk
+    return out
+
+
+def percentiles(
+    paths: Sequence[Path | str], name: str, qs: Sequence[float] = (0.5, 0.95)
+) -> Dict[str, Dict[float, float]]:
+    """Return ``{phase: {q: value}}`` for histogram ``name``.
+
+    Raw samples use the nearest-rank-below convention
+    ``sorted(values)[int(q * (n - 1))]`` exactly; phases that also have sketch
+    snapshots are answered from the merged sketch (within its relative error).
+    """
+    paths = list(paths)
+    merged = sketches(paths, name, by="phase")
+    out: Dict[str, Dict[float, float]] = {}
+    with closing(_connect(db_path(paths))) as conn:
+        ids = _sources(conn, paths)
+        if not ids:
+            return out
+        counts = conn.execute(
+            f"SELECT label, COUNT(*) FROM samples WHERE name=? AND {_in(ids)} GROUP BY label",
+            [name, *ids],
+        ).fetchall()
+        for label, n in counts:
+            phase = label or "unknown"
+            if phase in merged:
+                for (value,) in conn.execute(
+                    f"SELECT value FROM samples WHERE name=? AND label=? AND {_in(ids)}",
+                    [name, label, *ids],
+                ):
+                    merged[phase].add(value)
+                continue
+            out[phase] = {
+                q: conn.execute(
+                    f"SELECT value FROM samples WHERE name=? AND label=? AND {_in(ids)} "
+                    "ORDER BY value LIMIT 1 OFFSET ?",
+                    [name, label, *ids, int(q * (n - 1))],
+                ).fetchone()[0]
+                for q in qs
+            }
+    for phase, sk in merged.items():
+        out[phase] = {q: sk.quantile(q) for q in qs}
+    return out
+
+
+__all__ = [
+    "db_path",
+    "events",
+    "invalidate",
+    "metric_totals",
+    "percentiles",
+    "sketches",
+    "sync",
+    "usage",
+]
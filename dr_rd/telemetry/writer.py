@@ -0,0 +1,150 @@
+"""Background batching writer shared by telemetry sinks.
+
+Callers hand items to :meth:`BackgroundWriter.submit`, which only appends to
+a bounded in-memory queue.  A daemon thread drains the queue every
+``flush_interval_s`` (or as soon as ``batch_size`` items are waiting) and
+passes each batch to ``sink`` in one call, so file sinks pay one open/append
+per batch instead of per event.  When the queue is full new items are
+dropped (optionally after waiting ``block_s`` for space) and counted in
+:meth:`stats`.  Pending items are flushed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class BackgroundWriter:
+    def __init__(
+        self,
+        sink: Callable[[List[Any]], None],
+        *,
+        name: str = "telemetry-writer",
+        max_queue: int | None = None,
+        batch_size: int | None = None,
+        flush_interval_s: float | None = None,
+        block_s: float | None = None,
+    ) -> None:
+        self.sink = sink
+        self.name = name
+        self.max_queue = int(max_queue or _env_float("TELEMETRY_QUEUE_MAX", 10_000))
+        self.batch_size = int(batch_size or _env_float("TELEMETRY_BATCH_SIZE", 256))
+        self.flush_interval_s = (
+            flush_interval_s
+            if flush_interval_s is not None
+            else _env_float("TELEMETRY_FLUSH_INTERVAL_S", 0.5)
+        )
+        self.block_s = (
+            block_s if block_s is not None else _env_float("TELEMETRY_QUEUE_BLOCK_MS", 0) / 1000.0
+        )
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self) -> None:
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+        self._flush_requested = False
+        self._counts: Dict[str, int] = {
+            "submitted": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "errors": 0,
+        }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def submit(self, item: Any) -> bool:
+        """Queue ``item``; return ``False`` if it was dropped."""
+        if self._pid != os.getpid():  # forked child: the writer thread is gone
+            self._reset()
+        with self._cond:
+            if len(self._queue) >= self.max_queue and self.block_s > 0:
+                self._cond.wait_for(lambda: len(self._queue) < self.max_queue, self.block_s)
+            if len(self._queue) >= self.max_queue:
+                self._counts["dropped"] += 1
+                return False
+            self._queue.append(item)
+            self._counts["submitted"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+            self._ensure_thread()
+        return True
+
+    def _take(self) -> List[Any]:
+        batch = list(self._queue)
+        self._queue.clear()
+        self._cond.notify_all()  # wake producers blocked on a full queue
+        return batch
+
+    def _write(self, batch: List[Any]) -> None:
+        try:
+            self.sink(batch)
+        except Exception:
+            with self._cond:
+                self._counts["errors"] += 1
+        with self._cond:
+            self._counts["written"] += len(batch)
+            self._counts["batches"] += 1
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval_s
+                while len(self._queue) < self.batch_size and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._flush_requested = False
+                batch = self._take()
+            if batch:
+                self._write(batch)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything submitted so far has been written."""
+        if self._pid != os.getpid():
+            return True
+        with self._cond:
+            target = self._counts["submitted"]
+            if self._thread is None or not self._thread.is_alive():
+                batch = self._take()
+            else:
+                batch = []
+                self._flush_requested = True
+                self._cond.notify_all()
+        if batch:
+            self._write(batch)
+        end = time.monotonic() + timeout
+        with self._cond:
+            while self._counts["written"] < target:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._counts, "queued": len(self._queue)}
+
+
+__all__ = ["BackgroundWriter"]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Protocol
+from typing import Any, Callable, List, Protocol, Sequence, Tuple
 
 
 class FAISSLoadError(Exception):
@@ -24,6 +28,128 @@ class _NullRetriever:
         return []
 
 
+# Bundle sidecar describing how document vectors were produced so queries can
+# be embedded the same way.  Bundles without it predate the sidecar and were
+# embedded with the per-process salted ``hash()``, which no query can match.
+EMBEDDING_META = "embedding.json"
+HASH_DIMS = 128
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def hash_embed(texts: Sequence[str], dims: int = HASH_DIMS) -> Any:
+    """Return L2-normalised feature-hashed bag-of-words vectors.
+
+    Tokens are bucketed with ``blake2b`` rather than ``hash()`` so vectors do
+    not change between processes (``PYTHONHASHSEED``).  Offline fallback for
+    bundles built without an embedding provider.
+    """
+    import numpy as np
+
+    out = np.zeros((len(texts), dims), dtype="float32")
+    for row, text in enumerate(texts):
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            out[row, int.from_bytes(digest, "big") % dims] += 1.0
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
+
+
+def _embedder(meta: dict, dims: int) -> Callable[[Sequence[str]], Any] | None:
+    provider = meta.get("provider", "hash")
+    if provider == "hash":
+        return lambda texts: hash_embed(texts, dims)
+    model = meta.get("model") or "text-embedding-3-small"
+
+    def _embed(texts: Sequence[str]) -> Any:
+        import numpy as np
+
+        from utils.embeddings import embed_texts
+
+        vecs = embed_texts(texts, provider=provider, model=model)
+        if not vecs:
+            return None
+        return np.asarray(vecs, dtype="float32")
+
+    return _embed
+
+
+def _read_index(faiss: Any, index_file: Path, mmap: bool) -> Any:
+    """Read ``index_file``, memory-mapping it when the index type allows."""
+    if mmap:
+        flags = getattr(faiss, "IO_FLAG_MMAP", 0) | getattr(faiss, "IO_FLAG_READ_ONLY", 0)
+        if flags:
+            try:
+                return faiss.read_index(str(index_file), flags)
+            except Exception:
+                pass
+    return faiss.read_index(str(index_file))
+
+
+class _FaissRetriever:
+    """Top-k similarity search over a FAISS index and its ``docs.json``."""
+
+    def __init__(
+        self,
+        idx: Any,
+        docs: list,
+        *,
+        embed: Callable[[Sequence[str]], Any] | None = None,
+        normalize: bool = False,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+    ):
+        self.index = idx
+        self.docs = docs
+        self._embed = embed or (lambda texts: hash_embed(texts, idx.d))
+        self._normalize = normalize
+        self._tune(nprobe, ef_search)
+
+    def _tune(self, nprobe: int | None, ef_search: int | None) -> None:
+        try:
+            import faiss  # type: ignore
+        except Exception:  # pragma: no cover - optional dep
+            return
+        if nprobe:
+            try:
+                faiss.extract_index_ivf(self.index).nprobe = int(nprobe)
+            except Exception:
+                pass
+        hnsw = getattr(self.index, "hnsw", None)
+        if ef_search and hnsw is not None:
+            hnsw.efSearch = int(ef_search)
+
+    def _snippet(self, i: int) -> Snippet | None:
+        if i < 0 or i >= len(self.docs):
+            return None
+        doc = self.docs[i]
+        if isinstance(doc, dict):
+            text = str(doc.get("text") or doc.get("content") or "")
+            source = str(doc.get("source") or doc.get("url") or doc.get("id") or i)
+        else:
+            text, source = str(doc), str(i)
+        return Snippet(text=text, source=source)
+
+    def query(self, text: str, top_k: int) -> List[Snippet]:
+        if not text or top_k <= 0 or not self.docs or self.index.ntotal == 0:
+            return []
+        vec = self._embed([text])
+        if vec is None or vec.shape[-1] != self.index.d:
+            return []
+        if self._normalize:
+            import faiss  # type: ignore
+
+            faiss.normalize_L2(vec)
+        k = min(int(top_k), int(self.index.ntotal))
+        _scores, ids = self.index.search(vec, k)
+        out: List[Snippet] = []
+        for i in ids[0]:
+            snip = self._snippet(int(i))
+            if snip is not None:
+                out.append(snip)
+        return out
+
+
 def build_default_retriever(path: str | None = None) -> Tuple[Retriever, int, int]:
     """Return a FAISS retriever, document count, and embedding dims.
 
@@ -31,7 +157,9 @@ def build_default_retriever(path: str | None = None) -> Tuple[Retriever, int, in
     ----------
     path:
         Directory containing ``index.faiss`` and ``docs.json``.  When omitted
-        ``.faiss_index`` is used.
+        ``.faiss_index`` is used.  ``embedding.json`` records the embedding
+        provider/model plus search tuning (``nprobe`` for IVF, ``ef_search``
+        for HNSW).  The index is memory-mapped unless ``FAISS_MMAP=false``.
 
     Returns
     -------
@@ -40,7 +168,7 @@ def build_default_retriever(path: str | None = None) -> Tuple[Retriever, int, in
     Raises
     ------
     FAISSLoadError
-        If the bundle is missing or invalid.
+        If the bundle is missing or invalid, or has no ``embedding.json``.
     """
 
     p = Path(path or ".faiss_index")
@@ -48,28 +176,33 @@ def build_default_retriever(path: str | None = None) -> Tuple[Retriever, int, in
     meta_file = p / "docs.json"
     if not index_file.exists() or not meta_file.exists():
         raise FAISSLoadError("missing index or metadata")
+    emb_file = p / EMBEDDING_META
+    if not emb_file.exists():
+        raise FAISSLoadError(
+            f"missing {EMBEDDING_META}: legacy bundle, rebuild index with "
+            "scripts/build_faiss_index.py"
+        )
     try:
-        import json
         import faiss  # type: ignore
     except Exception as e:  # pragma: no cover - optional dep
         raise FAISSLoadError(str(e)) from e
+    mmap = os.getenv("FAISS_MMAP", "true").lower() not in ("0", "false", "no")
     try:
-        index = faiss.read_index(str(index_file))
+        index = _read_index(faiss, index_file, mmap)
         dims = index.d
         with open(meta_file, "r", encoding="utf-8") as fh:
             docs = json.load(fh) or []
+        emb_meta = json.loads(emb_file.read_text(encoding="utf-8")) or {}
     except Exception as e:  # pragma: no cover
         raise FAISSLoadError(str(e)) from e
 
     doc_count = len(docs)
-
-    class _FaissRetriever:
-        def __init__(self, idx, docs):
-            self.index = idx
-            self.docs = docs
-
-        def query(self, text: str, top_k: int) -> List[Snippet]:  # pragma: no cover - simple stub
-            # This stub returns no results; actual similarity search is out of scope
-            return []
-
-    return _FaissRetriever(index, docs), doc_count, dims
+    retriever = _FaissRetriever(
+        index,
+        docs,
+        embed=_embedder(emb_meta, dims),
+        normalize=bool(emb_meta.get("normalize")),
+        nprobe=emb_meta.get("nprobe"),
+        ef_search=emb_meta.get("ef_search"),
+    )
+    return retriever, doc_count, dims
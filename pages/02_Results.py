@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from urllib.parse import urlencode
 
@@ -17,7 +16,6 @@ from app.ui.trace_viewer import render_trace
 from utils import run_reproduce
 from utils.flags import is_enabled
 from utils.i18n import tr as t
-from utils.paths import artifact_path
 from utils.query_params import encode_config
 from utils.redaction import redact_public
 from utils.run_config import RunConfig, to_orchestrator_kwargs
@@ -25,6 +23,7 @@ from utils.runs import last_run_id, list_runs
 from utils.session_store import init_stores
 from utils.share_links import viewer_from_query
 from utils.telemetry import log_event
+from utils.trace_writer import read_trace
 
 inject()
 main_start()
@@ -118,11 +117,7 @@ if runs:
     run_id = selected
     meta = next((r for r in runs if r["run_id"] == run_id), {})
     log_event({"event": "nav_page_view", "page": "trace", "run_id": run_id})
-    trace_path = artifact_path(run_id, "trace", "json")
-    if trace_path.exists():
-        trace = json.loads(trace_path.read_text(encoding="utf-8"))
-    else:
-        trace = []
+    trace = read_trace(run_id)
     if viewer_mode:
         for step in trace:
             if isinstance(step, dict):
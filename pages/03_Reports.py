@@ -27,6 +27,7 @@ from utils.runs import last_run_id, load_run_meta
 from utils.share_links import viewer_from_query
 from utils.telemetry import log_event, safety_export_blocked
 from utils.trace_export import flatten_trace_rows
+from utils.trace_writer import read_trace
 
 inject()
 main_start()
@@ -125,8 +126,7 @@ else:
         if st.button("Resume run", width="stretch", help="Continue this run"):
             st.query_params.update({"resume_from": run_id, "view": "run"})
             st.switch_page("app.py")
-    trace_path = artifact_path(run_id, "trace", "json")
-    trace = json.loads(trace_path.read_text(encoding="utf-8")) if trace_path.exists() else []
+    trace = read_trace(run_id)
     lock_path = artifact_path(run_id, "run_config.lock", "json")
     lock = json.loads(lock_path.read_text(encoding="utf-8")) if lock_path.exists() else {}
     summary_path = artifact_path(run_id, "synth", "md")
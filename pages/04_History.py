@@ -65,10 +65,10 @@ params = dict(st.query_params)
 
 def render_history() -> None:
     notes_lookup = run_notes.all_notes()
-    index = runs_index.load_index()
+    facets = runs_index.facets()
 
-    status_options = sorted({r["status"] for r in index if r.get("status")})
-    mode_options = sorted({r["mode"] for r in index if r.get("mode")})
+    status_options = facets["status"]
+    mode_options = facets["mode"]
     all_tags = sorted({t for n in notes_lookup.values() for t in n.get("tags", [])})
 
     q_default = params.get("q", "")
@@ -104,7 +104,7 @@ def render_history() -> None:
             date_to = datetime.combine(dates[1], datetime.max.time()).timestamp()
 
     rows = runs_index.search(
-        index,
+        None,
         q=q_val,
         status=status_val,
         mode=mode_val,
@@ -112,7 +112,6 @@ def render_history() -> None:
         date_to=date_to,
         favorites_only=fav_val,
         tags=tags_val,
-        notes_lookup=notes_lookup,
     )
 
     if rows:
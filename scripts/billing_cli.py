@@ -8,6 +8,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from dr_rd.billing.invoicing import build_invoice, forecast_next_month  # noqa: E402
+from dr_rd.billing.metering import persist_monthly_usage  # noqa: E402
 from dr_rd.billing.quotas import compute_budget  # noqa: E402
 
 
@@ -18,6 +19,12 @@ def cmd_summarize(args: argparse.Namespace) -> None:
     print(json.dumps(data))
 
 
+def cmd_meter(args: argparse.Namespace) -> None:
+    org, ws = args.tenant.split("/")
+    agg = persist_monthly_usage((org, ws), args.month, args.logs, base_dir=Path(args.base))
+    print(json.dumps(agg["monthly"]))
+
+
 def cmd_invoice(args: argparse.Namespace) -> None:
     org, ws = args.tenant.split("/")
     inv = build_invoice(args.month, (org, ws), base_dir=Path(args.out))
@@ -46,6 +53,13 @@ def main() -> None:
     p_sum.add_argument("--base", default=".dr_rd")
     p_sum.set_defaults(func=cmd_summarize)
 
+    p_meter = sub.add_parser("meter")
+    p_meter.add_argument("--month", required=True)
+    p_meter.add_argument("--tenant", required=True)
+    p_meter.add_argument("--logs", nargs="+", required=True)
+    p_meter.add_argument("--base", default=".dr_rd")
+    p_meter.set_defaults(func=cmd_meter)
+
     p_inv = sub.add_parser("invoice")
     p_inv.add_argument("--month", required=True)
     p_inv.add_argument("--tenant", required=True)
@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
-import argparse, os, json, re, sys
+import argparse, os, json, sys
+from pathlib import Path
+
 import numpy as np
 import faiss
 
-def _embed(text: str, dim: int = 128) -> np.ndarray:
-    vec = np.zeros(dim, dtype="float32")
-    for i, token in enumerate(text.split()):
-        vec[i % dim] += (hash(token) % 1000) / 1000.0
-    return vec
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from knowledge.faiss_store import EMBEDDING_META, HASH_DIMS, hash_embed
 
 def _read_text(path: str) -> str:
     try:
@@ -34,10 +33,44 @@ def _collect_docs(root: str) -> tuple[list[str], list[str]]:
             sources.append(os.path.relpath(p, root))
     return texts, sources
 
+def _embed(texts: list[str], provider: str, model: str) -> np.ndarray:
+    if provider == "hash":
+        return hash_embed(texts, HASH_DIMS)
+    from utils.embeddings import embed_texts
+
+    vecs = embed_texts(texts, provider=provider, model=model)
+    if not vecs:
+        print(f"Embedding provider {provider!r} unavailable", file=sys.stderr)
+        raise SystemExit(1)
+    xb = np.asarray(vecs, dtype="float32")
+    faiss.normalize_L2(xb)
+    return xb
+
+def _build_index(xb: np.ndarray, kind: str, nlist: int, hnsw_m: int):
+    d = xb.shape[1]
+    if kind == "ivf":
+        nlist = max(1, min(nlist, xb.shape[0]))
+        quantizer = faiss.IndexFlatIP(d)
+        index = faiss.IndexIVFFlat(quantizer, d, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(xb)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(d, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+    else:
+        index = faiss.IndexFlatIP(d)
+    index.add(xb)
+    return index
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", "--src", dest="root", default=".", help="repo/corpus root")
     ap.add_argument("--out", "--dst", dest="out", default="memory", help="output dir")
+    ap.add_argument("--embedder", default="hash", choices=["hash", "openai", "local"])
+    ap.add_argument("--model", default="text-embedding-3-small", help="embedding model")
+    ap.add_argument("--index-type", default="flat", choices=["flat", "ivf", "hnsw"])
+    ap.add_argument("--nlist", type=int, default=256, help="IVF cell count")
+    ap.add_argument("--nprobe", type=int, default=16, help="IVF cells probed per query")
+    ap.add_argument("--hnsw-m", type=int, default=32, help="HNSW graph degree")
+    ap.add_argument("--ef-search", type=int, default=64, help="HNSW search breadth")
     args = ap.parse_args()
 
     texts, sources = _collect_docs(args.root)
@@ -45,15 +78,24 @@ def main():
         print("No docs found under README.md or ./docs", file=sys.stderr)
         raise SystemExit(1)
 
-    xb = np.vstack([_embed(t) for t in texts])
-    index = faiss.IndexFlatL2(xb.shape[1])
-    index.add(xb)
+    xb = _embed(texts, args.embedder, args.model)
+    index = _build_index(xb, args.index_type, args.nlist, args.hnsw_m)
 
     os.makedirs(args.out, exist_ok=True)
     faiss.write_index(index, os.path.join(args.out, "index.faiss"))
     docs = [{"text": t, "source": s} for t, s in zip(texts, sources)]
     with open(os.path.join(args.out, "docs.json"), "w", encoding="utf-8") as fh:
         json.dump(docs, fh)
+    meta = {
+        "provider": args.embedder,
+        "model": args.model if args.embedder != "hash" else None,
+        "normalize": args.embedder != "hash",
+        "index_type": args.index_type,
+        "nprobe": args.nprobe if args.index_type == "ivf" else None,
+        "ef_search": args.ef_search if args.index_type == "hnsw" else None,
+    }
+    with open(os.path.join(args.out, EMBEDDING_META), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh)
 
     print(
         f"Wrote {len(docs)} docs to {args.out}/index.faiss and {args.out}/docs.json (root={args.root})"
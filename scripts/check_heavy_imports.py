@@ -19,6 +19,9 @@ BLOCKED = {
     "playwright",
     "pydantic",
     "pyarrow",
+    "fitz",
+    "pymupdf",
+    "markdown_pdf",
 }
 
 
@@ -92,5 +95,9 @@ def main(paths: Iterable[Path]) -> int:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    ui_paths = list(Path("app").rglob("*.py")) + list(Path("pages").rglob("*.py"))
+    ui_paths = [
+        p
+        for p in list(Path("app").rglob("*.py")) + list(Path("pages").rglob("*.py"))
+        if "_archive" not in p.parts
+    ]
     raise SystemExit(main(ui_paths))
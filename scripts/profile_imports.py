@@ -1,18 +1,48 @@
 #!/usr/bin/env python3
-"""Profile import times from ``-X importtime`` logs."""
+"""Profile import times from ``-X importtime`` logs.
+
+With ``--check`` the script imports each cold-start entry point in a fresh
+interpreter and enforces :data:`ENTRY_BUDGETS`: the cumulative import time of
+the entry module must stay under its budget (scaled by
+``IMPORT_BUDGET_SCALE`` for slow runners) and none of its ``forbid`` modules
+may be loaded as a side effect.
+"""
 
 from __future__ import annotations
 
 import argparse
 import os
+import subprocess
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+
+# Entry points that are imported on every pod/worker start.
+ENTRY_BUDGETS: dict[str, dict] = {
+    "app": {
+        "ms": 2500,
+        "forbid": ("fitz", "pymupdf", "markdown_pdf", "google.cloud.logging", "pandas", "numpy"),
+    },
+    "worker_service": {
+        "ms": 1500,
+        "forbid": ("core.orchestrator", "core.agents.base_agent", "openai"),
+    },
+    "core.agents.unified_registry": {
+        "ms": 300,
+        "forbid": ("core.agents.base_agent", "core.agents.cto_agent", "core.llm", "openai"),
+    },
+}
+
 
 def parse_importtime(path: Path) -> dict[str, float]:
     """Return mapping of module -> cumulative milliseconds."""
+    return _parse_lines(path.read_text().splitlines())
+
+
+def _parse_lines(lines: list[str]) -> dict[str, float]:
     totals: dict[str, float] = {}
-    for line in path.read_text().splitlines():
+    for line in lines:
         if not line.startswith("import time:"):
             continue
         if "[us]" in line:  # header
@@ -29,12 +59,60 @@ def parse_importtime(path: Path) -> dict[str, float]:
     return totals
 
 
+def profile_module(module: str) -> dict[str, float]:
+    """Import ``module`` in a fresh interpreter and return its import timings."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    return _parse_lines(proc.stderr.splitlines())
+
+
+def check_entry(module: str, enforce_time: bool = True) -> list[str]:
+    """Return budget violations for one entry of :data:`ENTRY_BUDGETS`."""
+    budget = ENTRY_BUDGETS[module]
+    totals = profile_module(module)
+    problems = [
+        f"{module} imports {name}"
+        for name in budget.get("forbid", ())
+        if any(m == name or m.startswith(name + ".") for m in totals)
+    ]
+    limit = budget["ms"] * float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+    took = totals.get(module, 0.0)
+    if enforce_time and took > limit:
+        problems.append(f"{module} took {took:.1f}ms to import (budget {limit:.0f}ms)")
+    return problems
+
+
+def check_all(enforce_time: bool = True) -> int:
+    failed = False
+    for module in ENTRY_BUDGETS:
+        problems = check_entry(module, enforce_time=enforce_time)
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        failed = failed or bool(problems)
+        if not problems:
+            print(f"ok: {module}")
+    return 1 if failed else 0
+
+
 def main(argv: list[str]) -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("log", type=Path, help="log file from -X importtime")
+    ap.add_argument("log", type=Path, nargs="?", help="log file from -X importtime")
     ap.add_argument("--top", type=int, default=10, help="rows to display")
+    ap.add_argument("--check", action="store_true", help="enforce ENTRY_BUDGETS")
     args = ap.parse_args(argv)
 
+    if args.check:
+        return check_all()
+    if args.log is None:
+        ap.error("a log file is required unless --check is given")
+
     totals = parse_importtime(args.log)
     if not totals:
         print("No import timings found", file=sys.stderr)
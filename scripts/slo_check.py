@@ -10,7 +10,6 @@ from dr_rd.ops import slo, alerts
 def main() -> int:
     log_dir = Path(os.getenv("TELEMETRY_LOG_DIR", ".dr_rd/telemetry"))
     paths = sorted(log_dir.glob("*.jsonl"))
-    events = slo.load_events(paths)
     cfg_path = Path("config/slo.yaml")
     targets = {}
     if cfg_path.exists():
@@ -18,7 +17,7 @@ def main() -> int:
 
         with open(cfg_path, "r", encoding="utf-8") as fh:
             targets = yaml.safe_load(fh) or {}
-    summary = slo.compute_slo(events, targets)
+    summary = slo.summarize(paths, targets)
     report = alerts.evaluate(summary, targets.get("slos", {}))
     print(json.dumps(report, indent=2))
     return 1 if report.get("breaches") else 0
@@ -10,11 +10,13 @@ sys.path.insert(0, str(_P(__file__).resolve().parents[1]))
 
 import argparse
 import csv
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 
-from utils.telemetry import read_events
+from dr_rd.telemetry import warehouse
+from utils.telemetry import list_files
+from utils.telemetry_schema import upcast
 
 try:  # optional dependency
     import pyarrow as pa
@@ -35,8 +37,15 @@ def _parse_args() -> argparse.Namespace:
     return ap.parse_args()
 
 
-def _filter_range(events: List[Dict[str, Any]], start: datetime, end: datetime) -> List[Dict[str, Any]]:
-    return [e for e in events if start.timestamp() <= e.get("ts", 0) < end.timestamp()]
+def _load_range(start: datetime, end: datetime | None = None) -> List[Dict[str, Any]]:
+    """Events with ``start <= ts < end`` served from the telemetry warehouse."""
+    paths = list_files()
+    if not paths:
+        return []
+    rows = warehouse.events(
+        paths, since=start.timestamp(), until=end.timestamp() if end else None
+    )
+    return [upcast(e) for e in rows]
 
 
 def _rollup_usage(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -101,11 +110,10 @@ def main() -> int:
     if args.from_ and args.to:
         start = datetime.strptime(args.from_, "%Y-%m-%d")
         end = datetime.strptime(args.to, "%Y-%m-%d") + timedelta(days=1)
-        days = (datetime.utcnow() - start).days + 1
-        events = read_events(days=days)
-        events = _filter_range(events, start, end)
+        events = _load_range(start, end)
     else:
-        events = read_events(days=args.days or 7)
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        events = _load_range(today - timedelta(days=(args.days or 7) - 1))
 
     if args.rollup == "usage":
         rows = _rollup_usage(events)
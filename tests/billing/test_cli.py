@@ -29,6 +29,17 @@ def test_cli_invoice(tmp_path: Path) -> None:
     assert data["total_usd"] > 0
 
 
+def test_cli_meter_writes_summary(tmp_path: Path) -> None:
+    log = tmp_path / "telemetry.jsonl"
+    row = {"ts": "2025-01-01T00:00:00", "org_id": "org", "workspace_id": "ws", "tokens_in": 210000}
+    log.write_text(json.dumps(row) + "\n")
+    cmd = ["python", "scripts/billing_cli.py", "meter", "--month", "2025-01", "--tenant", "org/ws", "--logs", str(log), "--base", str(tmp_path)]
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    assert res.returncode == 0
+    assert json.loads(res.stdout)["tokens_in"] == 210000
+    assert (tmp_path / "tenants" / "org" / "ws" / "billing" / "summary_2025-01.json").exists()
+
+
 def test_generate_invoices_script(tmp_path: Path) -> None:
     _setup_summary(tmp_path)
     cmd = ["python", "scripts/generate_invoices.py", "--month", "2025-01", "--tenant", "org/ws", "--out", str(tmp_path)]
@@ -4,7 +4,7 @@ import json
 from datetime import datetime
 from pathlib import Path
 
-from dr_rd.billing.metering import aggregate_month, collect_usage
+from dr_rd.billing.metering import aggregate_month, collect_usage, persist_monthly_usage
 
 
 def test_collect_and_aggregate(tmp_path: Path) -> None:
@@ -41,3 +41,20 @@ def test_collect_and_aggregate(tmp_path: Path) -> None:
     agg = aggregate_month(usage_events)
     assert agg[("org", "ws")]["monthly"]["tokens_in"] == 40
     assert agg[("org", "ws")]["monthly"]["tool_calls"] == 3
+
+
+def test_persist_monthly_usage_summarizes_from_rollups(tmp_path: Path) -> None:
+    log = tmp_path / "telemetry.jsonl"
+    rows = [
+        {"ts": "2025-01-01T00:00:00", "org_id": "org", "workspace_id": "ws", "tokens_in": 10},
+        {"ts": "2025-01-03T00:00:00", "org_id": "org", "workspace_id": "ws", "tokens_in": 5},
+        {"ts": "2025-02-01T00:00:00", "org_id": "org", "workspace_id": "ws", "tokens_in": 7},
+        {"ts": "2025-01-01T00:00:00", "org_id": "other", "workspace_id": "ws", "tokens_in": 9},
+    ]
+    log.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    agg = persist_monthly_usage(("org", "ws"), "2025-01", [log], base_dir=tmp_path)
+    assert agg["monthly"]["tokens_in"] == 15
+    assert sorted(agg["daily"]) == ["2025-01-01", "2025-01-03"]
+    billing = tmp_path / "tenants" / "org" / "ws" / "billing"
+    assert json.loads((billing / "summary_2025-01.json").read_text()) == agg
+    assert len((billing / "usage_2025-01.jsonl").read_text().splitlines()) == 2
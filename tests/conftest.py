@@ -1,3 +1,10 @@
+import os
+import tempfile
+
+# Run logs (provenance, the unredacted log) are opened at import time; keep them
+# out of the working tree.
+os.environ.setdefault("PROVENANCE_LOG_DIR", tempfile.mkdtemp(prefix="drrd-runs-"))
+
 import pytest
 from core.llm_client import set_budget_manager
 
@@ -6,3 +13,14 @@ from core.llm_client import set_budget_manager
 def _reset_budget():
     yield
     set_budget_manager(None)
+
+
+@pytest.fixture(autouse=True)
+def _provenance_dir(tmp_path, monkeypatch):
+    from core import provenance
+
+    base = tmp_path / "runs" / provenance.RUN_ID
+    monkeypatch.setattr(provenance, "_BASE", base)
+    monkeypatch.setattr(provenance, "_FILE", base / "provenance.jsonl")
+    monkeypatch.setattr(provenance, "_REDACTIONS_FILE", base / "provenance_redactions.jsonl")
+    monkeypatch.setattr(provenance, "_RUN_META_FILE", base / "run_meta.json")
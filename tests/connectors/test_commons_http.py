@@ -0,0 +1,53 @@
+import httpx
+import pytest
+
+from dr_rd.cache.file_cache import FileCache
+from dr_rd.connectors import commons
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.url.path == "/fresh":
+            return httpx.Response(
+                200, json={"n": len(seen)}, headers={"ETag": '"f"', "Cache-Control": "max-age=60"}
+            )
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"n": len(seen)}, headers={"ETag": '"v1"'})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(commons, "_CLIENTS", {"https://api.example.gov": client})
+    monkeypatch.setattr(commons, "_HTTP_CACHE", FileCache(tmp_path / "http"))
+    return seen
+
+
+def test_clients_are_shared_per_host(monkeypatch):
+    monkeypatch.setattr(commons, "_CLIENTS", {})
+    try:
+        a = commons.get_client("https://api.regulations.gov/v4/documents")
+        b = commons.get_client("https://api.regulations.gov/v4/documents/X")
+        c = commons.get_client("https://api.fda.gov/device/510k.json")
+        assert a is b and a is not c
+    finally:
+        commons.close_clients()
+    assert a.is_closed and c.is_closed
+
+
+def test_etag_revalidation_reuses_cached_body(server):
+    url = "https://api.example.gov/items"
+    first = commons.http_get(url, params={"q": "x"})
+    second = commons.http_get(url, params={"q": "x"})
+    assert first.json() == second.json() == {"n": 1}
+    assert server[1].headers["if-none-match"] == '"v1"'
+    assert "if-none-match" not in server[0].headers
+
+
+def test_fresh_responses_skip_the_network(server):
+    url = "https://api.example.gov/fresh"
+    assert commons.http_get(url).json() == {"n": 1}
+    assert commons.http_get(url).json() == {"n": 1}
+    assert len(server) == 1
@@ -0,0 +1,68 @@
+import multiprocessing
+import time
+
+import httpx
+import pytest
+
+from dr_rd.cache.file_cache import FileCache
+from dr_rd.connectors import commons
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(commons, "RATE_LIMIT_DIR", tmp_path / "rl")
+    monkeypatch.setattr(commons, "_BUCKETS", {})
+
+
+def test_guard_waits_for_a_slot_instead_of_failing():
+    for _ in range(2):
+        assert commons.ratelimit_guard("conn", 2, period_s=1) == 0.0
+    start = time.monotonic()
+    waited = commons.ratelimit_guard("conn", 2, period_s=1)
+    assert waited > 0.3
+    assert time.monotonic() - start >= waited * 0.9
+
+
+def test_guard_raises_past_the_deadline_and_refunds():
+    commons.ratelimit_guard("slow", 1, period_s=60)
+    with pytest.raises(commons.RateLimitExceeded):
+        commons.ratelimit_guard("slow", 1, period_s=60, max_wait_s=0.1)
+    assert commons._BUCKETS["slow"].available == pytest.approx(0, abs=0.05)
+
+
+def _take(path, n, q):
+    commons.RATE_LIMIT_DIR = path
+    q.put([commons.ratelimit_guard("shared", 4, period_s=60, max_wait_s=0) for _ in range(n)])
+
+
+def test_quota_is_shared_across_processes(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    q = ctx.Queue()
+    procs = [ctx.Process(target=_take, args=(tmp_path / "rl", 2, q)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert sorted(q.get() + q.get()) == [0.0] * 4
+    with pytest.raises(commons.RateLimitExceeded):
+        commons.ratelimit_guard("shared", 4, period_s=60, max_wait_s=0)
+
+
+def test_retry_after_pauses_the_connector(tmp_path, monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, json={"ok": True})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(commons, "_CLIENTS", {"https://api.example.gov": client})
+    monkeypatch.setattr(commons, "_HTTP_CACHE", FileCache(tmp_path / "http"))
+    commons.ratelimit_guard("paused", 100, period_s=60)
+    paused = []
+    monkeypatch.setattr(commons._BUCKETS["paused"], "pause", paused.append)
+    assert commons.http_json("https://api.example.gov/x", rate_key="paused") == {"ok": True}
+    assert calls[1] - calls[0] >= 0.2
+    assert paused == [0.2]
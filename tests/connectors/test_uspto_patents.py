@@ -12,7 +12,7 @@ def test_search_caching(tmp_path, monkeypatch):
     )
     calls = {"n": 0}
 
-    def fake_http_json(url, params=None, headers=None, retries=3, timeout=10):
+    def fake_http_json(url, params=None, headers=None, retries=3, timeout=10, rate_key=None):
         calls["n"] += 1
         return fixture
 
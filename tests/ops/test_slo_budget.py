@@ -14,3 +14,25 @@ def test_slo_budget_computation():
     summary = slo.compute_slo(events, targets)
     assert summary["sli_values"]["availability"] == 90.0
     assert "availability" in summary["budget_remaining"]
+
+
+def test_latency_sketch_snapshots_merge_across_processes():
+    from dr_rd.ops import alerts
+    from dr_rd.telemetry.sketch import QuantileSketch
+
+    events = []
+    for proc in range(3):
+        sk = QuantileSketch()
+        for v in range(proc * 1000 + 1, proc * 1000 + 1001):
+            sk.add(v)
+        labels = {"phase": "exec"}
+        events.append({"type": "sketch", "name": "phase_latency_ms", "labels": labels,
+                       "value": sk.sum, "sketch": sk.to_dict()})
+    summary = slo.compute_slo(events, {})
+    p95 = summary["sli_values"]["latency_p95_ms"]["exec"]
+    assert abs(p95 - 2850) / 2850 <= 0.01
+    quantiles = summary["sli_values"]["latency_quantiles_ms"]["phase"]["exec"]
+    assert abs(quantiles["p50"] - 1500) / 1500 <= 0.01
+
+    report = alerts.evaluate(summary, {"latency_p95_ms": {"exec": 2000}})
+    assert report["breaches"][0]["sli"] == "latency_p95_ms.exec"
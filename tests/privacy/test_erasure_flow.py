@@ -24,5 +24,5 @@ def test_erasure_flow(monkeypatch):
     assert any(p.name.startswith("execute") for p in receipts.iterdir())
     audit_path = Path.home() / ".dr_rd" / "tenants" / "org" / "ws" / "audit" / "audit.jsonl"
     assert "REDACTION" in audit_path.read_text()
-    prov_path = Path("runs") / provenance.RUN_ID / "provenance_redactions.jsonl"
+    prov_path = provenance._REDACTIONS_FILE
     assert prov_path.exists() and "REDACTION" in prov_path.read_text()
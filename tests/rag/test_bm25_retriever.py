@@ -0,0 +1,60 @@
+import time
+
+from dr_rd.rag import retrievers, types
+
+
+def _doc(i, text, **meta):
+    return types.Doc(
+        id=str(i), url=f"u{i}", title=f"t{i}", domain="d", published_at=None, text=text, meta=meta
+    )
+
+
+def _spec(query, top_k=5):
+    return types.QuerySpec(role="r", task="t", query=query, top_k=top_k)
+
+
+def test_bm25_ranks_by_idf_and_length():
+    docs = [
+        _doc(0, "solar panel efficiency solar"),
+        _doc(1, "battery chemistry and panel mounting " + "filler " * 40),
+        _doc(2, "panel"),
+        _doc(3, "unrelated text"),
+    ]
+    ret = retrievers.BM25LiteRetriever(docs)
+    hits = ret.search(_spec("Solar panel"))
+    assert [d.id for d in hits] == ["0", "2", "1", "3"]
+    assert hits[0].meta["score"] > hits[1].meta["score"] > hits[2].meta["score"] > 0
+    # Non-matching documents pad the tail with a zero score; inputs are not mutated.
+    assert hits[3].meta["score"] == 0.0
+    assert all("score" not in d.meta for d in docs)
+
+
+def test_bm25_top_k_and_incremental_add():
+    ret = retrievers.BM25LiteRetriever([_doc(0, "alpha beta"), _doc(1, "alpha")])
+    assert [d.id for d in ret.search(_spec("alpha", top_k=1))] == ["1"]
+    ret.add([_doc(2, "gamma delta", src="kb")])
+    hits = ret.search(_spec("gamma", top_k=2))
+    assert [d.id for d in hits] == ["2", "0"]
+    assert hits[0].meta["src"] == "kb"
+
+
+
+def test_bm25_no_overlap_returns_top_k_in_corpus_order():
+    ret = retrievers.BM25LiteRetriever([_doc(i, f"doc {i}") for i in range(4)])
+    hits = ret.search(_spec("zebra", top_k=3))
+    assert [d.id for d in hits] == ["0", "1", "2"]
+    assert [d.meta["score"] for d in hits] == [0.0, 0.0, 0.0]
+    assert ret.search(_spec("zebra", top_k=0)) == []
+
+def test_bm25_search_is_fast_on_large_corpus():
+    vocab = [f"w{i}" for i in range(5000)]
+    docs = [
+        _doc(i, " ".join(vocab[(i * 7 + j * 13) % len(vocab)] for j in range(30)))
+        for i in range(20000)
+    ]
+    ret = retrievers.BM25LiteRetriever(docs)
+    start = time.perf_counter()
+    for _ in range(20):
+        hits = ret.search(_spec("w17 w4242 w99", top_k=10))
+    assert len(hits) == 10
+    assert (time.perf_counter() - start) / 20 < 0.05
@@ -0,0 +1,120 @@
+from dr_rd.rag import retrievers, types
+
+VECS = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0], "mix": [0.6, 0.8]}
+
+
+def _doc(i, text):
+    return types.Doc(id=str(i), url=f"u{i}", title="", domain="d", published_at=None, text=text)
+
+
+def _spec(query, top_k=5):
+    return types.QuerySpec(role="r", task="t", query=query, top_k=top_k)
+
+
+def test_dense_embeds_documents_once_in_batches():
+    batches = []
+
+    def batch(texts):
+        batches.append(list(texts))
+        return [VECS[t] for t in texts]
+
+    docs = [_doc(0, "alpha"), _doc(1, "beta"), _doc(2, "mix"), _doc(3, "alpha")]
+    ret = retrievers.DenseRetriever(docs, batch_embed_fn=batch, batch_size=2)
+    hits = ret.search(_spec("alpha", top_k=3))
+    assert [d.id for d in hits] == ["0", "3", "2"]
+    assert abs(hits[2].meta["score"] - 0.6) < 1e-6
+    # Query, then the three distinct texts in batches of two.
+    assert batches == [["alpha"], ["alpha", "beta"], ["mix"]]
+
+    ret.search(_spec("beta"))
+    assert batches[-1] == ["beta"]
+    assert len(batches) == 4
+
+    ret.add([_doc(4, "beta"), _doc(5, "mix")])
+    hits = ret.search(_spec("beta", top_k=2))
+    assert [d.id for d in hits] == ["1", "4"]
+    assert len(batches) == 5  # only the query; both texts were already indexed
+
+
+def test_dense_accepts_legacy_dict_embed_fn():
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return {str(i): v for i, v in enumerate(VECS[text])}
+
+    ret = retrievers.DenseRetriever([_doc(0, "beta"), _doc(1, "mix")], embed_fn=embed)
+    assert [d.id for d in ret.search(_spec("beta"))] == ["0", "1"]
+    ret.search(_spec("alpha"))
+    assert calls == ["beta", "beta", "mix", "alpha"]
+
+
+def test_dense_retries_documents_whose_embedding_failed():
+    down = {"alpha", "beta", "mix"}
+    batches = []
+
+    def batch(texts):
+        batches.append(list(texts))
+        if len(texts) > 1 and down:  # the document batch fails while the API is down
+            return None
+        return [None if t in down else VECS[t] for t in texts]
+
+    docs = [_doc(0, "alpha"), _doc(1, "beta"), _doc(2, "mix")]
+    ret = retrievers.DenseRetriever(docs, batch_embed_fn=batch)
+    down.discard("alpha")  # the query embeds, the documents do not
+    assert ret.search(_spec("alpha")) == []
+
+    down.clear()
+    hits = ret.search(_spec("alpha", top_k=3))
+    assert [d.id for d in hits] == ["0", "2", "1"]
+    assert abs(hits[0].meta["score"] - 1.0) < 1e-6
+    assert batches[-1] == ["alpha", "beta", "mix"]
+
+
+def test_dense_scores_unembedded_docs_zero_until_they_embed():
+    missing = {"beta"}
+
+    def batch(texts):
+        return [None if t in missing else VECS[t] for t in texts]
+
+    ret = retrievers.DenseRetriever([_doc(0, "mix"), _doc(1, "beta")], batch_embed_fn=batch)
+    hits = ret.search(_spec("alpha"))
+    assert [(d.id, round(d.meta["score"], 3)) for d in hits] == [("0", 0.6), ("1", 0.0)]
+    missing.clear()
+    hits = ret.search(_spec("beta"))
+    assert [(d.id, round(d.meta["score"], 3)) for d in hits] == [("1", 1.0), ("0", 0.8)]
+
+def test_dense_without_embedder_returns_nothing():
+    assert retrievers.DenseRetriever([_doc(0, "alpha")]).search(_spec("alpha")) == []
+
+
+def test_embed_batch_sends_one_request_per_batch(monkeypatch, tmp_path):
+    import types as pytypes
+
+    from dr_rd.cache.file_cache import FileCache
+    from dr_rd.rag import embeddings
+
+    requests = []
+
+    class FakeOpenAI:
+        def __init__(self):
+            self.embeddings = pytypes.SimpleNamespace(create=self._create)
+
+        def _create(self, model, input):
+            requests.append(list(input))
+            data = [
+                pytypes.SimpleNamespace(index=i, embedding=VECS[t]) for i, t in enumerate(input)
+            ]
+            return pytypes.SimpleNamespace(data=data)
+
+    monkeypatch.setattr(embeddings, "OpenAI", FakeOpenAI)
+    monkeypatch.setattr(embeddings, "get_env", lambda name: "sk-test")
+    monkeypatch.setattr(embeddings, "cache", FileCache(tmp_path))
+    assert embeddings.embed_batch(["alpha", "beta", "alpha"]) == [
+        VECS["alpha"],
+        VECS["beta"],
+        VECS["alpha"],
+    ]
+    assert requests == [["alpha", "beta"]]
+    assert embeddings.embed("beta") == {"0": 0.0, "1": 1.0}
+    assert len(requests) == 1
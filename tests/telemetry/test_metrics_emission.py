@@ -11,6 +11,7 @@ def test_metrics_emission(tmp_path, monkeypatch):
     m = importlib.reload(importlib.import_module("dr_rd.telemetry.metrics"))
     m.inc("runs_started", agent="tester")
     m.observe("run_duration_ms", 123, agent="tester")
+    assert m.flush()
     files = list(log_dir.glob("*.jsonl"))
     assert files, "metric file not written"
     lines = [json.loads(line) for line in files[0].read_text().splitlines()]
@@ -25,4 +26,21 @@ def test_sampling_respected(tmp_path, monkeypatch):
     monkeypatch.setenv("TELEMETRY_SAMPLING_RATE", "0.0")
     m = importlib.reload(importlib.import_module("dr_rd.telemetry.metrics"))
     m.inc("runs_started")
+    m.flush()
     assert not list(log_dir.glob("*.jsonl"))
+
+
+def test_observe_exports_one_sketch_per_series(tmp_path, monkeypatch):
+    log_dir = tmp_path / "logs"
+    monkeypatch.setenv("TELEMETRY_LOG_DIR", str(log_dir))
+    monkeypatch.setenv("TELEMETRY_ENABLED", "true")
+    m = importlib.reload(importlib.import_module("dr_rd.telemetry.metrics"))
+    for v in range(1, 1001):
+        m.observe("model_call_latency_ms", v, model="a")
+    m.observe("model_call_latency_ms", 5, model="b")
+    assert m.flush()
+    lines = [json.loads(line) for f in log_dir.glob("*.jsonl") for line in f.read_text().splitlines()]
+    assert len(lines) == 2
+    by_model = {e["labels"]["model"]: e for e in lines}
+    assert by_model["a"]["type"] == "sketch"
+    assert by_model["a"]["sketch"]["count"] == 1000
@@ -0,0 +1,28 @@
+import random
+
+from dr_rd.telemetry.sketch import QuantileSketch, merge
+
+
+def test_quantiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1.5) for _ in range(20000)]
+    sk = QuantileSketch(alpha=0.01)
+    for v in values:
+        sk.add(v)
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sk.quantile(q) - exact) / exact <= 0.011
+    assert len(sk.buckets) < 2048
+
+
+def test_merge_equals_single_sketch_and_round_trips():
+    a, b, whole = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for v in range(1, 501):
+        (a if v % 2 else b).add(v)
+        whole.add(v)
+    merged = merge([a.to_dict(), b.to_dict()])
+    assert merged.count == whole.count == 500
+    assert merged.buckets == whole.buckets
+    assert merged.quantile(0.95) == whole.quantile(0.95)
+    assert QuantileSketch().quantile(0.5) is None
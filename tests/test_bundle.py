@@ -26,3 +26,21 @@ def test_build_zip_bundle():
     assert names == ["extra.txt", "report.md", "summary.csv", "trace.json"]
     assert contents["trace.json"] == b"trace.json"
     assert contents["extra.txt"] == b"extra.txt"
+
+
+def test_bundle_includes_uncompacted_trace(tmp_path, monkeypatch):
+    import json
+
+    from utils import paths, trace_writer
+
+    monkeypatch.setattr(paths, "RUNS_ROOT", tmp_path / "runs")
+    trace_writer.append_step("crashed", {"phase": "planner"})
+    data = build_zip_bundle(
+        "crashed",
+        [],
+        read_bytes=_fake_read,
+        list_existing=lambda rid: [("trace", "jsonl")],
+    )
+    with ZipFile(BytesIO(data)) as zf:
+        assert "trace.jsonl" not in zf.namelist()
+        assert json.loads(zf.read("trace.json")) == [{"phase": "planner"}]
@@ -16,8 +16,10 @@ def test_telemetry_respects_consent(tmp_path, monkeypatch):
     telemetry.LOG_DIR.mkdir(parents=True, exist_ok=True)
     # No consent yet -> no file written
     telemetry.log_event({"event": "x"})
+    telemetry.flush()
     assert not list(telemetry.LOG_DIR.glob("events-*"))
     consent.set(telemetry=True, surveys=True)
     telemetry.log_event({"event": "y"})
+    telemetry.flush()
     assert list(telemetry.LOG_DIR.glob("events-*"))
 
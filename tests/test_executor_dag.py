@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from core.engine.executor import run_dag, topological_waves
+
+
+def _task(tid, role="r", deps=None, created_at=0, priority=0):
+    return {
+        "id": tid,
+        "role": role,
+        "task": tid,
+        "created_at": created_at,
+        "priority": priority,
+        "depends_on": deps or [],
+    }
+
+
+def test_topological_waves_and_cycles():
+    tasks = [
+        _task("C", deps=["A", "B"], created_at=3),
+        _task("A", created_at=1),
+        _task("B", created_at=2),
+        _task("X", deps=["Y"]),
+        _task("Y", deps=["X"]),
+        _task("D", deps=["missing"], created_at=4),
+    ]
+    waves, blocked = topological_waves(tasks)
+    assert [[t["id"] for t in w] for w in waves] == [["A", "B", "D"], ["C"]]
+    assert [t["id"] for t in blocked] == ["X", "Y"]
+
+
+def test_run_dag_respects_dependencies_and_refills_pool():
+    started: dict[str, float] = {}
+    finished: dict[str, float] = {}
+    delays = {"A": 0.05, "B": 0.3, "C": 0.05}
+
+    def execute(task):
+        started[task["id"]] = time.perf_counter()
+        time.sleep(delays[task["id"]])
+        finished[task["id"]] = time.perf_counter()
+        return f"{task['id']}_done", 1.0
+
+    tasks = [
+        _task("A", role="a", created_at=1),
+        _task("B", role="b", created_at=2),
+        _task("C", role="c", deps=["A"], created_at=3),
+    ]
+    out = run_dag(tasks, execute, max_workers=2)
+
+    assert started["C"] >= finished["A"]
+    # C starts as soon as A resolves, without waiting for the slow B.
+    assert started["C"] < finished["B"]
+    assert [t["id"] for t, _, _ in out["executed"]] == ["A", "B", "C"]
+    assert out["pending"] == []
+    assert out["waves"] == 2
+
+
+def test_run_dag_role_limits():
+    lock = threading.Lock()
+    active = {"n": 0, "peak": 0}
+
+    def execute(task):
+        with lock:
+            active["n"] += 1
+            active["peak"] = max(active["peak"], active["n"])
+        time.sleep(0.02)
+        with lock:
+            active["n"] -= 1
+        return None, 0.0
+
+    tasks = [_task(f"T{i}", role="same", created_at=i) for i in range(4)]
+    run_dag(tasks, execute, max_workers=4, default_role_limit=1)
+    assert active["peak"] == 1
+
+    active["peak"] = 0
+    run_dag(tasks, execute, max_workers=4, role_limits={"same": 2})
+    assert active["peak"] == 2
+
+
+def test_run_dag_merges_in_deterministic_order():
+    merged = []
+
+    def execute(task):
+        time.sleep(0.05 if task["id"] == "A" else 0.0)
+        return task["id"], 0.5
+
+    tasks = [
+        _task("B", created_at=2),
+        _task("A", created_at=1),
+        _task("P", created_at=9, priority=5),
+    ]
+    run_dag(tasks, execute, max_workers=3, on_result=lambda t, r, s: merged.append(r))
+    assert merged == ["P", "A", "B"]
+
+
+def test_run_dag_propagates_errors_and_skips_dependants():
+    ran = []
+
+    def execute(task):
+        ran.append(task["id"])
+        if task["id"] == "A":
+            raise RuntimeError("boom")
+        return None, 0.0
+
+    tasks = [_task("A"), _task("B", deps=["A"])]
+    with pytest.raises(RuntimeError):
+        run_dag(tasks, execute, max_workers=2)
+    assert ran == ["A"]
+
+
+def test_run_dag_empty():
+    assert run_dag([], lambda t: (None, 0.0)) == {"executed": [], "pending": [], "waves": 0}
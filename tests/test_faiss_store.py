@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from knowledge.faiss_store import (
+    EMBEDDING_META,
+    FAISSLoadError,
+    build_default_retriever,
+    hash_embed,
+)
+
+DOCS = [
+    {"text": "solar panel inverter efficiency", "source": "a.md"},
+    {"text": "lithium battery thermal runaway", "source": "b.md"},
+    {"text": "patent prior art search strategy", "source": "c.md"},
+    {"text": "fda device classification pathway", "source": "d.md"},
+]
+
+
+def _bundle(path, index, meta=None):
+    path.mkdir()
+    faiss.write_index(index, str(path / "index.faiss"))
+    (path / "docs.json").write_text(json.dumps(DOCS), encoding="utf-8")
+    if meta is not None:
+        (path / EMBEDDING_META).write_text(json.dumps(meta), encoding="utf-8")
+
+
+def test_flat_query_returns_nearest_snippets(tmp_path):
+    xb = hash_embed([d["text"] for d in DOCS])
+    index = faiss.IndexFlatIP(xb.shape[1])
+    index.add(xb)
+    _bundle(tmp_path / "idx", index, {"provider": "hash"})
+
+    retriever, doc_count, dims = build_default_retriever(str(tmp_path / "idx"))
+    assert (doc_count, dims) == (4, 128)
+    hits = retriever.query("battery thermal issues", 2)
+    assert hits[0].source == "b.md"
+    assert hits[0].text == DOCS[1]["text"]
+    assert len(hits) == 2
+    assert retriever.query("", 3) == []
+
+
+def test_ivf_and_hnsw_with_mmap(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAISS_MMAP", "true")
+    xb = hash_embed([d["text"] for d in DOCS])
+    quantizer = faiss.IndexFlatIP(xb.shape[1])
+    ivf = faiss.IndexIVFFlat(quantizer, xb.shape[1], 2, faiss.METRIC_INNER_PRODUCT)
+    ivf.train(xb)
+    ivf.add(xb)
+    _bundle(tmp_path / "ivf", ivf, {"provider": "hash", "index_type": "ivf", "nprobe": 2})
+    retriever, _, _ = build_default_retriever(str(tmp_path / "ivf"))
+    assert faiss.extract_index_ivf(retriever.index).nprobe == 2
+    assert retriever.query("prior art patent", 1)[0].source == "c.md"
+
+    hnsw = faiss.IndexHNSWFlat(xb.shape[1], 8, faiss.METRIC_INNER_PRODUCT)
+    hnsw.add(xb)
+    _bundle(tmp_path / "hnsw", hnsw, {"provider": "hash", "ef_search": 32})
+    retriever, _, _ = build_default_retriever(str(tmp_path / "hnsw"))
+    assert retriever.index.hnsw.efSearch == 32
+    assert retriever.query("fda classification", 1)[0].source == "d.md"
+
+
+def test_dimension_mismatch_returns_empty(tmp_path):
+    index = faiss.IndexFlatL2(16)
+    index.add(hash_embed([d["text"] for d in DOCS], 16))
+    _bundle(tmp_path / "idx", index, {"provider": "openai"})
+    retriever, _, _ = build_default_retriever(str(tmp_path / "idx"))
+    retriever._embed = lambda texts: hash_embed(texts, 8)
+    assert retriever.query("battery", 2) == []
+
+
+def test_legacy_bundle_without_embedding_meta_is_refused(tmp_path):
+    index = faiss.IndexFlatIP(128)
+    index.add(hash_embed([d["text"] for d in DOCS]))
+    _bundle(tmp_path / "idx", index)
+    with pytest.raises(FAISSLoadError, match="rebuild index"):
+        build_default_retriever(str(tmp_path / "idx"))
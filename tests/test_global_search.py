@@ -63,3 +63,57 @@ def test_resolve_action():
         == "k1"
     )
     assert gs.resolve_action({"kind": "cmd", "id": "start_demo", "payload": {}})["action"] == "start_demo"
+
+
+def _corpus_inputs():
+    runs = [{"run_id": f"r{i}", "idea_preview": f"idea {i} kiln", "started_at": i} for i in range(30)]
+    notes = {"r3": {"title": "graphene anode", "note": "", "tags": ["chem"], "favorite": False}}
+    knowledge = [{"id": "k1", "name": "anode datasheet", "tags": ["ref"], "type": "PDF"}]
+    return runs, notes, knowledge
+
+
+def test_palette_index_matches_fuzzy_rank():
+    runs, notes, knowledge = _corpus_inputs()
+    idx = gs.PaletteIndex()
+    idx.sync(runs=runs, notes=notes, knowledge=knowledge, actions=[])
+    corpus = gs.build_corpus(runs=runs, notes=notes, knowledge=knowledge)
+    for q in ["", "anode", "r1", "kiln", "graphene anode"]:
+        got = [(r["id"], r["score"]) for r in idx.rank(q, limit=5)]
+        want = [(r["id"], r["score"]) for r in gs.fuzzy_rank(q, corpus, limit=5)]
+        # entries sharing no trigram with the query are pruned, so only exact hits must agree
+        exact = [w for w in want if w[1] == 1.0]
+        assert got[: len(exact)] == exact, q
+    assert idx.rank("anodd", limit=3)[0]["id"] in {"k1", "r3:results", "r3:reports"}
+
+
+def test_palette_index_syncs_incrementally(monkeypatch):
+    runs, notes, knowledge = _corpus_inputs()
+    idx = gs.PaletteIndex()
+    idx.sync(runs=runs, notes=notes, knowledge=knowledge, actions=[])
+
+    built = []
+    orig = gs.build_corpus
+    monkeypatch.setattr(gs, "build_corpus", lambda **kw: built.append(kw) or orig(**kw))
+    idx.sync(runs=runs, notes=notes, knowledge=knowledge, actions=[])
+    assert built == []
+
+    runs = [dict(r) for r in runs]
+    runs[5]["idea_preview"] = "solar furnace"
+    del runs[7]
+    idx.sync(runs=runs, notes=dict(notes), knowledge=list(knowledge), actions=[])
+    assert [kw["runs"][0]["run_id"] for kw in built] == ["r5"]
+    assert idx.rank("furnace", limit=1)[0]["id"] == "r5:results"
+    assert not any(r["id"].startswith("r7:") for r in idx.rank("idea 7", limit=5))
+
+
+def test_palette_index_short_query_falls_back_to_fuzzy_scores():
+    runs, notes, knowledge = _corpus_inputs()
+    idx = gs.PaletteIndex()
+    idx.sync(runs=runs, notes=notes, knowledge=knowledge, actions=[])
+    corpus = gs.build_corpus(runs=runs, notes=notes, knowledge=knowledge)
+    # "zq" is a substring of nothing, but fuzzy_rank still ranks every entry.
+    got = idx.rank("zq", limit=5)
+    want = gs.fuzzy_rank("zq", corpus, limit=5)
+    assert len(got) == 5
+    assert [r["score"] for r in got] == [r["score"] for r in want]
+    assert idx.rank("r3", limit=40)[0]["id"].startswith("r3")
@@ -0,0 +1,39 @@
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location(
+        "profile_imports", ROOT / "scripts" / "profile_imports.py"
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_registry_import_does_not_load_agents():
+    code = (
+        "import sys, core.agents.unified_registry as r;"
+        "assert len(r.AGENT_REGISTRY) == 18;"
+        "print(sorted(m for m in sys.modules if m.startswith('core.agents.')))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert "_agent'" not in out and "core.agents.base_agent" not in out
+
+
+def test_entry_points_stay_within_forbidden_import_budget():
+    script = _load_script()
+    for module in ("worker_service", "core.agents.unified_registry"):
+        assert script.check_entry(module, enforce_time=False) == []
+
+
+def test_forbidden_import_is_reported(monkeypatch):
+    script = _load_script()
+    monkeypatch.setitem(script.ENTRY_BUDGETS, "json", {"ms": 10_000, "forbid": ("json.decoder",)})
+    assert script.check_entry("json") == ["json imports json.decoder"]
@@ -33,3 +33,51 @@ def test_add_get_query_compact(monkeypatch, tmp_path):
     store.compact()
     records = store.query({}, limit=0)
     assert len(records) == 1
+
+
+def _rec(rid, role="A", run="r1", title="t"):
+    return KBRecord(
+        id=rid,
+        run_id=run,
+        agent_role=role,
+        task_title=title,
+        task_desc="d",
+        inputs={},
+        output_json={"v": title},
+        ts=1.0,
+    )
+
+
+def test_index_catches_up_with_external_appends(monkeypatch, tmp_path):
+    setup_tmp(monkeypatch, tmp_path)
+    import json
+
+    store.add(_rec("1"))
+    with open(store.STORE_PATH, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(_rec("2", role="B").asdict()) + "\n")
+        fh.write('{"id": "partial"')
+    assert [r.id for r in store.query({"agent_role": "B"})] == ["2"]
+    assert store.get("partial") is None
+    with open(store.STORE_PATH, "a", encoding="utf-8") as fh:
+        fh.write(', "broken": true}\n')
+    assert [r.id for r in store.query({}, limit=0)] == ["1", "2"]
+    assert [r.id for r in store.query({"agent_role": "A", "task_title": "t"})] == ["1"]
+    assert store.query({"agent_role": "A", "task_title": "other"}) == []
+
+
+def test_compact_keeps_newest_and_rewrites_jsonl(monkeypatch, tmp_path):
+    setup_tmp(monkeypatch, tmp_path)
+    store.add(_rec("1", title="old"))
+    store.add(_rec("2"))
+    store.add(_rec("1", title="new"))
+    assert len(store.query({"id": "1"}, limit=0)) == 2
+    store.compact()
+    assert [r.id for r in store.query({}, limit=0)] == ["2", "1"]
+    assert store.get("1").task_title == "new"
+    lines = store.STORE_PATH.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    store.add(_rec("3"))
+    assert store.get("3") is not None
+    # A store rewritten behind the index's back is re-indexed from scratch.
+    store.STORE_PATH.write_text(lines[0] + "\n", encoding="utf-8")
+    assert [r.id for r in store.query({}, limit=0)] == ["2"]
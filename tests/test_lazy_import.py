@@ -25,3 +25,21 @@ def test_local_import():
 
     mod = local_import("json")
     assert mod is builtin_json
+
+
+def test_lazy_mapping_imports_on_first_lookup(monkeypatch):
+    from utils.lazy_import import LazyMapping
+
+    reg = LazyMapping({"dumps": "json:dumps", "missing": "no_such_module_xyz:thing"})
+    assert list(reg) == ["dumps", "missing"] and "missing" in reg
+    assert reg.loaded() == {}
+
+    import json
+
+    assert reg["dumps"] is json.dumps
+    assert reg.loaded() == {"dumps": json.dumps}
+
+    monkeypatch.setitem(reg, "extra", len)
+    assert reg["extra"] is len and len(reg) == 3
+    del reg["missing"]
+    assert "missing" not in reg and reg.loaded() == {"dumps": json.dumps, "extra": len}
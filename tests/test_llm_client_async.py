@@ -0,0 +1,87 @@
+import asyncio
+import types
+
+import httpx
+from openai import APIStatusError
+
+import core.llm_client as lc
+from core.llm import rate_limit
+
+
+class DummyResp:
+    def __init__(self, text="ok"):
+        self.output_text = text
+        self.usage = types.SimpleNamespace(prompt_tokens=3, completion_tokens=2, total_tokens=5)
+
+
+def _status_error(code):
+    req = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    return APIStatusError("err", response=httpx.Response(code, request=req), body=None)
+
+
+class FakeAsyncClient:
+    def __init__(self, fail_times=0):
+        self.calls = 0
+        self.fail_times = fail_times
+        self.responses = types.SimpleNamespace(create=self._create)
+
+    async def _create(self, **payload):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise _status_error(429)
+        return DummyResp(payload["input"][0]["content"][0]["text"])
+
+
+def _setup(monkeypatch, client):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.delenv("DRRD_DRY_RUN", raising=False)
+    monkeypatch.setattr(lc, "_async_client", lambda: client)
+    monkeypatch.setattr(lc, "load_config", lambda: {})
+    monkeypatch.setattr(lc, "_supports_response_format", lambda: False)
+    # Provider shaping is covered in test_llm_rate_limit; keep sleeps to backoff.
+    monkeypatch.setattr(rate_limit, "get_limiter", lambda provider, model: None)
+
+
+def test_acall_openai_retries_with_async_backoff(monkeypatch):
+    client = FakeAsyncClient(fail_times=2)
+    _setup(monkeypatch, client)
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(lc.asyncio, "sleep", fake_sleep)
+    result = asyncio.run(
+        lc.acall_openai(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+    )
+    assert result["text"] == "hi"
+    assert client.calls == 3
+    assert len(slept) == 2
+
+
+def test_allm_call_fans_out_and_accounts_usage(monkeypatch):
+    client = FakeAsyncClient()
+    _setup(monkeypatch, client)
+    consumed = []
+
+    class Budget:
+        def consume(self, pt, ct, model, stage=None, cached_tokens=0):
+            consumed.append((pt, ct, model, stage))
+            return 0.01
+
+    monkeypatch.setattr(lc, "BUDGET", Budget())
+    meter = lc.TokenMeter()
+    monkeypatch.setattr(lc, "METER", meter)
+
+    async def fan_out():
+        return await asyncio.gather(
+            *[
+                lc.allm_call("gpt-4o-mini", "exec", [{"role": "user", "content": f"q{i}"}])
+                for i in range(20)
+            ]
+        )
+
+    resps = asyncio.run(fan_out())
+    assert client.calls == 20
+    assert len(consumed) == 20
+    assert all(r.tokens_in == 3 and r.cost_usd == 0.01 for r in resps)
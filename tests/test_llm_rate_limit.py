@@ -0,0 +1,106 @@
+import threading
+import time
+import types
+
+import httpx
+import pytest
+from openai import APIStatusError
+
+import core.llm_client as lc
+from core.llm import rate_limit as rl
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    rl.reset()
+    yield
+    rl.reset()
+
+
+def _status_error(code, retry_after=None):
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    req = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    resp = httpx.Response(code, request=req, headers=headers)
+    return APIStatusError("err", response=resp, body=None)
+
+
+def test_bucket_reservations_queue_behind_debt():
+    bucket = rl.TokenBucket(60, capacity=2)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(1) == pytest.approx(2.0, abs=0.05)
+
+
+def test_settle_reconciles_tokens_and_429_pauses():
+    lim = rl.Limiter("openai", "m", rpm=600, tpm=6000)
+    res = lim.acquire(1000)
+    res.settle(200)
+    assert lim.tpm.available == pytest.approx(5800, abs=5)
+
+    res = lim.acquire(500)
+    res.settle(exc=_status_error(429, retry_after=3))
+    # The failed call is refunded, but nobody may start for ~3 seconds.
+    assert lim.rpm.reserve(1) == pytest.approx(3.0 + 0.1, abs=0.1)
+
+
+def test_shared_state_between_buckets(tmp_path):
+    path = tmp_path / "openai_m_rpm.json"
+    a = rl.TokenBucket(60, capacity=1, state_path=path)
+    b = rl.TokenBucket(60, capacity=1, state_path=path)
+    assert a.reserve(1) == 0.0
+    assert b.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_concurrency_slots_cap_in_flight_calls():
+    lim = rl.Limiter("openai", "m", slots=threading.BoundedSemaphore(2))
+    lock = threading.Lock()
+    active = {"n": 0, "peak": 0}
+
+    def work():
+        res = lim.acquire(10)
+        with lock:
+            active["n"] += 1
+            active["peak"] = max(active["peak"], active["n"])
+        time.sleep(0.02)
+        with lock:
+            active["n"] -= 1
+        res.settle(10)
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert active["peak"] == 2
+
+
+def test_call_openai_reserves_and_reconciles(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.delenv("DRRD_DRY_RUN", raising=False)
+    monkeypatch.setattr(lc, "load_config", lambda: {})
+    monkeypatch.setattr(lc, "_supports_response_format", lambda: False)
+    monkeypatch.setattr(
+        rl,
+        "_cfg",
+        {
+            "providers": {"openai": {"models": [{"name": "gpt-4o-mini", "tpm": 10000}]}},
+            "rate_limits": {"enabled": True, "max_concurrency": 2, "defaults": {"rpm": 100}},
+        },
+    )
+
+    def create(**payload):
+        usage = types.SimpleNamespace(input_tokens=7, output_tokens=3, total_tokens=10)
+        return types.SimpleNamespace(output_text="ok", usage=usage)
+
+    client = types.SimpleNamespace(responses=types.SimpleNamespace(create=create))
+    monkeypatch.setattr(lc, "_client", lambda: client)
+    lc.call_openai(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": "x" * 400}],
+        max_output_tokens=100,
+    )
+    lim = rl.get_limiter("openai", "gpt-4o-mini")
+    assert lim.rpm.available == pytest.approx(99, abs=0.1)
+    assert lim.tpm.available == pytest.approx(9990, abs=1)
+    assert lim.slots.acquire(blocking=False) and lim.slots.acquire(blocking=False)
@@ -0,0 +1,146 @@
+import threading
+import time
+import types
+
+from openai.types.chat import ChatCompletion
+
+import core.llm_client as lc
+from config import feature_flags as ff
+from core.llm import response_cache as rc
+from utils import idempotency
+
+
+def _chat_completion(text):
+    return ChatCompletion.model_validate(
+        {
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": text},
+                }
+            ],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+        }
+    )
+
+
+def _disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(idempotency, "ROOT", tmp_path)
+
+
+def test_lru_eviction_and_ttl(monkeypatch, tmp_path):
+    _disk(monkeypatch, tmp_path)
+    cache = rc.ResponseCache(max_entries=2, ttl_s=60, disk=False)
+    calls = []
+
+    def call(n):
+        def _run():
+            calls.append(n)
+            return {"raw": {}, "text": str(n)}
+
+        return _run
+
+    for n in ("a", "b", "a", "c", "a", "b"):
+        cache.get_or_call(n, call(n), model="m")
+    # "b" was evicted when "c" arrived; "a" stayed hot.
+    assert calls == ["a", "b", "c", "b"]
+
+    cache.ttl_s = 0
+    time.sleep(0.01)
+    cache.get_or_call("a", call("a"), model="m")
+    assert calls[-1] == "a"
+
+
+def test_disk_layer_survives_new_instance(monkeypatch, tmp_path):
+    _disk(monkeypatch, tmp_path)
+    first = rc.ResponseCache(ttl_s=60)
+    first.get_or_call("k", lambda: {"raw": _chat_completion("hi"), "text": "hi"}, model="m")
+
+    second = rc.ResponseCache(ttl_s=60)
+    value, layer = second.get_or_call("k", lambda: 1 / 0, model="m")
+    assert layer == "disk"
+    assert isinstance(value["raw"], ChatCompletion)
+    assert value["raw"].usage.prompt_tokens == 3
+    assert second.get_or_call("k", lambda: 1 / 0, model="m")[1] == "memory"
+
+
+def test_single_flight_coalesces_concurrent_requests(monkeypatch, tmp_path):
+    _disk(monkeypatch, tmp_path)
+    cache = rc.ResponseCache(ttl_s=60)
+    release = threading.Event()
+    upstream = []
+
+    def call():
+        upstream.append(1)
+        release.wait(2)
+        return {"raw": {}, "text": "done"}
+
+    layers = []
+    threads = [
+        threading.Thread(
+            target=lambda: layers.append(cache.get_or_call("k", call, model="m")[1])
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(upstream) == 1
+    assert layers.count(None) == 1
+    assert cache.stats["miss"] == 1
+    assert cache.stats["inflight"] + cache.stats["memory"] == 7
+
+
+def test_request_key_skips_tools_and_streams():
+    assert rc.request_key("openai", "m", {"payload": {"tools": [{"type": "x"}]}}) is None
+    assert rc.request_key("openai", "m", {"payload": {"stream": True}}) is None
+    assert rc.request_key("openai", "m", {"payload": {"input": "x"}}) is not None
+
+
+def test_call_openai_serves_repeats_from_cache(monkeypatch, tmp_path):
+    _disk(monkeypatch, tmp_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.delenv("DRRD_DRY_RUN", raising=False)
+    monkeypatch.setattr(lc, "load_config", lambda: {})
+    monkeypatch.setattr(lc, "_supports_response_format", lambda: False)
+    monkeypatch.setattr(ff, "LLM_CACHE_ENABLED", True)
+    rc.reset_cache()
+    events = []
+    monkeypatch.setattr(rc, "llm_cache_hit", lambda *a, **k: events.append(("hit", k)))
+    monkeypatch.setattr(rc, "llm_cache_miss", lambda *a, **k: events.append(("miss", k)))
+
+    calls = []
+
+    def create(**payload):
+        calls.append(payload)
+        return _chat_completion("answer")
+
+    client = types.SimpleNamespace(responses=types.SimpleNamespace(create=create))
+    monkeypatch.setattr(lc, "_client", lambda: client)
+    consumed = []
+
+    class Budget:
+        def consume(self, pt, ct, model, stage=None, cached_tokens=0):
+            consumed.append(pt)
+            return 0.01
+
+    monkeypatch.setattr(lc, "BUDGET", Budget())
+    msgs = [{"role": "user", "content": "plan"}]
+    try:
+        first = lc.llm_call(None, "gpt-4o-mini", "plan", msgs)
+        second = lc.llm_call(None, "gpt-4o-mini", "plan", msgs)
+    finally:
+        rc.reset_cache()
+    assert len(calls) == 1
+    assert second is first
+    assert consumed == [3]
+    assert [e[0] for e in events] == ["miss", "hit"]
+    assert events[1][1]["layer"] == "memory"
@@ -5,6 +5,7 @@ from scripts.privacy_export import export_run
 
 
 def test_privacy_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     run_id = "r1"
     run_dir = Path("runs") / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
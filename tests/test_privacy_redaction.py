@@ -35,3 +35,9 @@ def test_project_alias_normalization_and_rehydration(monkeypatch):
     restored = rehydrate_output(output, alias_map)
     assert "A Quantum Entanglement Microscope Device" in restored
     assert alias not in restored
+
+
+def test_rehydrate_prefers_longest_alias_and_does_not_chain():
+    alias_map = {"Ann Lee": "AnnX1", "Bo Chen": "AnnX12", "AnnX1": "Ann"}
+    out = rehydrate_output(["AnnX12 met AnnX1", {"k": "Ann"}], alias_map)
+    assert out == ["Bo Chen met Ann Lee", {"k": "AnnX1"}]
@@ -0,0 +1,71 @@
+import json
+from types import SimpleNamespace
+
+import core.llm_client as lc
+from core.budget import BudgetManager
+from core.token_meter import TokenMeter
+from dr_rd.telemetry import loggers as api_loggers
+from dr_rd.telemetry.api_call_log import APICallLogger, usage_tokens
+
+
+def test_usage_tokens_reads_chat_and_responses_shapes():
+    chat = {"prompt_tokens": 2000, "prompt_tokens_details": {"cached_tokens": 1536}}
+    responses = SimpleNamespace(
+        input_tokens=1800, input_tokens_details=SimpleNamespace(cached_tokens=1024)
+    )
+    assert usage_tokens(chat) == (2000, 1536)
+    assert usage_tokens(responses) == (1800, 1024)
+    assert usage_tokens({"prompt_tokens": 5}) == (5, 0)
+    assert usage_tokens(None) == (0, 0)
+
+
+def test_cached_tokens_reach_meter_and_budget(monkeypatch):
+    prices = {"models": {"m": {"in_per_1k": 1.0, "cached_in_per_1k": 0.5, "out_per_1k": 0.0}}}
+    budget = BudgetManager({"target_cost_usd": 100.0}, prices)
+    meter = TokenMeter()
+    monkeypatch.setattr(lc, "BUDGET", budget)
+    monkeypatch.setattr(lc, "METER", meter)
+    monkeypatch.setattr(lc, "log_usage", lambda *a, **k: None)
+    resp = SimpleNamespace(
+        usage={
+            "prompt_tokens": 2000,
+            "completion_tokens": 0,
+            "total_tokens": 2000,
+            "prompt_tokens_details": {"cached_tokens": 1000},
+        }
+    )
+    monkeypatch.setattr(lc, "call_openai", lambda **kwargs: {"raw": resp, "text": "ok"})
+
+    out = lc.llm_call(None, "m", "Planner", [{"role": "user", "content": "hi"}])
+    assert out.cached_tokens == 1000
+    assert meter.cached_tokens("Planner") == 1000
+    assert meter.cache_hit_rate("Planner") == 0.5
+    assert budget.cached_tokens == 1000 and budget.stage_cached_tokens == {"Planner": 1000}
+    assert budget.spend == 1.5
+
+
+def test_api_call_log_records_cached_tokens(tmp_path, monkeypatch):
+    class Resp:
+        http_status = 200
+        output = []
+        output_text = "hi"
+        usage = SimpleNamespace(
+            input_tokens=1200, input_tokens_details=SimpleNamespace(cached_tokens=1024)
+        )
+
+        def model_dump_json(self):
+            return "{}"
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(lc.client.responses, "create", lambda **_: Resp())
+    monkeypatch.setattr(lc, "extract_text", lambda resp: resp.output_text)
+    logger = APICallLogger("r1", tmp_path, enabled=True)
+    api_loggers.set_api_call_logger(logger)
+    try:
+        lc.call_openai(model="m", messages=[{"role": "user", "content": "hi"}])
+    finally:
+        logger.flush()
+        api_loggers.set_api_call_logger(None)
+    rec = json.loads((tmp_path / "api_calls.jsonl").read_text().splitlines()[0])
+    assert rec["prompt_tokens"] == 1200
+    assert rec["cached_tokens"] == 1024
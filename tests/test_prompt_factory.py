@@ -76,3 +76,116 @@ def test_missing_required_fields_raises():
     with pytest.raises(ValueError) as exc:
         factory.build_prompt(spec)
     assert "idea" in str(exc.value)
+
+
+def _custom_registry(user_template: str, version: str = "v1", example_policy=None):
+    from dr_rd.prompting.prompt_registry import PromptRegistry, PromptTemplate, RetrievalPolicy
+
+    reg = PromptRegistry()
+    reg.register(
+        PromptTemplate(
+            id="custom",
+            version=version,
+            role="Custom",
+            task_key=None,
+            system="You are custom.",
+            user_template=user_template,
+            io_schema_ref="dr_rd/schemas/custom.json",
+            retrieval_policy=RetrievalPolicy.NONE,
+            example_policy=example_policy,
+        )
+    )
+    return reg
+
+
+def test_compiled_template_is_reused(monkeypatch):
+    from dr_rd.prompting import prompt_factory
+
+    calls = []
+    parse = prompt_factory.JINJA_ENV.parse
+    monkeypatch.setattr(
+        prompt_factory.JINJA_ENV, "parse", lambda src: calls.append(src) or parse(src)
+    )
+    prompt_factory._compile.cache_clear()
+    factory = PromptFactory(_custom_registry("Hello {{ name }} #cache"))
+    first = factory.build_prompt({"role": "Custom", "inputs": {"name": "a"}})
+    second = factory.build_prompt({"role": "Custom", "inputs": {"name": "b"}})
+    assert first["user"] == "Hello a #cache" and second["user"] == "Hello b #cache"
+    assert first["system"] == second["system"]
+    assert calls == ["Hello {{ name }} #cache"]
+
+    factory = PromptFactory(_custom_registry("Bye {{ name }} #cache"))
+    assert factory.build_prompt({"role": "Custom", "inputs": {"name": "c"}})["user"] == (
+        "Bye c #cache"
+    )
+    assert len(calls) == 2
+
+
+def test_policy_changes_reload_without_restart(monkeypatch, tmp_path):
+    from dr_rd.policy import engine
+
+    path = tmp_path / "policies.yaml"
+    path.write_text("pii:\n  action: redact\n")
+    monkeypatch.setattr(engine, "POLICY_PATH", path)
+    monkeypatch.setattr(feature_flags, "SAFETY_ENABLED", True)
+    factory = PromptFactory(_custom_registry("hi"))
+    assert "Policies: pii:redact." in factory.build_prompt({"role": "Custom"})["system"]
+    assert engine.load_policies() is engine.load_policies()
+
+    path.write_text("pii:\n  action: block\nsecrets:\n  action: redact\n")
+    system = factory.build_prompt({"role": "Custom"})["system"]
+    assert "Policies: pii:block, secrets:redact." in system
+
+
+def test_cache_layout_keeps_system_prefix_stable(monkeypatch):
+    monkeypatch.setattr(feature_flags, "PROMPT_CACHE_LAYOUT", True)
+    factory = PromptFactory(_custom_registry("Task: {{ name }}"))
+    plain = factory.build_prompt({"role": "Custom", "inputs": {"name": "drone"}})
+    aliased = factory.build_prompt({"role": "Custom", "inputs": {"name": "[PERSON_1] drone"}})
+    assert plain["system"] == aliased["system"]
+    assert "Placeholders" not in aliased["system"]
+    assert aliased["user"].startswith("Task: [PERSON_1] drone")
+    assert aliased["user"].endswith("Use them verbatim.")
+
+    monkeypatch.setattr(feature_flags, "PROMPT_CACHE_LAYOUT", False)
+    legacy = factory.build_prompt({"role": "Custom", "inputs": {"name": "[PERSON_1] drone"}})
+    assert legacy["system"].endswith("Use them verbatim.")
+
+
+def test_cache_layout_puts_examples_in_the_prefix(monkeypatch):
+    from dr_rd.examples import safety_filters
+    from dr_rd.prompting import example_selectors
+
+    sigs = []
+
+    def score(role, task_sig, *a):
+        sigs.append(task_sig)
+        return [{"input": "in1", "output": {"a": 1}}]
+
+    monkeypatch.setattr(feature_flags, "PROMPT_CACHE_LAYOUT", True)
+    monkeypatch.setattr(feature_flags, "EXAMPLES_ENABLED", True)
+    monkeypatch.setattr(example_selectors, "score_candidates", score)
+    monkeypatch.setattr(safety_filters, "filter_and_redact", lambda c, p: c)
+    factory = PromptFactory(_custom_registry("{{ name }}", example_policy={"max_tokens": 100}))
+    first = factory.build_prompt({"role": "Custom", "task_sig": "a", "inputs": {"name": "x"}})
+    second = factory.build_prompt({"role": "Custom", "task_sig": "b", "inputs": {"name": "y"}})
+    assert sigs == ["", ""]
+    assert first["system"] == second["system"]
+    assert first["system"].endswith('Examples:\nInput: in1\nOutput: {"a": 1}')
+    assert "few_shots" not in first
+
+
+def test_cache_layout_system_is_identical_across_tasks(monkeypatch):
+    monkeypatch.setattr(feature_flags, "PROMPT_CACHE_LAYOUT", True)
+    monkeypatch.setattr(feature_flags, "RAG_ENABLED", True)
+    factory = PromptFactory(default_registry)
+
+    def build(description, hits):
+        task = {"title": "Arch", "description": description, "inputs": hits}
+        return factory.build_prompt({"role": "CTO", "task": task, "inputs": {}})
+
+    first = build("Design the flight controller", ["[1] IMU datasheet", "[2] PX4 docs"])
+    second = build("Review [PERSON_1]'s battery plan", ["[1] Li-ion cycle study"])
+    assert first["system"].encode() == second["system"].encode()
+    assert first["user"] != second["user"]
+    assert "Li-ion cycle study" in second["user"]
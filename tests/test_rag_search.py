@@ -27,3 +27,41 @@ def test_hybrid_merges(tmp_path, monkeypatch):
     res = search.hybrid("alpha", [1.0, 0.0], k=2)
     ids = {r["chunk_id"] for r in res}
     assert {"d1:0", "d2:0"} <= ids
+
+
+def test_embed_search_blob_vectors_and_invalidation(tmp_path, monkeypatch):
+    setup_db(tmp_path, monkeypatch)
+    index.upsert_document(
+        "d1", {"name": ""}, ["north", "east"], embedder=lambda chs: [[0.0, 1.0], [1.0, 0.0]]
+    )
+    with index._conn() as c:
+        raw = c.execute("SELECT vec FROM embeddings WHERE chunk_id='d1:0'").fetchone()[0]
+        # rows written by older versions stored JSON text
+        c.execute("INSERT INTO embeddings(chunk_id, vec) VALUES('legacy:0', '[0.7, 0.7]')")
+        c.execute("INSERT INTO chunks(id, doc_id, ord, text) VALUES('legacy:0', 'legacy', 0, 'ne')")
+    assert isinstance(raw, bytes) and len(raw) == 8
+    index.invalidate_vectors()
+
+    res = search.embed_search([1.0, 0.1], limit=2)
+    assert [r["chunk_id"] for r in res] == ["d1:1", "legacy:0"]
+    assert res[0]["text"] == "east" and res[0]["score"] > res[1]["score"]
+    npy, _ = index._vectors_paths()
+    assert npy.exists()
+
+    index.upsert_document("d2", {"name": ""}, ["due east"], embedder=lambda chs: [[2.0, 0.0]])
+    assert not npy.exists()
+    res = search.embed_search([1.0, 0.0], limit=1)
+    assert res[0]["chunk_id"] in {"d1:1", "d2:0"} and abs(res[0]["score"] - 1.0) < 1e-6
+    assert search.embed_search([1.0, 0.0, 0.0], limit=3) == []
+
+
+def test_embed_search_chunks_large_id_lookups(tmp_path, monkeypatch):
+    setup_db(tmp_path, monkeypatch)
+    monkeypatch.setattr(search, "SQL_PARAM_CHUNK", 3)
+    texts = [f"chunk {i}" for i in range(8)]
+    index.upsert_document(
+        "d1", {"name": ""}, texts, embedder=lambda chs: [[1.0, i / 10] for i in range(len(chs))]
+    )
+    res = search.embed_search([1.0, 0.0], limit=8)
+    assert [r["chunk_id"] for r in res] == [f"d1:{i}" for i in range(8)]
+    assert [r["text"] for r in res] == texts
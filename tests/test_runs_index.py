@@ -35,3 +35,78 @@ def test_scan_search_csv(tmp_path):
     assert text[0].startswith("run_id")
     run_ids = {line.split(",")[0] for line in text[1:]}
     assert run_ids == {"r1", "r3"}
+
+
+def test_index_reconciles_only_changed_runs(tmp_path, monkeypatch):
+    root = tmp_path / "runs"
+    _write_run(root, "r1", started=100, status="success", mode="a")
+    _write_run(root, "r2", started=200, status="error", mode="b")
+    rows = runs_index.load_index(root=root)
+    assert [r["run_id"] for r in rows] == ["r2", "r1"]
+    assert runs_index.index_path(root).exists()
+
+    reads = []
+    orig = runs_index._read_run
+    monkeypatch.setattr(runs_index, "_read_run", lambda d: reads.append(d.name) or orig(d))
+    assert runs_index.reconcile(root) == 0 and reads == []
+
+    _write_run(root, "r1", started=100, status="cancelled", mode="a")
+    assert runs_index.reconcile(root) == 1 and reads == ["r1"]
+    assert runs_index.search(None, status=["cancelled"], root=root)[0]["run_id"] == "r1"
+
+    import shutil
+
+    shutil.rmtree(root / "r2")
+    assert [r["run_id"] for r in runs_index.load_index(root=root)] == ["r1"]
+
+
+def test_indexed_search_filters_and_text(tmp_path):
+    root = tmp_path / "runs"
+    _write_run(root, "r1", started=100, status="success", mode="a")
+    _write_run(root, "r2", started=200, status="error", mode="b")
+    _write_run(root, "r3", started=300, status="success", mode="a")
+    notes = {"title": "Battery study", "note": "check anode supply", "tags": ["Chem"]}
+    (root / "r3" / "notes.json").write_text(json.dumps({**notes, "favorite": True}))
+    runs_index.reconcile(root)
+
+    def ids(**kw):
+        return [r["run_id"] for r in runs_index.search(None, root=root, **kw)]
+
+    assert ids(status=["success"]) == ["r3", "r1"]
+    assert ids(mode=["b"]) == ["r2"]
+    assert ids(date_from=150, date_to=250) == ["r2"]
+    assert ids(q="ANODE") == ["r3"]
+    assert ids(q="dea r") == ["r3", "r2", "r1"]
+    assert ids(q="r2") == ["r2"]
+    assert ids(favorites_only=True, tags=["chem"]) == ["r3"]
+    assert ids(limit=1) == ["r3"]
+    assert runs_index.facets(root) == {"status": ["error", "success"], "mode": ["a", "b"]}
+
+
+def test_run_meta_writes_update_index(tmp_path, monkeypatch):
+    from utils import paths, run_notes, runs
+
+    root = tmp_path / "runs"
+    monkeypatch.setattr(paths, "RUNS_ROOT", root)
+    monkeypatch.setattr(run_notes, "RUNS_ROOT", root)
+    monkeypatch.setenv("RUNS_INDEX_RECONCILE_S", "3600")
+    runs.create_run_meta("r9", mode="demo", idea_preview="solar kiln")
+    runs_index.load_index()
+    runs.complete_run_meta("r9", status="success")
+    run_notes.save("r9", title="kiln", note="firing schedule", tags=["ops"], favorite=False)
+    # the root is unchanged, so these reads come from the rows written by the hooks
+    assert runs_index.search(None, status=["success"])[0]["run_id"] == "r9"
+    assert [r["run_id"] for r in runs_index.search(None, q="firing")] == ["r9"]
+
+
+def test_load_index_and_notes_are_shared_until_a_write(tmp_path):
+    root = tmp_path / "runs"
+    _write_run(root, "r1", started=100, status="success", mode="a")
+    first = runs_index.load_index(root=root)
+    assert runs_index.load_index(root=root) is first
+    assert runs_index.notes(root) == {}
+
+    (root / "r1" / "notes.json").write_text(json.dumps({"title": "t", "tags": []}))
+    runs_index.update_run("r1", root=root)
+    assert runs_index.load_index(root=root) is not first
+    assert runs_index.notes(root) == {"r1": {"title": "t", "tags": []}}
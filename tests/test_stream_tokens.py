@@ -0,0 +1,143 @@
+import types
+
+import core.llm_client as lc
+import core.orchestrator as orch
+from core.llm import rate_limit
+from utils import otel
+
+
+def _events(text, usage=True):
+    for piece in text.split(" "):
+        yield types.SimpleNamespace(type="response.output_text.delta", delta=piece + " ")
+    final = types.SimpleNamespace(
+        output_text=text + " ",
+        usage=types.SimpleNamespace(input_tokens=4, output_tokens=2, total_tokens=6)
+        if usage
+        else None,
+    )
+    yield types.SimpleNamespace(type="response.completed", response=final)
+
+
+class StreamingClient:
+    def __init__(self, text):
+        self.text = text
+        self.payloads = []
+        self.responses = types.SimpleNamespace(create=self._create)
+
+    def _create(self, **payload):
+        self.payloads.append(payload)
+        if payload.get("stream"):
+            return _events(self.text)
+        return types.SimpleNamespace(output_text=self.text, usage=None)
+
+
+def _setup(monkeypatch, client):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.delenv("DRRD_DRY_RUN", raising=False)
+    monkeypatch.setattr(lc, "_client", lambda: client)
+    monkeypatch.setattr(lc, "load_config", lambda: {})
+    monkeypatch.setattr(lc, "_supports_response_format", lambda: False)
+    monkeypatch.setattr(rate_limit, "get_limiter", lambda provider, model: None)
+
+
+def test_call_openai_streams_deltas_inside_stream_tokens(monkeypatch):
+    client = StreamingClient("hello streaming world")
+    _setup(monkeypatch, client)
+    msgs = [{"role": "user", "content": "hi"}]
+
+    plain = lc.call_openai(model="gpt-4o-mini", messages=msgs)
+    assert "stream" not in client.payloads[-1]
+    assert plain["text"] == "hello streaming world"
+
+    deltas = []
+    with lc.stream_tokens(deltas.append):
+        result = lc.call_openai(model="gpt-4o-mini", messages=msgs)
+    assert client.payloads[-1]["stream"] is True
+    assert deltas == ["hello ", "streaming ", "world "]
+    assert result["text"] == "hello streaming world "
+    assert result["raw"].usage.total_tokens == 6
+
+
+def test_run_stream_forwards_planner_and_synth_tokens(monkeypatch, tmp_path):
+    client = StreamingClient("one two")
+    _setup(monkeypatch, client)
+    monkeypatch.setattr(otel, "_FALLBACK_DIR", tmp_path)
+    state = {}
+    monkeypatch.setattr(orch.st, "session_state", state)
+    monkeypatch.setattr(orch.trace_writer, "append_step", lambda *a, **k: None)
+    monkeypatch.setattr(orch.trace_writer, "flush_phase_meta", lambda *a, **k: None)
+    monkeypatch.setattr(orch, "stream_chunked", lambda *a, **k: None)
+
+    def fake_plan(*a, **k):
+        lc.call_openai(model="gpt-4o-mini", messages=[{"role": "user", "content": "plan"}])
+        state["plan_tasks"] = [{"id": "T1", "role": "R", "title": "t"}]
+
+    def fake_synth(*a, **k):
+        return lc.call_openai(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "synth"}]
+        )["text"]
+
+    monkeypatch.setattr(orch, "generate_plan", fake_plan)
+    monkeypatch.setattr(orch, "execute_plan", lambda *a, **k: {"R": "ok"})
+    monkeypatch.setattr(orch, "compose_final_proposal", fake_synth)
+
+    events = list(orch.run_stream("idea", run_id="r-stream", agents={}))
+    tokens = {}
+    for e in events:
+        if e.kind == "token":
+            tokens[e.phase] = tokens.get(e.phase, "") + e.text
+    assert tokens == {"planner": "one two ", "synth": "one two "}
+    kinds = [(e.kind, e.phase) for e in events]
+    assert kinds.index(("token", "planner")) < kinds.index(("summary", "planner"))
+
+
+class FlakyStreamingClient(StreamingClient):
+    """First streamed call sends two deltas, then drops the connection."""
+
+    def _create(self, **payload):
+        if not self.payloads:
+            self.payloads.append(payload)
+
+            def broken():
+                events = _events(self.text)
+                yield next(events)
+                yield next(events)
+                raise RuntimeError("connection reset")
+
+            return broken()
+        return super()._create(**payload)
+
+
+def test_partial_stream_is_reset_before_retry(monkeypatch):
+    client = FlakyStreamingClient("one two three")
+    _setup(monkeypatch, client)
+    monkeypatch.setattr(lc.time, "sleep", lambda s: None)
+
+    deltas = []
+    with lc.stream_tokens(deltas.append):
+        result = lc.call_openai(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+    assert len(client.payloads) == 2
+    assert deltas[:2] == ["one ", "two "]
+    assert isinstance(deltas[2], lc.StreamReset) and deltas[2].chars == len("one two ")
+    assert deltas[3:] == ["one ", "two ", "three "]
+    assert result["text"] == "one two three "
+
+    def work():
+        msgs = [{"role": "user", "content": "hi"}]
+        return lc.call_openai(model="gpt-4o-mini", messages=msgs)["text"]
+
+    client.payloads.clear()
+    events = []
+    gen = orch._stream_phase("planner", work)
+    try:
+        while True:
+            events.append(next(gen))
+    except StopIteration:
+        pass
+    text = ""
+    for e in events:
+        if e.kind == "token_reset":
+            text = text[: len(text) - e.meta["chars"]]
+        elif e.kind == "token":
+            text += e.text
+    assert text == "one two three "
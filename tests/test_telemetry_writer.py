@@ -0,0 +1,61 @@
+import json
+import threading
+
+from dr_rd.telemetry.writer import BackgroundWriter
+
+
+def test_items_are_written_in_batches():
+    batches = []
+    w = BackgroundWriter(batches.append, batch_size=50, flush_interval_s=10)
+    for i in range(120):
+        assert w.submit(i)
+    assert w.flush()
+    assert [i for b in batches for i in b] == list(range(120))
+    assert len(batches) < 120
+    stats = w.stats()
+    assert stats["written"] == 120 and stats["queued"] == 0
+
+
+def test_full_queue_drops_instead_of_blocking():
+    gate = threading.Event()
+    written = []
+
+    def slow_sink(batch):
+        gate.wait(5)
+        written.extend(batch)
+
+    w = BackgroundWriter(slow_sink, max_queue=2, batch_size=1, flush_interval_s=10, block_s=0)
+    results = [w.submit(i) for i in range(10)]
+    assert results.count(False) >= 1
+    gate.set()
+    assert w.flush()
+    stats = w.stats()
+    assert stats["dropped"] == results.count(False)
+    assert len(written) == stats["submitted"]
+
+
+def test_sink_errors_are_counted_not_raised():
+    def bad_sink(batch):
+        raise OSError("disk full")
+
+    w = BackgroundWriter(bad_sink, flush_interval_s=10)
+    w.submit({"x": 1})
+    assert w.flush()
+    assert w.stats()["errors"] == 1
+
+
+def test_log_event_is_visible_after_flush(tmp_path, monkeypatch):
+    from utils import consent, telemetry
+
+    monkeypatch.setattr(consent, "CONSENT_PATH", tmp_path / "consent.json")
+    consent.set(telemetry=True, surveys=False)
+    monkeypatch.setattr(telemetry, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(telemetry, "_ACTIVE", {})
+    monkeypatch.setattr(telemetry, "MAX_BYTES", 10_000_000)
+    for i in range(5):
+        telemetry.log_event({"event": "tick", "i": i})
+    assert telemetry.flush()
+    files = list(tmp_path.glob("events-*.jsonl"))
+    assert len(files) == 1
+    rows = [json.loads(line) for line in files[0].read_text().splitlines()]
+    assert [r["i"] for r in rows] == list(range(5))
@@ -0,0 +1,136 @@
+import logging
+import random
+import sys
+
+import pytest
+
+import core.llm as llm
+import core.llm_client as lc
+from config import feature_flags
+from core import tokenizer
+from core.budget import BudgetExceeded, BudgetManager
+from core.llm.model_router import RouteContext, choose_model
+
+
+class FakeEncoding:
+    """One token per whitespace-separated word; records what it encodes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode_batch(self, texts, disallowed_special=()):
+        self.batches.append(list(texts))
+        return [t.split() for t in texts]
+
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    enc = FakeEncoding()
+    monkeypatch.setattr(
+        tokenizer, "_encoder", lambda name: None if name == tokenizer.HEURISTIC else enc
+    )
+    tokenizer.cache_clear()
+    yield enc
+    tokenizer.cache_clear()
+
+
+def test_encoding_by_model_family():
+    assert tokenizer.encoding_name("openai/gpt-4o-mini") == "o200k_base"
+    assert tokenizer.encoding_name("gpt-4.1-mini") == "o200k_base"
+    assert tokenizer.encoding_name("gpt-4-turbo") == "cl100k_base"
+    assert tokenizer.encoding_name(None) == tokenizer.DEFAULT_ENCODING
+    assert tokenizer.encoding_name("claude-3-5-sonnet") == tokenizer.HEURISTIC
+
+
+def test_heuristic_fallback_matches_previous_estimate():
+    assert tokenizer.count("x" * 41, "gemini-1.5-pro") == 10
+    assert tokenizer.count_batch(["abcd" * 3, ""], "claude-3-5-sonnet") == [3, 0]
+
+
+def test_batch_counts_only_encode_cache_misses(fake_encoding):
+    assert tokenizer.count("one two three", "gpt-4o") == 3
+    assert tokenizer.count_batch(["one two three", "a b", "c"], "gpt-4o") == [3, 2, 1]
+    assert fake_encoding.batches == [["one two three"], ["a b", "c"]]
+    messages = [{"role": "system", "content": "a b"}, {"role": "user", "content": "c"}]
+    assert tokenizer.count_messages(messages, "gpt-4o") == 3 + 2 * 3 + 3
+    assert len(fake_encoding.batches) == 2
+
+
+def test_budget_counts_prompt_text(fake_encoding):
+    prices = {"models": {"gpt-4o": {"in_per_1k": 1.0, "out_per_1k": 0.0}}}
+    budget = BudgetManager({"target_cost_usd": 1.0}, prices, safety_margin=0.0)
+    prompt = " ".join(["word"] * 500)
+    # A 20k-character guess would not fit; the counted 500 tokens do.
+    assert not budget.can_afford("exec", "gpt-4o", 5000, 0)
+    assert budget.can_afford("exec", "gpt-4o", 5000, 0, prompt=prompt)
+    res = budget.reserve("exec", "gpt-4o", 5000, 0, prompt=prompt)
+    assert res.prompt_tokens == 500 and res.cost == pytest.approx(0.5)
+
+
+def test_choose_model_filters_context_by_counted_prompt(fake_encoding, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)
+    prompt = " ".join(["w"] * 150000)
+    decision = choose_model(RouteContext(role=None, purpose="exec", prompt=prompt))
+    assert decision.model == "gemini-1.5-pro" and decision.reason == "no_preferred_ctx"
+    # Gemini has no tiktoken encoding, so its estimate uses the character heuristic.
+    assert decision.budget_est["est_tokens"] == len(prompt) // 4
+    short = choose_model(RouteContext(role=None, purpose="exec", size_hint=10**6, prompt="hi"))
+    assert short.reason != "no_preferred_ctx"
+
+
+def test_missing_tiktoken_warns_about_heuristic(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "tiktoken", None)
+    tokenizer._encoder.cache_clear()
+    try:
+        with caplog.at_level(logging.WARNING, logger="core.tokenizer"):
+            assert tokenizer.count("x" * 8, "gpt-4o") == 2
+    finally:
+        tokenizer._encoder.cache_clear()
+    assert "heuristic" in caplog.text
+
+
+def test_select_model_routes_with_prompt(monkeypatch):
+    for name in ("DRRD_MODEL_EXEC", "DRRD_OPENAI_MODEL", "DRRD_FORCE_MODEL"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(feature_flags, "MODEL_ROUTING_ENABLED", True)
+    seen = []
+
+    def fake_choose(ctx):
+        seen.append(ctx)
+        return type("Decision", (), {"model": "gpt-4.1-mini"})()
+
+    monkeypatch.setattr(llm, "choose_model", fake_choose)
+    assert llm.select_model("exec", prompt="long prompt") == "gpt-4.1-mini"
+    assert seen[0].prompt == "long prompt"
+
+
+def test_call_openai_without_model_routes_on_prompt(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("DRRD_DRY_RUN", "1")
+    seen = {}
+
+    def fake_select(purpose, ui_model=None, agent_name=None, prompt=None):
+        seen.update(purpose=purpose, prompt=prompt)
+        return "gpt-4o-mini"
+
+    monkeypatch.setattr(llm, "select_model", fake_select)
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "task"}]
+    lc.call_openai(messages=messages, meta={"purpose": "exec"})
+    assert seen == {"purpose": "exec", "prompt": "sys \ntask"}
+
+
+def test_llm_call_checks_budget_with_counted_prompt(fake_encoding, monkeypatch):
+    prices = {"models": {"gpt-4o": {"in_per_1k": 1.0, "out_per_1k": 0.0}}}
+    budget = BudgetManager({"target_cost_usd": 1.0}, prices, safety_margin=0.0)
+    lc.set_budget_manager(budget, enforce=True)
+    calls = []
+    monkeypatch.setattr(lc, "call_openai", lambda **kw: calls.append(kw) or {"raw": None})
+    monkeypatch.setattr(lc, "log_usage", lambda *a, **k: None)
+
+    short = [{"role": "user", "content": " ".join(["word"] * 490)}]
+    lc.llm_call(None, "gpt-4o", "exec", short)
+    assert len(calls) == 1
+    long = [{"role": "user", "content": " ".join(["word"] * 2000)}]
+    with pytest.raises(BudgetExceeded):
+        lc.llm_call(None, "gpt-4o", "exec", long)
+    assert len(calls) == 1 and budget.skipped_due_to_budget == 1
@@ -0,0 +1,86 @@
+import threading
+import time
+
+from config import feature_flags
+from core import provenance, tool_router
+
+
+def sleepy(delay: float = 0.0, tag: str = ""):
+    time.sleep(delay)
+    return {"ok": True, "tag": tag}
+
+
+def boom():
+    raise RuntimeError("connector down")
+
+
+def _register(name, fn, key="CODE_IO"):
+    tool_router.register_tool(name, fn, key)
+    tool_router.allow_tools("Batcher", [name])
+
+
+def test_batch_runs_tools_concurrently_in_order():
+    for name in ("b_one", "b_two", "b_three"):
+        _register(name, sleepy)
+    start = time.monotonic()
+    results = tool_router.call_tools_batch(
+        "Batcher",
+        [
+            ("b_one", {"delay": 0.3, "tag": "1"}),
+            ("b_two", {"delay": 0.3, "tag": "2"}),
+            ("b_three", {"delay": 0.3, "tag": "3"}),
+        ],
+    )
+    assert time.monotonic() - start < 0.8
+    assert [r["tag"] for r in results] == ["1", "2", "3"]
+
+
+def test_batch_failures_and_timeouts_stay_in_their_slot():
+    _register("b_boom", boom)
+    _register("b_slow", sleepy, key="FINANCE")  # max_runtime_ms: 1000
+    start = time.monotonic()
+    results = tool_router.call_tools_batch(
+        "Batcher",
+        [("b_boom", {}), ("b_slow", {"delay": 0.5}), ("missing", {})],
+        budget={"max_runtime_ms": 50},
+    )
+    assert time.monotonic() - start < 0.4
+    assert results[0] == {"ok": False, "error": "connector down"}
+    assert results[1] == {"ok": False, "error": "max_runtime_ms exceeded"}
+    assert results[2]["ok"] is False
+
+
+def test_max_calls_is_enforced_across_threads():
+    _register("b_capped", sleepy)
+    tool_router._REGISTRY["b_capped"].calls = 0
+    results = tool_router.call_tools_batch(
+        "Batcher", [("b_capped", {"delay": 0.05})] * 6, budget={"max_tool_calls": 2}
+    )
+    assert sum(1 for r in results if r.get("tag") == "") == 2
+    assert sum(1 for r in results if r.get("error") == "max_tool_calls exceeded") == 4
+
+
+def test_concurrent_spans_nest_under_the_caller(monkeypatch):
+    monkeypatch.setattr(feature_flags, "PROVENANCE_ENABLED", True)
+    provenance.reset()
+    seen = {}
+
+    def inner(tag: str):
+        span = provenance.start_span(f"inner-{tag}")
+        seen[tag] = threading.current_thread().name
+        time.sleep(0.05)
+        provenance.end_span(span)
+        return {"ok": True}
+
+    _register("b_inner_a", inner)
+    _register("b_inner_b", inner)
+    parent = provenance.start_span("agent")
+    tool_router.call_tools_batch(
+        "Batcher", [("b_inner_a", {"tag": "a"}), ("b_inner_b", {"tag": "b"})]
+    )
+    provenance.end_span(parent)
+    events = {e["name"]: e for e in provenance.get_events()}
+    for tool, tag in (("b_inner_a", "a"), ("b_inner_b", "b")):
+        assert events[tool]["parent_id"] == parent
+        assert events[f"inner-{tag}"]["parent_id"] == events[tool]["id"]
+    assert seen["a"] != seen["b"]
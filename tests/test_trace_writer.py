@@ -7,7 +7,72 @@ def test_trace_writer_creates_dirs(tmp_path, monkeypatch):
     monkeypatch.setattr(paths, "RUNS_ROOT", tmp_path / ".dr_rd" / "runs")
     run_id = "r1"
     trace_writer.append_step(run_id, {"event": "x"})
+    assert (paths.RUNS_ROOT / run_id / "trace.jsonl").exists()
+    trace_writer.compact(run_id)
     p = paths.RUNS_ROOT / run_id / "trace.json"
     assert p.exists()
     data = json.loads(p.read_text())
     assert data and data[0]["event"] == "x"
+
+
+def test_read_trace_merges_legacy_and_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "RUNS_ROOT", tmp_path / ".dr_rd" / "runs")
+    run_id = "r2"
+    root = paths.RUNS_ROOT / run_id
+    root.mkdir(parents=True)
+    (root / "trace.json").write_text(json.dumps([{"event": "legacy"}]), encoding="utf-8")
+    trace_writer.append_step(run_id, {"event": "new"}, meta={"k": 1})
+    with open(root / "trace.jsonl", "a", encoding="utf-8") as fh:
+        fh.write('{"event": "torn"')
+    assert trace_writer.read_trace(run_id) == [
+        {"event": "legacy"},
+        {"event": "new", "meta": {"k": 1}},
+    ]
+    compacted = trace_writer.compact(run_id)
+    assert compacted == trace_writer.read_trace(run_id)
+    assert not (root / "trace.jsonl").exists()
+    assert trace_writer.compact(run_id) == compacted
+
+
+def test_group_commit_fsync(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "RUNS_ROOT", tmp_path / ".dr_rd" / "runs")
+    monkeypatch.setattr(trace_writer, "FSYNC_BATCH", 5)
+    monkeypatch.setattr(trace_writer, "FSYNC_INTERVAL_S", 3600.0)
+    synced = []
+    monkeypatch.setattr(trace_writer.os, "fsync", lambda fd: synced.append(fd))
+    for i in range(12):
+        trace_writer.append_step("r3", {"i": i})
+    assert len(synced) == 2
+    trace_writer.sync("r3")
+    assert len(synced) == 3
+    assert len(trace_writer.read_trace("r3")) == 12
+
+
+def test_plan_execute_complete_has_no_duplicate_steps(tmp_path, monkeypatch):
+    from utils import runs, trace_export
+
+    monkeypatch.setattr(paths, "RUNS_ROOT", tmp_path / ".dr_rd" / "runs")
+
+    def _write_bytes(rid, name, ext, data):
+        p = paths.run_root(rid) / f"{name}.{ext}"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(data)
+        return p
+
+    monkeypatch.setattr(trace_export, "write_bytes", _write_bytes)
+    monkeypatch.setattr(runs, "artifact_path", lambda rid, n, e: paths.run_root(rid) / f"{n}.{e}")
+    run_id = "r4"
+    # plan
+    trace_writer.append_step(run_id, {"phase": "planner"})
+    # execute: steps stream in, then the collector's items replace the trace
+    trace_writer.append_step(run_id, {"phase": "router"})
+    collector = [{"phase": "executor", "role": "CTO"}, {"phase": "executor", "role": "QA"}]
+    trace_export.write_trace_json(run_id, collector)
+    trace_writer.append_step(run_id, {"phase": "synth"})
+    assert trace_writer.read_trace(run_id) == collector + [{"phase": "synth"}]
+    # complete
+    paths.run_root(run_id).joinpath("run.json").write_text("{}")
+    runs.complete_run_meta(run_id, status="success")
+    data = json.loads((paths.run_root(run_id) / "trace.json").read_text())
+    assert data == collector + [{"phase": "synth"}]
+    assert not (paths.run_root(run_id) / "trace.jsonl").exists()
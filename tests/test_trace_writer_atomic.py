@@ -13,6 +13,7 @@ def test_single_writer_round_trip(tmp_path, monkeypatch):
     run_id = "run1"
     ensure_run_dirs(run_id)
     trace_writer.append_step(run_id, {"event": "start"})
+    trace_writer.compact(run_id)
     p = trace_writer.trace_path(run_id)
     assert p.exists()
     assert json.loads(p.read_text(encoding="utf-8")) == [{"event": "start"}]
@@ -29,6 +30,8 @@ def test_concurrent_writes(tmp_path, monkeypatch):
     with ThreadPoolExecutor(max_workers=20) as ex:
         list(ex.map(worker, range(20)))
 
+    assert len(trace_writer.read_trace(run_id)) == 20
+    trace_writer.compact(run_id)
     p = trace_writer.trace_path(run_id)
     data = json.loads(p.read_text(encoding="utf-8"))
     assert len(data) == 20
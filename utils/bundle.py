@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import json
 from io import BytesIO
 from zipfile import ZipFile, ZIP_DEFLATED
 from typing import Callable, Iterable, Tuple
 
+from .trace_writer import read_trace
+
 DEFAULT_FILES = [
     ("trace", "json"),
     ("summary", "csv"),
@@ -11,6 +14,12 @@ DEFAULT_FILES = [
 ]
 
 
+def _read_trace_bytes(run_id: str) -> bytes:
+    """The full trace, including steps of a run that never compacted ``trace.jsonl``."""
+    trace = read_trace(run_id)
+    return json.dumps(trace, ensure_ascii=False, indent=2).encode("utf-8") if trace else b""
+
+
 def build_zip_bundle(
     run_id: str,
     files: Iterable[Tuple[str, str]],
@@ -28,8 +37,11 @@ def build_zip_bundle(
     buffer = BytesIO()
     with ZipFile(buffer, "w", ZIP_DEFLATED) as zf:
         for name, ext in sorted(to_include):
+            if (name, ext) == ("trace", "jsonl"):
+                continue  # folded into trace.json below
             try:
-                data = read_bytes(run_id, name, ext)
+                data = _read_trace_bytes(run_id) if (name, ext) == ("trace", "json") else b""
+                data = data or read_bytes(run_id, name, ext)
             except Exception:
                 continue
             if sanitize:
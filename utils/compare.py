@@ -18,6 +18,7 @@ from .metrics import ensure_run_totals
 from .paths import artifact_path
 from .runs import load_run_meta
 from .trace_export import flatten_trace_rows
+from .trace_writer import read_trace
 
 
 @dataclass(frozen=True)
@@ -42,11 +43,7 @@ def load_run(run_id: str) -> dict[str, Any]:
         lock = json.loads(lock_path.read_text(encoding="utf-8"))
     except Exception:
         lock = {}
-    trace_path = artifact_path(run_id, "trace", "json")
-    try:
-        trace = json.loads(trace_path.read_text(encoding="utf-8"))
-    except Exception:
-        trace = []
+    trace = read_trace(run_id)
     rows = flatten_trace_rows(trace)
     totals_raw = ensure_run_totals(meta, rows)
     totals = {
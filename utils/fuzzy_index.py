@@ -0,0 +1,93 @@
+"""Character-trigram inverted index used to prune fuzzy-search candidates.
+
+Documents are lower-cased and split into overlapping three-character grams;
+each gram maps to the set of document ids containing it.  A query is answered
+in two steps: documents containing every query gram are checked for an exact
+substring match, and the remaining documents are ranked by how many query
+grams they share, so that only the best few need an expensive similarity
+score.  Documents are added, replaced and removed one at a time.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the set of three-character grams in ``text`` (already lower-cased)."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._texts: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._texts
+
+    def text(self, doc_id: str) -> str:
+        return self._texts[doc_id]
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous text."""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+        text = text.lower()
+        grams = trigrams(text)
+        for g in grams:
+            self._postings.setdefault(g, set()).add(doc_id)
+        self._grams[doc_id] = grams
+        self._texts[doc_id] = text
+
+    def remove(self, doc_id: str) -> None:
+        for g in self._grams.pop(doc_id, ()):
+            posting = self._postings.get(g)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[g]
+        self._texts.pop(doc_id, None)
+
+    def containing(self, query: str) -> List[str]:
+        """Return ids of documents whose text contains ``query`` as a substring."""
+        query = query.lower()
+        grams = trigrams(query)
+        if not grams:  # too short to use the index
+            return [d for d, t in self._texts.items() if query in t]
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        found = set.intersection(*postings) if postings[0] else set()
+        return [d for d in found if query in self._texts[d]]
+
+    def overlap(
+        self,
+        query: str,
+        exclude: Iterable[str] = (),
+        max_df: float = 0.25,
+        min_candidates: int = 200,
+    ) -> Counter:
+        """Count shared query grams per document (documents sharing none are omitted).
+
+        Grams are visited rarest first.  Grams found in more than ``max_df``
+        of all documents carry little signal and are only counted while fewer
+        than ``min_candidates`` documents have been found.
+        """
+        postings = sorted((self._postings.get(g, set()) for g in trigrams(query.lower())), key=len)
+        cap = max_df * len(self._texts)
+        exclude = set(exclude)
+        counts: Counter = Counter()
+        for posting in postings:
+            if len(posting) > cap and len(counts) >= min_candidates:
+                break
+            counts.update(posting)
+            for d in exclude & counts.keys():
+                del counts[d]
+        return counts
+
+
+__all__ = ["TrigramIndex", "trigrams"]
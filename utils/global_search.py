@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import List, Dict, Any, Tuple, Optional
 import difflib
+import heapq
+import threading
 import time
 
 # Optional fast fuzzy matcher
@@ -11,6 +13,10 @@ except Exception:  # pragma: no cover - fallback
     fuzz = None  # type: ignore
 
 from . import runs_index, run_notes, knowledge_store
+from .fuzzy_index import TrigramIndex
+
+# Documents sharing the most query trigrams that get a full similarity score.
+FINE_SCORE_MAX = 200
 
 
 # Result schema:
@@ -105,6 +111,153 @@ def fuzzy_rank(query: str, candidates: List[Dict], limit: int = 20) -> List[Dict
     return out
 
 
+def _doc_id(entry: Dict) -> str:
+    return f"{entry.get('kind')}:{entry.get('id')}"
+
+
+class PaletteIndex:
+    """Corpus of palette entries kept in a :class:`TrigramIndex` between searches.
+
+    :meth:`sync` diffs each run (with its notes), knowledge item and action
+    against what was indexed last time and only re-indexes entries whose
+    source changed.  When the loaders hand back the very same objects as
+    before (they cache until their data changes) the diff is skipped.
+    """
+
+    def __init__(self) -> None:
+        self.grams = TrigramIndex()
+        self.entries: Dict[str, Dict] = {}
+        self.order: Dict[str, int] = {}
+        self._ordered: List[str] = []
+        self._sources: Dict[Tuple[str, str], Tuple[Any, List[str]]] = {}
+        self._data_keys: List[Tuple[str, str]] = []
+        self._action_keys: List[Tuple[str, str]] = []
+        self._seen: Tuple[Any, ...] = ()
+        self._lock = threading.Lock()
+
+    def _put(self, key: Tuple[str, str], sig: Any, build) -> bool:
+        """Index the entries of one source unless its signature is unchanged."""
+        old = self._sources.get(key)
+        if old is not None and old[0] == sig:
+            return False
+        if old is not None:
+            self._drop(old[1])
+        ids = []
+        for entry in build():
+            doc = _doc_id(entry)
+            self.entries[doc] = entry
+            self.grams.add(doc, " ".join([entry.get("label", ""), entry.get("text", "")]))
+            ids.append(doc)
+        self._sources[key] = (sig, ids)
+        return True
+
+    def _drop(self, ids: List[str]) -> None:
+        for doc in ids:
+            self.entries.pop(doc, None)
+            self.grams.remove(doc)
+
+    def sync(
+        self,
+        *,
+        runs: List[Dict],
+        notes: Dict[str, Dict],
+        knowledge: List[Dict],
+        actions: List[Dict],
+    ) -> None:
+        with self._lock:
+            same = len(self._seen) == 3 and all(
+                a is b for a, b in zip(self._seen, (runs, notes, knowledge))
+            )
+            keys: List[Tuple[str, str]] = []
+            changed = False
+            if same:
+                keys = list(self._data_keys)
+            else:
+                changed = True
+                for r in runs:
+                    rid = r.get("run_id", "")
+                    note = notes.get(rid, {})
+                    key = ("run", rid)
+                    sig = (tuple(r.items()), tuple(note.items()))
+                    self._put(
+                        key,
+                        sig,
+                        lambda r=r, rid=rid, note=note: build_corpus(
+                            runs=[r], notes={rid: note}, knowledge=[]
+                        ),
+                    )
+                    keys.append(key)
+                for item in knowledge:
+                    key = ("knowledge", str(item.get("id")))
+                    self._put(
+                        key,
+                        tuple(item.items()),
+                        lambda item=item: build_corpus(runs=[], notes={}, knowledge=[item]),
+                    )
+                    keys.append(key)
+                self._data_keys = list(keys)
+            action_keys = [("action", _doc_id(a)) for a in actions]
+            changed = changed or action_keys != self._action_keys
+            for key, a in zip(action_keys, actions):
+                sig = tuple((k, repr(v)) for k, v in a.items())
+                changed = self._put(key, sig, lambda a=a: [a]) or changed
+            self._action_keys = action_keys
+            if not changed:
+                return
+            keys.extend(action_keys)
+            wanted = set(keys)
+            for key in [k for k in self._sources if k not in wanted]:
+                self._drop(self._sources.pop(key)[1])
+            order: Dict[str, int] = {}
+            for key in keys:
+                for doc in self._sources[key][1]:
+                    order.setdefault(doc, len(order))
+            self.order = order
+            self._ordered = list(order)
+            self._seen = (runs, notes, knowledge)
+
+    def rank(self, query: str, limit: int = 20) -> List[Dict]:
+        """Same ranking as :func:`fuzzy_rank`, scoring only pruned candidates.
+
+        Exact substring hits score 1.0.  Other entries are considered only if
+        they share a trigram with the query, and only the ``FINE_SCORE_MAX``
+        sharing the most are scored with the fuzzy ratio.  Queries shorter than
+        three characters have no trigrams, so the first ``FINE_SCORE_MAX``
+        entries are fuzzy-scored instead.
+        """
+        with self._lock:
+            order = self.order
+            if not query:
+                top = [(1.0, d) for d in self._ordered[:limit]]
+                return self._results(top)
+            q = query.lower()
+            exact = self.grams.containing(q)
+            if len(exact) >= limit:
+                top = [(1.0, d) for d in heapq.nsmallest(limit, exact, key=order.__getitem__)]
+                return self._results(top)
+            scored = [(1.0, d) for d in exact]
+            if len(q) < 3:
+                hits = set(exact)
+                near = [d for d in self._ordered[:FINE_SCORE_MAX] if d not in hits]
+            else:
+                counts = self.grams.overlap(q, exclude=exact, min_candidates=FINE_SCORE_MAX)
+                near = heapq.nlargest(FINE_SCORE_MAX, counts, key=lambda d: (counts[d], -order[d]))
+            scored.extend((_score(q, self.grams.text(d)), d) for d in near)
+            top = heapq.nlargest(limit, scored, key=lambda t: (t[0], -order[t[1]]))
+            return self._results(top)
+
+    def _results(self, top: List[Tuple[float, str]]) -> List[Dict]:
+        out: List[Dict] = []
+        for score, doc in top:
+            item = {k: v for k, v in self.entries[doc].items() if k != "text"}
+            item["score"] = score
+            out.append(item)
+        return out
+
+
+_PALETTE = PaletteIndex()
+
+
 def default_actions() -> List[Dict]:
     """Static command/page entries with labels and payloads."""
     actions: List[Dict] = []
@@ -126,11 +279,10 @@ def default_actions() -> List[Dict]:
                 "text": label,
             }
         )
-    runs = runs_index.load_index()
-    last_run = runs[0] if runs else None
-    last_run_id = last_run.get("run_id") if last_run else None
-    resumable = next((r for r in runs if r.get("status") == "resumable"), None)
-    resumable_id = resumable.get("run_id") if resumable else None
+    latest = runs_index.search(None, limit=1)
+    last_run_id = latest[0].get("run_id") if latest else None
+    resumable = runs_index.search(None, status=["resumable"], limit=1)
+    resumable_id = resumable[0].get("run_id") if resumable else None
     actions.append(
         {
             "kind": "cmd",
@@ -200,13 +352,14 @@ def default_actions() -> List[Dict]:
 
 
 def search(query: str, *, limit: int = 20) -> List[Dict]:
-    """Load runs/notes/knowledge; build corpus + default actions; return ranked results."""
-    runs = runs_index.load_index()
-    notes = run_notes.all_notes()
-    knowledge = knowledge_store.list_items()
-    candidates = build_corpus(runs=runs, notes=notes, knowledge=knowledge)
-    candidates.extend(default_actions())
-    return fuzzy_rank(query, candidates, limit=limit)
+    """Sync runs/notes/knowledge and default actions into the palette index; return ranked hits."""
+    _PALETTE.sync(
+        runs=runs_index.load_index(),
+        notes=run_notes.all_notes(),
+        knowledge=knowledge_store.list_items(),
+        actions=default_actions(),
+    )
+    return _PALETTE.rank(query, limit=limit)
 
 
 def resolve_action(item: Dict[str, Any]) -> Dict[str, Any]:
@@ -242,6 +395,7 @@ def resolve_action(item: Dict[str, Any]) -> Dict[str, Any]:
 __all__ = [
     "build_corpus",
     "fuzzy_rank",
+    "PaletteIndex",
     "default_actions",
     "search",
     "resolve_action",
@@ -1,4 +1,4 @@
-import hashlib, json, time
+import hashlib, json, os, threading, time
 from pathlib import Path
 from typing import Any, Mapping, Optional
 
@@ -29,4 +29,34 @@ def get(k: str, ttl_sec: Optional[int]=None) -> Optional[dict]:
 
 def put(k: str, resp: Mapping[str, Any]) -> None:
     p = ROOT / f"{k}.json"
-    p.write_text(json.dumps(resp, ensure_ascii=False), encoding='utf-8')
+    tmp = p.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp.write_text(json.dumps(resp, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp, p)
+
+def prune(max_bytes: Optional[int]=None, ttl_sec: Optional[int]=None) -> int:
+    """Drop expired entries, then the oldest ones until under ``max_bytes``.
+
+    Returns the number of files removed.
+    """
+    entries = []
+    for p in ROOT.glob('*.json'):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+    entries.sort()
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, p in entries:
+        expired = ttl_sec is not None and now - mtime > ttl_sec
+        if not expired and (max_bytes is None or total <= max_bytes):
+            continue
+        try:
+            p.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -49,14 +49,34 @@ def _write_meta(data: Mapping[str, dict]) -> None:
                 pass
 
 
+_LIST_CACHE: tuple = (None, [])
+
+
+def _meta_stamp() -> tuple | None:
+    try:
+        st = META.stat()
+    except OSError:
+        return None
+    return (str(META.resolve()), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 def list_items(tags: Iterable[str] | None = None) -> list[dict]:
-    """Return a sorted list of item dicts."""
+    """Return a sorted list of item dicts.
+
+    Without ``tags`` the list is reused until ``meta.json`` changes; do not
+    mutate it.
+    """
+    global _LIST_CACHE
+    stamp = _meta_stamp()
+    if not tags and stamp is not None and _LIST_CACHE[0] == stamp:
+        return _LIST_CACHE[1]
     meta = _read_meta()
     items = list(meta.values())
+    items.sort(key=lambda x: x.get("created_at", 0))
     if tags:
         tagset = set(tags)
-        items = [i for i in items if tagset.intersection(i.get("tags", []))]
-    items.sort(key=lambda x: x.get("created_at", 0))
+        return [i for i in items if tagset.intersection(i.get("tags", []))]
+    _LIST_CACHE = (stamp, items)
     return items
 
 
@@ -1,6 +1,8 @@
 import importlib
+import threading
 import types
-from typing import Optional
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
 
 
 class LazyModule(types.ModuleType):
@@ -29,3 +31,53 @@ def lazy(name: str) -> LazyModule:
 def local_import(name: str):
     """Explicitly import *name* within a function body."""
     return importlib.import_module(name)
+
+
+class LazyMapping(MutableMapping):
+    """Mapping of keys to ``"module:attr"`` specs resolved on first lookup.
+
+    Iterating, ``len`` and ``in`` only touch the specs, so listing the keys of
+    a registry never imports the modules behind it.  Assigned values are
+    stored as-is, which keeps ``monkeypatch.setitem`` working in tests.
+    """
+
+    def __init__(self, specs: Dict[str, str]):
+        self._specs = dict(specs)
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._loaded[key]
+        except KeyError:
+            pass
+        spec = self._specs[key]
+        module, _, attr = spec.partition(":")
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded[key] = getattr(importlib.import_module(module), attr)
+            return self._loaded[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._specs.setdefault(key, "")
+        self._loaded[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._specs[key]
+        self._loaded.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._specs
+
+    def loaded(self) -> Dict[str, Any]:
+        """Return the entries resolved so far without importing the rest."""
+        return dict(self._loaded)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._specs)!r})"
@@ -11,8 +11,9 @@ fmt = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
 h.setFormatter(fmt)
 logger.addHandler(h)
 
-os.makedirs("runs", exist_ok=True)
-raw_handler = logging.FileHandler("runs/unredacted.log")
+_LOG_DIR = os.getenv("PROVENANCE_LOG_DIR", "runs")
+os.makedirs(_LOG_DIR, exist_ok=True)
+raw_handler = logging.FileHandler(os.path.join(_LOG_DIR, "unredacted.log"))
 raw_handler.setFormatter(fmt)
 raw_logger = logging.getLogger("drrd_unredacted")
 raw_logger.setLevel(logging.INFO)
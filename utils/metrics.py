@@ -5,6 +5,8 @@ import time
 from pathlib import Path
 from typing import Mapping, Sequence
 
+from dr_rd.telemetry import warehouse
+
 from .cache import cached_data
 from .diff_runs import aggregate_from_rows
 from .lazy_import import lazy
@@ -20,9 +22,7 @@ _pd = lazy("pandas")
 def load_events(limit: int = 10000) -> list[dict]:
     if not EVENTS_PATH.exists():
         return []
-    with EVENTS_PATH.open("r", encoding="utf-8") as f:
-        lines = f.readlines()[-limit:]
-    return [json.loads(line) for line in lines]
+    return warehouse.events([EVENTS_PATH], last=limit)
 
 
 @cached_data(ttl=15)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import threading
 import time
+import uuid
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -18,6 +21,11 @@ CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(text, content='chunks',
 CREATE TABLE IF NOT EXISTS embeddings (chunk_id TEXT PRIMARY KEY, vec TEXT);
 """
 
+# ``embeddings.vec`` holds little-endian float32 BLOBs; rows written before the
+# switch may still contain JSON text and are decoded transparently.
+_VEC_CACHE: Dict[str, Any] = {}
+_VEC_LOCK = threading.Lock()
+
 
 def _conn():
     c = sqlite3.connect(DB)
@@ -35,6 +43,99 @@ def init() -> None:
     c.close()
 
 
+def _vectors_paths() -> tuple[Path, Path]:
+    return DB.with_name(DB.name + ".vectors.npy"), DB.with_name(DB.name + ".vectors.json")
+
+
+def encode_vec(vec: Iterable[float]) -> bytes:
+    import numpy as np
+
+    return np.asarray(list(vec), dtype="<f4").tobytes()
+
+
+def decode_vec(raw: Any):
+    import numpy as np
+
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return np.frombuffer(raw, dtype="<f4")
+    return np.asarray(json.loads(raw), dtype="<f4")
+
+
+def invalidate_vectors() -> None:
+    """Drop the memory-mapped vector sidecar so the next search rebuilds it."""
+    with _VEC_LOCK:
+        _VEC_CACHE.clear()
+        for p in _vectors_paths():
+            p.unlink(missing_ok=True)
+
+
+def _build_vectors(npy: Path, ids_path: Path) -> None:
+    import numpy as np
+
+    with _conn() as c:
+        rows = c.execute("SELECT chunk_id, vec FROM embeddings ORDER BY chunk_id").fetchall()
+    decoded = [(cid, decode_vec(raw)) for cid, raw in rows]
+    dims: Dict[int, int] = {}
+    for _, v in decoded:
+        dims[v.shape[0]] = dims.get(v.shape[0], 0) + 1
+    dim = max(dims, key=dims.get) if dims else 0
+    keep = [(cid, v) for cid, v in decoded if v.shape[0] == dim]
+    mat = np.zeros((len(keep), dim), dtype="<f4")
+    for i, (_, v) in enumerate(keep):
+        mat[i] = v
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    mat /= norms
+    tag = uuid.uuid4().hex
+    tmp_npy = npy.with_name(f"{npy.name}.tmp.{tag}")
+    tmp_ids = ids_path.with_name(f"{ids_path.name}.tmp.{tag}")
+    try:
+        with open(tmp_npy, "wb") as fh:
+            np.save(fh, mat)
+        tmp_ids.write_text(json.dumps([cid for cid, _ in keep]), encoding="utf-8")
+        os.replace(tmp_ids, ids_path)
+        os.replace(tmp_npy, npy)
+    finally:
+        tmp_npy.unlink(missing_ok=True)
+        tmp_ids.unlink(missing_ok=True)
+
+
+def load_vectors():
+    """Return ``(chunk_ids, matrix)`` with L2-normalised rows.
+
+    The matrix is materialised once into a ``.vectors.npy`` sidecar next to the
+    database and memory-mapped; it is cached per process until
+    :func:`invalidate_vectors` (called by :func:`upsert_document`) removes it.
+    """
+    import numpy as np
+
+    npy, ids_path = _vectors_paths()
+    with _VEC_LOCK:
+        for _ in range(2):
+            try:
+                st = npy.stat()
+            except FileNotFoundError:
+                init()
+                _build_vectors(npy, ids_path)
+                continue
+            key = (str(npy), st.st_mtime_ns, st.st_size)
+            cached = _VEC_CACHE.get("vectors")
+            if cached and cached[0] == key:
+                return cached[1], cached[2]
+            try:
+                ids = json.loads(ids_path.read_text(encoding="utf-8"))
+                mat = np.load(npy, mmap_mode="r")
+            except (FileNotFoundError, ValueError):
+                npy.unlink(missing_ok=True)
+                continue
+            if len(ids) != mat.shape[0]:
+                npy.unlink(missing_ok=True)
+                continue
+            _VEC_CACHE["vectors"] = (key, ids, mat)
+            return ids, mat
+    return [], np.zeros((0, 0), dtype="<f4")
+
+
 def upsert_document(doc_id: str, meta: Dict[str, Any], chunks: Iterable[str], *, embedder=None) -> int:
     """
     meta: {'name':..., 'tags': [...], 'path': ...}
@@ -69,9 +170,10 @@ def upsert_document(doc_id: str, meta: Dict[str, Any], chunks: Iterable[str], *,
         if embedder:
             vecs = embedder(chunks) or []
             if vecs:
-                rows = [(f"{doc_id}:{i}", json.dumps(vec)) for i, vec in enumerate(vecs)]
+                rows = [(f"{doc_id}:{i}", encode_vec(vec)) for i, vec in enumerate(vecs)]
                 c.executemany(
                     "INSERT OR REPLACE INTO embeddings(chunk_id, vec) VALUES(?, ?)",
                     rows,
                 )
+    invalidate_vectors()
     return len(chunks)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
-import math
 from typing import Any, Dict, List
 
-from .index import _conn
+from .index import _conn, load_vectors
+
+# Bound parameters per statement; older SQLite builds allow at most 999.
+SQL_PARAM_CHUNK = 900
 
 
 def keyword_search(query: str, limit: int = 20) -> List[Dict[str, Any]]:
@@ -21,29 +22,34 @@ def keyword_search(query: str, limit: int = 20) -> List[Dict[str, Any]]:
 
 
 def embed_search(query_vec: list[float], limit: int = 20) -> List[Dict[str, Any]]:
+    """Return the ``limit`` chunks most cosine-similar to ``query_vec``."""
+    import numpy as np
+
+    ids, mat = load_vectors()
+    q = np.asarray(query_vec, dtype="<f4")
+    if not ids or limit <= 0 or mat.shape[1] != q.shape[0]:
+        return []
+    qn = float(np.linalg.norm(q)) or 1.0
+    scores = mat @ (q / qn)
+    k = min(limit, scores.shape[0])
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    hits = [(ids[i], float(scores[i])) for i in top]
+    wanted = [cid for cid, _ in hits]
+    by_id = {}
     with _conn() as c:
-        rows = c.execute("SELECT chunk_id, vec FROM embeddings").fetchall()
-    scored = []
-    for cid, vec_json in rows:
-        v = json.loads(vec_json)
-        dot = sum(a * b for a, b in zip(query_vec, v))
-        na = math.sqrt(sum(a * a for a in query_vec)) or 1.0
-        nb = math.sqrt(sum(b * b for b in v)) or 1.0
-        scored.append((cid, dot / (na * nb)))
-    scored.sort(key=lambda x: x[1], reverse=True)
+        for start in range(0, len(wanted), SQL_PARAM_CHUNK):
+            batch = wanted[start : start + SQL_PARAM_CHUNK]
+            placeholders = ",".join("?" for _ in batch)
+            rows = c.execute(
+                f"SELECT id, doc_id, text FROM chunks WHERE id IN ({placeholders})", batch
+            ).fetchall()
+            by_id.update((r[0], r) for r in rows)
     out = []
-    with _conn() as c:
-        for cid, s in scored[:limit]:
-            row = c.execute("SELECT doc_id, text FROM chunks WHERE id=?", (cid,)).fetchone()
-            if row:
-                out.append(
-                    {
-                        "chunk_id": cid,
-                        "doc_id": row[0],
-                        "score": float(s),
-                        "text": row[1],
-                    }
-                )
+    for cid, s in hits:
+        row = by_id.get(cid)
+        if row:
+            out.append({"chunk_id": cid, "doc_id": row[1], "score": s, "text": row[2]})
     return out
 
 
@@ -11,19 +11,32 @@ TEL_DIR = ROOT / "telemetry"
 RUNS_DIR = ROOT / "runs"
 
 
+def _invalidate_warehouse(paths: list[Path]) -> None:
+    """Drop the warehouse copies of telemetry files that were deleted or rewritten."""
+    if not paths:
+        return
+    try:
+        from dr_rd.telemetry import warehouse
+
+        warehouse.invalidate(paths)
+    except Exception:
+        pass
+
+
 def purge_telemetry_older_than(days: int) -> int:
     if days < 0:
         return 0
     cutoff = time.time() - days * 86400
-    removed = 0
+    removed = []
     for p in TEL_DIR.glob("events-*.jsonl*"):
         try:
             if p.stat().st_mtime < cutoff:
                 p.unlink(missing_ok=True)
-                removed += 1
+                removed.append(p)
         except Exception:
             pass
-    return removed
+    _invalidate_warehouse(removed)
+    return len(removed)
 
 
 def delete_run(run_id: str) -> bool:
@@ -51,17 +64,18 @@ def delete_run_events(run_id: str) -> int:
     """Rewrite telemetry files removing lines with the run_id. Returns count of rewritten files."""
     if not TEL_DIR.exists():
         return 0
-    rewritten = 0
+    rewritten = []
     for p in TEL_DIR.glob("events-*.jsonl*"):
         try:
             lines = p.read_text(encoding="utf-8").splitlines()
             kept = [ln for ln in lines if f"\"run_id\":\"{run_id}\"" not in ln]
             if len(kept) != len(lines):
                 p.write_text("\n".join(kept) + ("\n" if kept else ""), encoding="utf-8")
-                rewritten += 1
+                rewritten.append(p)
         except Exception:
             pass
-    return rewritten
+    _invalidate_warehouse(rewritten)
+    return len(rewritten)
 
 
 __all__ = [
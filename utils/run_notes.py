@@ -5,6 +5,7 @@ import time
 from pathlib import Path
 from typing import Dict, List
 
+from . import runs_index
 from .paths import RUNS_ROOT
 
 _MAX_NOTE_CHARS = 10_000
@@ -50,6 +51,10 @@ def save(run_id: str, *, title: str, note: str, tags: List[str], favorite: bool)
     tmp = path.with_suffix(path.suffix + ".tmp")
     tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
     tmp.replace(path)
+    try:
+        runs_index.update_run(run_id, root=path.parent.parent)
+    except Exception:
+        pass
     return data
 
 
@@ -66,11 +71,30 @@ def toggle_favorite(run_id: str) -> Dict:
     )
 
 
+_DEFAULTS = {"title": "", "note": "", "tags": [], "favorite": False, "updated_at": 0}
+_ALL_NOTES: tuple = (None, {})
+
+
 def all_notes() -> Dict[str, Dict]:
-    """Return mapping of run_id -> notes."""
-    out: Dict[str, Dict] = {}
+    """Return mapping of run_id -> notes.
+
+    Served from the runs index; the same mapping is returned until a note
+    changes, so treat it as read-only.
+    """
+    global _ALL_NOTES
     if not RUNS_ROOT.exists():
-        return out
+        return {}
+    try:
+        indexed = runs_index.notes(RUNS_ROOT)
+    except Exception:
+        return _scan_notes()
+    if _ALL_NOTES[0] is not indexed:
+        _ALL_NOTES = (indexed, {rid: {**_DEFAULTS, "tags": [], **d} for rid, d in indexed.items()})
+    return _ALL_NOTES[1]
+
+
+def _scan_notes() -> Dict[str, Dict]:
+    out: Dict[str, Dict] = {}
     for child in RUNS_ROOT.iterdir():
         if not child.is_dir():
             continue
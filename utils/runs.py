@@ -6,9 +6,18 @@ from pathlib import Path
 from typing import List, Dict, Tuple
 from datetime import datetime
 
+from . import runs_index
 from .paths import artifact_path, ensure_run_dirs
 
 
+def _reindex(path: Path) -> None:
+    """Refresh the runs index row for the run owning ``path`` (best effort)."""
+    try:
+        runs_index.update_run(path.parent.name, root=path.parent.parent)
+    except Exception:
+        pass
+
+
 def create_run_meta(
     run_id: str,
     *,
@@ -31,9 +40,9 @@ def create_run_meta(
         meta["resume_of"] = origin_run_id
     if prompts:
         meta["prompts"] = prompts
-    artifact_path(run_id, "run", "json").write_text(
-        json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    path = artifact_path(run_id, "run", "json")
+    path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    _reindex(path)
 
 
 def mark_run_running(run_id: str) -> None:
@@ -47,6 +56,7 @@ def mark_run_running(run_id: str) -> None:
         meta = {"run_id": run_id}
     meta["status"] = "running"
     path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    _reindex(path)
 
 
 def complete_run_meta(run_id: str, *, status: str) -> None:
@@ -64,6 +74,13 @@ def complete_run_meta(run_id: str, *, status: str) -> None:
         meta = {"run_id": run_id}
     meta.update({"completed_at": int(time.time()), "status": status})
     path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    _reindex(path)
+    try:
+        from . import trace_writer
+
+        trace_writer.compact(run_id)
+    except Exception:
+        pass
 
 
 def load_run_meta(run_id: str) -> dict | None:
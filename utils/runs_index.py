@@ -1,14 +1,150 @@
+"""Index of run directories for the History page and command palette.
+
+Rows are kept in a SQLite file next to the runs root (``.dr_rd/runs.index.sqlite``
+for the default ``.dr_rd/runs``).  Every run directory is stored with a
+fingerprint of its ``run.json``, ``usage_totals.json`` and ``notes.json``
+(mtime and size), so :func:`reconcile` only re-reads directories whose files
+changed and drops rows for directories that disappeared.  ``utils.runs`` and
+``utils.run_notes`` call :func:`update_run` when they write, and
+:func:`load_index` reconciles only when the root directory changed (a run was
+added or removed) or the last pass is older than ``RUNS_INDEX_RECONCILE_S``.
+
+Status, mode and start time are indexed columns, and idea/notes text is kept
+in an FTS5 trigram table, so :func:`search` without explicit rows filters in
+SQL instead of scanning every run.  Every write bumps a version counter;
+:func:`load_index` and :func:`notes` hand back the same cached objects until
+it changes, which lets callers such as the command palette detect "nothing
+changed" with an identity check.
+"""
+
 from __future__ import annotations
 
 import csv
 import io
 import json
-from typing import Iterable, Mapping, Optional, List, Dict
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Iterable, Mapping, Optional, List, Dict, Tuple
 from pathlib import Path
 
+from . import paths
 from .paths import RUNS_ROOT
 
-_INDEX_PATH = Path(".dr_rd") / "runs_index.json"
+ROW_FIELDS = (
+    "run_id",
+    "started_at",
+    "completed_at",
+    "status",
+    "mode",
+    "idea_preview",
+    "origin_run_id",
+    "tokens",
+    "cost_usd",
+)
+_FINGERPRINT_FILES = ("run.json", "usage_totals.json", "notes.json")
+
+SCHEMA_VERSION = 2
+DDL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS runs (dir TEXT UNIQUE, fingerprint TEXT, run_id, started_at, completed_at, status, mode, idea_preview, origin_run_id, tokens, cost_usd, favorite INTEGER, tags TEXT, text TEXT, notes TEXT);
+CREATE INDEX IF NOT EXISTS runs_started ON runs(started_at);
+CREATE INDEX IF NOT EXISTS runs_status ON runs(status, started_at);
+CREATE INDEX IF NOT EXISTS runs_mode ON runs(mode, started_at);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+INSERT OR IGNORE INTO meta VALUES ('epoch', lower(hex(randomblob(8))));
+INSERT OR IGNORE INTO meta VALUES ('version', '0');
+"""
+# ``runs_fts`` rows share the rowid of their ``runs`` row.
+FTS_DDL = "CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5(text, tokenize='trigram')"
+
+# index path -> (stamp, cached value) for load_index() and notes()
+_ROWS_CACHE: Dict[str, Tuple[str, List[Dict]]] = {}
+_NOTES_CACHE: Dict[str, Tuple[str, Dict[str, Dict]]] = {}
+
+
+def _reconcile_interval() -> float:
+    try:
+        return float(os.getenv("RUNS_INDEX_RECONCILE_S", "60"))
+    except ValueError:
+        return 60.0
+
+
+def _root(root: Optional[Path]) -> Path:
+    return Path(root) if root is not None else paths.RUNS_ROOT
+
+
+def index_path(root: Optional[Path] = None) -> Path:
+    """Return the index file serving ``root`` (a sibling of the runs directory)."""
+    root = _root(root)
+    return root.with_name(root.name + ".index.sqlite")
+
+
+def _connect(root: Path) -> Tuple[sqlite3.Connection, bool]:
+    path = index_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # written by an older layout: start over, the next reconcile refills it
+        for table in ("runs", "runs_fts", "meta"):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    for stmt in filter(None, (s.strip() for s in DDL.split(";"))):
+        conn.execute(stmt)
+    try:
+        conn.execute(FTS_DDL)
+        fts = True
+    except sqlite3.OperationalError:  # SQLite built without FTS5/trigram
+        fts = False
+    return conn, fts
+
+
+def _fingerprint(run_dir: Path) -> str:
+    parts = []
+    for name in _FINGERPRINT_FILES:
+        try:
+            st = (run_dir / name).stat()
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _read_run(run_dir: Path) -> Dict:
+    """Return the index row for ``run_dir``."""
+    run_id = run_dir.name
+    meta = _read_json(run_dir / "run.json") or {"run_id": run_id}
+    tokens = 0
+    cost = 0.0
+    totals = _read_json(run_dir / "usage_totals.json")
+    if totals is not None:
+        try:
+            tokens = int(totals.get("tokens") or totals.get("total_tokens") or 0)
+            cost = float(totals.get("cost_usd") or totals.get("cost") or 0.0)
+        except Exception:
+            pass
+    return {
+        "run_id": meta.get("run_id", run_id),
+        "started_at": meta.get("started_at"),
+        "completed_at": meta.get("completed_at"),
+        "status": meta.get("status"),
+        "mode": meta.get("mode"),
+        "idea_preview": meta.get("idea_preview", ""),
+        "origin_run_id": meta.get("origin_run_id"),
+        "tokens": meta.get("tokens", tokens),
+        "cost_usd": meta.get("cost_usd", cost),
+    }
 
 
 def scan_runs(root: Path = RUNS_ROOT) -> List[Dict]:
@@ -19,63 +155,259 @@ def scan_runs(root: Path = RUNS_ROOT) -> List[Dict]:
     for child in sorted(root.iterdir()):
         if not child.is_dir():
             continue
-        run_id = child.name
-        run_path = child / "run.json"
-        if run_path.exists():
-            try:
-                meta = json.loads(run_path.read_text(encoding="utf-8"))
-            except Exception:
-                meta = {"run_id": run_id}
-        else:
-            meta = {"run_id": run_id}
-        totals_path = child / "usage_totals.json"
-        tokens = 0
-        cost = 0.0
-        if totals_path.exists():
-            try:
-                totals = json.loads(totals_path.read_text(encoding="utf-8"))
-                tokens = int(totals.get("tokens") or totals.get("total_tokens") or 0)
-                cost = float(totals.get("cost_usd") or totals.get("cost") or 0.0)
-            except Exception:
-                pass
-        row = {
-            "run_id": meta.get("run_id", run_id),
-            "started_at": meta.get("started_at"),
-            "completed_at": meta.get("completed_at"),
-            "status": meta.get("status"),
-            "mode": meta.get("mode"),
-            "idea_preview": meta.get("idea_preview", ""),
-            "origin_run_id": meta.get("origin_run_id"),
-            "tokens": meta.get("tokens", tokens),
-            "cost_usd": meta.get("cost_usd", cost),
-        }
-        rows.append(row)
+        rows.append(_read_run(child))
     rows.sort(key=lambda r: r.get("started_at") or 0, reverse=True)
     return rows
 
 
-def build_index() -> List[Dict]:
-    """Build the runs index and cache it."""
-    rows = scan_runs()
-    _INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
-    tmp = _INDEX_PATH.with_suffix(_INDEX_PATH.suffix + ".tmp")
-    tmp.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
-    tmp.replace(_INDEX_PATH)
-    return rows
+def _store(conn: sqlite3.Connection, fts: bool, run_dir: Path, fingerprint: str) -> None:
+    row = _read_run(run_dir)
+    note = _read_json(run_dir / "notes.json") or {}
+    tags = [str(t) for t in note.get("tags", []) or []]
+    text = " ".join(
+        [
+            row["run_id"] or "",
+            row.get("idea_preview") or "",
+            note.get("title", "") or "",
+            note.get("note", "") or "",
+            " ".join(tags),
+        ]
+    ).lower()
+    _drop(conn, fts, [run_dir.name])
+    cur = conn.execute(
+        "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            run_dir.name,
+            fingerprint,
+            *(row[k] for k in ROW_FIELDS),
+            int(bool(note.get("favorite"))),
+            json.dumps([t.lower() for t in tags]),
+            text,
+            json.dumps(note, ensure_ascii=False) if (run_dir / "notes.json").exists() else None,
+        ),
+    )
+    if fts:
+        conn.execute("INSERT INTO runs_fts (rowid, text) VALUES (?, ?)", (cur.lastrowid, text))
+    _bump(conn)
+
+
+def _bump(conn: sqlite3.Connection) -> None:
+    conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+
+
+def _stamp(conn: sqlite3.Connection) -> str:
+    meta = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('epoch', 'version')"))
+    return f"{meta.get('epoch')}:{meta.get('version')}"
+
+
+def _drop(conn: sqlite3.Connection, fts: bool, dirs: Iterable[str]) -> None:
+    for d in dirs:
+        for (rowid,) in conn.execute("SELECT rowid FROM runs WHERE dir = ?", (d,)).fetchall():
+            conn.execute("DELETE FROM runs WHERE rowid = ?", (rowid,))
+            if fts:
+                conn.execute("DELETE FROM runs_fts WHERE rowid = ?", (rowid,))
+            _bump(conn)
 
 
-def load_index(refresh: bool = False) -> List[Dict]:
-    """Load cached runs index or rebuild if needed."""
-    if refresh or not _INDEX_PATH.exists():
-        return build_index()
+def _root_stamp(root: Path) -> str:
     try:
-        return json.loads(_INDEX_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return build_index()
+        return str(root.stat().st_mtime_ns)
+    except OSError:
+        return "-"
+
+
+def _reconcile(conn: sqlite3.Connection, fts: bool, root: Path) -> int:
+    seen = set()
+    changed = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        known = dict(conn.execute("SELECT dir, fingerprint FROM runs"))
+        if root.exists():
+            for child in root.iterdir():
+                if not child.is_dir():
+                    continue
+                seen.add(child.name)
+                fp = _fingerprint(child)
+                if known.get(child.name) != fp:
+                    _store(conn, fts, child, fp)
+                    changed += 1
+        gone = set(known) - seen
+        _drop(conn, fts, gone)
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [("root_stamp", _root_stamp(root)), ("reconciled_at", str(time.time()))],
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return changed + len(gone)
+
+
+def reconcile(root: Optional[Path] = None) -> int:
+    """Bring the index in line with ``root``; return the number of rows changed."""
+    root = _root(root)
+    conn, fts = _connect(root)
+    with closing(conn):
+        return _reconcile(conn, fts, root)
+
+
+def update_run(run_id: str, root: Optional[Path] = None) -> None:
+    """Refresh the index row for one run after its files were written."""
+    root = _root(root)
+    run_dir = root / run_id
+    conn, fts = _connect(root)
+    with closing(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if run_dir.is_dir():
+                _store(conn, fts, run_dir, _fingerprint(run_dir))
+            else:
+                _drop(conn, fts, [run_id])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _rows(conn: sqlite3.Connection, where: str = "", args: Iterable[Any] = (), limit=None):
+    sql = f"SELECT {', '.join(ROW_FIELDS)} FROM runs {where} ORDER BY COALESCE(started_at, 0) DESC"
+    args = list(args)
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(int(limit))
+    return [dict(zip(ROW_FIELDS, r)) for r in conn.execute(sql, args)]
+
+
+def _open_fresh(root: Path, refresh: bool) -> Tuple[sqlite3.Connection, bool]:
+    conn, fts = _connect(root)
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+    stale = (
+        refresh
+        or meta.get("root_stamp") != _root_stamp(root)
+        or time.time() - float(meta.get("reconciled_at") or 0) > _reconcile_interval()
+    )
+    if stale:
+        _reconcile(conn, fts, root)
+    return conn, fts
+
+
+def build_index(root: Optional[Path] = None) -> List[Dict]:
+    """Rebuild the runs index from scratch and return its rows."""
+    root = _root(root)
+    conn, fts = _connect(root)
+    with closing(conn):
+        conn.execute("DELETE FROM runs")
+        if fts:
+            conn.execute("DELETE FROM runs_fts")
+        _bump(conn)
+        _reconcile(conn, fts, root)
+        return _rows(conn)
+
+
+def load_index(refresh: bool = False, root: Optional[Path] = None) -> List[Dict]:
+    """Return indexed rows, newest first, reconciling changed run directories.
+
+    The list is shared between calls until the index changes; do not mutate it.
+    """
+    root = _root(root)
+    key = str(index_path(root))
+    conn, _fts = _open_fresh(root, refresh)
+    with closing(conn):
+        stamp = _stamp(conn)
+        cached = _ROWS_CACHE.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        rows = _rows(conn)
+    _ROWS_CACHE[key] = (stamp, rows)
+    return rows
+
+
+def notes(root: Optional[Path] = None) -> Dict[str, Dict]:
+    """Return run directory -> ``notes.json`` contents for runs that have notes.
+
+    Shared between calls until the index changes; do not mutate it.
+    """
+    root = _root(root)
+    key = str(index_path(root))
+    conn, _fts = _open_fresh(root, False)
+    with closing(conn):
+        stamp = _stamp(conn)
+        cached = _NOTES_CACHE.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        out = {
+            d: json.loads(n)
+            for d, n in conn.execute("SELECT dir, notes FROM runs WHERE notes IS NOT NULL")
+        }
+    _NOTES_CACHE[key] = (stamp, out)
+    return out
+
+
+def facets(root: Optional[Path] = None) -> Dict[str, List[str]]:
+    """Return the distinct statuses and modes present in the index."""
+    conn, _fts = _open_fresh(_root(root), False)
+    with closing(conn):
+        return {
+            col: [
+                v
+                for (v,) in conn.execute(
+                    f"SELECT DISTINCT {col} FROM runs WHERE {col} IS NOT NULL ORDER BY {col}"
+                )
+                if v
+            ]
+            for col in ("status", "mode")
+        }
+
+
+def _query(
+    *,
+    q: str,
+    status: set,
+    mode: set,
+    date_from: Optional[float],
+    date_to: Optional[float],
+    favorites_only: bool,
+    tags: set,
+    limit: Optional[int],
+    root: Optional[Path],
+) -> List[Dict]:
+    where: List[str] = []
+    args: List[Any] = []
+    if status:
+        where.append(f"status IN ({', '.join('?' * len(status))})")
+        args.extend(sorted(status))
+    if mode:
+        where.append(f"mode IN ({', '.join('?' * len(mode))})")
+        args.extend(sorted(mode))
+    if date_from:
+        where.append("COALESCE(started_at, 0) >= ?")
+        args.append(date_from)
+    if date_to:
+        where.append("COALESCE(started_at, 0) <= ?")
+        args.append(date_to)
+    if favorites_only:
+        where.append("favorite = 1")
+    for tag in sorted(tags):
+        where.append("EXISTS (SELECT 1 FROM json_each(runs.tags) WHERE value = ?)")
+        args.append(tag)
+    conn, fts = _open_fresh(_root(root), False)
+    with closing(conn):
+        if q:
+            if fts and len(q) >= 3:
+                # trigram FTS matches substrings; quote the query as one phrase
+                phrase = '"' + q.replace('"', '""') + '"'
+                where.append("rowid IN (SELECT rowid FROM runs_fts WHERE runs_fts MATCH ?)")
+                args.append(phrase)
+            else:
+                where.append("instr(text, ?) > 0")
+                args.append(q)
+        clause = ("WHERE " + " AND ".join(where)) if where else ""
+        return _rows(conn, clause, args, limit)
 
 
 def search(
-    rows: List[Dict],
+    rows: Optional[List[Dict]],
     *,
     q: str = "",
     status: Optional[Iterable[str]] = None,
@@ -85,12 +417,30 @@ def search(
     favorites_only: bool = False,
     tags: Optional[Iterable[str]] = None,
     notes_lookup: Mapping[str, Dict] | None = None,
+    limit: Optional[int] = None,
+    root: Optional[Path] = None,
 ) -> List[Dict]:
-    """Filter ``rows`` based on provided criteria."""
+    """Filter ``rows`` based on provided criteria.
+
+    With ``rows=None`` the filters run against the persistent index (notes are
+    read from the index too, so ``notes_lookup`` is not needed).
+    """
     q = q.lower().strip()
     status_set = {s for s in status or []}
     mode_set = {m for m in mode or []}
     tag_set = {t.lower() for t in tags or []}
+    if rows is None:
+        return _query(
+            q=q,
+            status=status_set,
+            mode=mode_set,
+            date_from=date_from,
+            date_to=date_to,
+            favorites_only=favorites_only,
+            tags=tag_set,
+            limit=limit,
+            root=root,
+        )
     notes_lookup = notes_lookup or {}
 
     def match(row: Dict) -> bool:
@@ -122,23 +472,14 @@ def search(
                 return False
         return True
 
-    return [r for r in rows if match(r)]
+    out = [r for r in rows if match(r)]
+    return out[:limit] if limit is not None else out
 
 
 def to_csv(rows: List[Dict]) -> bytes:
     """Return ``rows`` encoded as RFC4180 CSV bytes."""
     buf = io.StringIO()
-    fieldnames = [
-        "run_id",
-        "started_at",
-        "completed_at",
-        "status",
-        "mode",
-        "idea_preview",
-        "origin_run_id",
-        "tokens",
-        "cost_usd",
-    ]
+    fieldnames = list(ROW_FIELDS)
     writer = csv.DictWriter(buf, fieldnames=fieldnames)
     writer.writeheader()
     for r in rows:
@@ -150,6 +491,11 @@ __all__ = [
     "scan_runs",
     "build_index",
     "load_index",
+    "reconcile",
+    "update_run",
+    "facets",
+    "notes",
+    "index_path",
     "search",
     "to_csv",
 ]
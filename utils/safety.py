@@ -8,6 +8,8 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+from core.pattern_scan import PatternScanner
+
 from .prefs import load_prefs
 from .redaction import redact_text
 
@@ -61,28 +63,33 @@ class SafetyConfig:
     high_severity_threshold: float
 
 
-def _scan_patterns(text: str, patterns: List[re.Pattern[str]], category: str) -> List[SafetyFinding]:
-    findings: List[SafetyFinding] = []
-    for rx in patterns:
-        for m in rx.finditer(text):
-            findings.append(
-                SafetyFinding(
-                    category=category,
-                    severity="high" if category in {"exfil", "malicious_instruction", "unsafe_output"} else "med",
-                    span=(m.start(), m.end()),
-                    message=rx.pattern,
-                )
-            )
-    return findings
+_SCANNER = PatternScanner(
+    {
+        (category, i): rx
+        for category, patterns in (
+            ("prompt_injection", _PROMPT_INJECTION_PATTERNS),
+            ("exfil", _EXFIL_PATTERNS),
+            ("pii", _PII_PATTERNS),
+            ("unsafe_output", _OUTPUT_PATTERNS),
+        )
+        for i, rx in enumerate(patterns)
+    }
+)
 
 
 def check_text(text: str) -> SafetyResult:
     txt = text or ""
     findings: List[SafetyFinding] = []
-    findings += _scan_patterns(txt, _PROMPT_INJECTION_PATTERNS, "prompt_injection")
-    findings += _scan_patterns(txt, _EXFIL_PATTERNS, "exfil")
-    findings += _scan_patterns(txt, _PII_PATTERNS, "pii")
-    findings += _scan_patterns(txt, _OUTPUT_PATTERNS, "unsafe_output")
+    for span in _SCANNER.scan(txt):
+        category, _ = span.category
+        findings.append(
+            SafetyFinding(
+                category=category,
+                severity="high" if category in {"exfil", "malicious_instruction", "unsafe_output"} else "med",
+                span=(span.start, span.end),
+                message=_SCANNER.patterns[span.category].pattern,
+            )
+        )
     blocked = any(f.severity == "high" for f in findings)
     score = min(1.0, len(findings) / 5) if findings else 0.0
     return SafetyResult(findings=findings, blocked=blocked, score=score)
@@ -7,6 +7,7 @@ EventKind = Literal[
     "step_start",
     "step_end",
     "token",
+    "token_reset",
     "message",
     "summary",
     "error",
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import importlib
 import json
 import os
 import threading
 import time
 from pathlib import Path
 
+from dr_rd.telemetry.writer import BackgroundWriter
+
 from .redaction import redact_dict
 from .telemetry_schema import CURRENT_SCHEMA_VERSION, upcast, validate
 
@@ -22,15 +25,16 @@ def _day_stamp() -> str:
     return time.strftime("%Y%m%d", time.gmtime())
 
 
-def _active_path() -> Path:
+def _active_path(log_dir: Path | None = None) -> Path:
     """Return the current log file path for today, rotating by size."""
+    log_dir = log_dir or LOG_DIR
     day = _day_stamp()
-    base = LOG_DIR / f"events-{day}.jsonl"
+    base = log_dir / f"events-{day}.jsonl"
     p = base
     part = 0
     while p.exists() and p.stat().st_size >= MAX_BYTES:
         part += 1
-        p = LOG_DIR / f"events-{day}.part{part}.jsonl"
+        p = log_dir / f"events-{day}.part{part}.jsonl"
     return p
 
 
@@ -47,25 +51,81 @@ def _rollover(p: Path) -> Path:
     return p.with_name(p.stem + ".part1.jsonl")
 
 
-def log_event(ev: dict) -> None:
-    """Validate, version, and append a telemetry event."""
+# Rotation target per (log dir, day), so the part-file walk in
+# ``_active_path`` runs once per day rather than once per event.
+_ACTIVE: dict[tuple[str, str], Path] = {}
+
+
+def _append(p: Path, lines: list[str]) -> None:
+    data = "".join(line + "\n" for line in lines).encode("utf-8", errors="ignore")
+    fd = os.open(p, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
     try:
-        from utils.consent import allowed_telemetry
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _write_batch(batch: list[tuple[Path, dict]]) -> None:
+    """Writer-thread sink: redact, serialise and append events by directory."""
+    by_dir: dict[Path, list[str]] = {}
+    for log_dir, ev in batch:
+        try:
+            by_dir.setdefault(log_dir, []).append(json.dumps(redact_dict(ev), ensure_ascii=False))
+        except Exception:
+            continue
+    with _LOCK:
+        for log_dir, lines in by_dir.items():
+            key = (str(log_dir), _day_stamp())
+            p = _ACTIVE.get(key) or _active_path(log_dir)
+            size = p.stat().st_size if p.exists() else 0
+            pending: list[str] = []
+            for line in lines:
+                n = len(line) + 1
+                if size and size + n > MAX_BYTES:
+                    if pending:
+                        _append(p, pending)
+                        pending = []
+                    p = _rollover(p)
+                    size = p.stat().st_size if p.exists() else 0
+                pending.append(line)
+                size += n
+            if pending:
+                _append(p, pending)
+            _ACTIVE[key] = p
+
+
+_WRITER = BackgroundWriter(_write_batch, name="telemetry-events")
+
+
+_CONTEXT_MODULES: dict[str, object] = {}
 
-        if not allowed_telemetry():
+
+def _ctx(module: str, attr: str):
+    """Return ``module.attr`` without re-running the import machinery per event."""
+    mod = _CONTEXT_MODULES.get(module)
+    if mod is None:
+        mod = _CONTEXT_MODULES[module] = importlib.import_module(module)
+    return getattr(mod, attr)
+
+
+def log_event(ev: dict) -> None:
+    """Validate, version, and queue a telemetry event for the background writer.
+
+    Context (consent, session and trace ids, timestamp) is captured here;
+    redaction, serialisation and file I/O happen on the writer thread.  Call
+    :func:`flush` to wait for queued events to reach disk.
+    """
+    try:
+        if not _ctx("utils.consent", "allowed_telemetry")():
             return
     except Exception:
         pass
     try:
-        from utils.session_store import get_session_id
-
-        ev.setdefault("session_id", get_session_id() or None)
+        ev.setdefault("session_id", _ctx("utils.session_store", "get_session_id")() or None)
     except Exception:
         pass
     try:
-        from utils.otel import current_ids
-
-        ids = current_ids()
+        ids = _ctx("utils.otel", "current_ids")()
         if ids:
             ev.setdefault("trace_id", ids.get("trace_id"))
             ev.setdefault("span_id", ids.get("span_id"))
@@ -74,35 +134,21 @@ def log_event(ev: dict) -> None:
     ev = validate(ev)
     ev.setdefault("schema_version", CURRENT_SCHEMA_VERSION)
     ev.setdefault("ts", time.time())
-    ev = redact_dict(ev)
-    try:
-        line = json.dumps(ev, ensure_ascii=False)
-    except Exception:
-        return
-    with _LOCK:
-        p = _active_path()
-        if p.exists() and p.stat().st_size + len(line) > MAX_BYTES:
-            p = _rollover(p)
-        lock_path = p.with_suffix(p.suffix + ".lock")
-        fh = None
-        try:
-            try:
-                fh = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
-            except OSError:
-                fh = None  # best effort
-            with p.open("a", encoding="utf-8", errors="ignore") as f:
-                f.write(line + "\n")
-                f.flush()
-        finally:
-            if fh is not None:
-                os.close(fh)
-                try:
-                    os.remove(lock_path)
-                except OSError:
-                    pass
+    _WRITER.submit((LOG_DIR, ev))
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Write all queued events; return ``False`` on timeout."""
+    return _WRITER.flush(timeout)
+
+
+def writer_stats() -> dict:
+    """Queue counters: submitted, written, dropped, batches, errors, queued."""
+    return _WRITER.stats()
 
 
 def list_files(day: str | None = None) -> list[Path]:
+    flush()
     pattern = f"events-{day}*" if day else "events-*.jsonl"
     return sorted(LOG_DIR.glob(pattern))
 
@@ -115,6 +161,7 @@ def read_events(limit: int | None = None, days: int = 7) -> list[dict]:
     limit: optional maximum number of events to return.
     days: how many days of logs to include, starting from today.
     """
+    flush()
     events: list[dict] = []
     now = time.time()
     for i in range(days):
@@ -196,9 +243,26 @@ def llm_fallback(
 
 
 def llm_cache_hit(
-    provider: str, model: str, run_id: str | None = None, step_id: str | None = None
+    provider: str,
+    model: str,
+    run_id: str | None = None,
+    step_id: str | None = None,
+    layer: str | None = None,
 ) -> None:
     ev = {"event": "llm_cache_hit", "provider": provider, "model": model}
+    if run_id:
+        ev["run_id"] = run_id
+    if step_id:
+        ev["step_id"] = step_id
+    if layer:
+        ev["layer"] = layer
+    log_event(ev)
+
+
+def llm_cache_miss(
+    provider: str, model: str, run_id: str | None = None, step_id: str | None = None
+) -> None:
+    ev = {"event": "llm_cache_miss", "provider": provider, "model": model}
     if run_id:
         ev["run_id"] = run_id
     if step_id:
@@ -635,6 +699,8 @@ def tasks_executable(count: int) -> None:
 
 __all__ = [
     "log_event",
+    "flush",
+    "writer_stats",
     "list_files",
     "read_events",
     "run_cancel_requested",
@@ -7,6 +7,7 @@ from collections import OrderedDict
 from typing import Any, Callable, Mapping, Sequence
 
 from .paths import write_bytes
+from .trace_writer import discard_stream
 
 Row = list[Any]
 TraceStep = Mapping[str, Any]
@@ -169,7 +170,9 @@ def to_markdown(
 
 
 def write_trace_json(run_id: str, trace: Sequence[dict[str, Any]]) -> None:
+    """Replace the run's trace with ``trace``, including steps not yet compacted."""
     write_bytes(run_id, "trace", "json", to_json(trace))
+    discard_stream(run_id)
 
 
 def write_trace_csv(
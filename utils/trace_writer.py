@@ -1,7 +1,11 @@
-"""Utilities for writing run traces atomically.
-
-Temporary files must live on the same filesystem as the destination to keep
-``os.replace`` atomic.
+"""Utilities for writing run traces.
+
+Steps are streamed to an append-only ``trace.jsonl`` with group-commit fsync:
+the file is fsynced once every ``TRACE_FSYNC_BATCH`` appends or
+``TRACE_FSYNC_INTERVAL_S`` seconds, whichever comes first.  At run end
+:func:`compact` folds the stream into the legacy ``trace.json`` list with an
+atomic replace.  Temporary files must live on the same filesystem as the
+destination to keep ``os.replace`` atomic.
 """
 
 import json
@@ -14,12 +18,23 @@ from threading import Lock
 from typing import Any, Mapping
 
 
+FSYNC_BATCH = int(os.getenv("TRACE_FSYNC_BATCH", "32"))
+FSYNC_INTERVAL_S = float(os.getenv("TRACE_FSYNC_INTERVAL_S", "1.0"))
+
+
 def trace_path(run_id: str) -> Path:
     from .paths import run_root
 
     return run_root(run_id) / "trace.json"
 
 
+def stream_path(run_id: str) -> Path:
+    """Return the append-only ``trace.jsonl`` path for ``run_id``."""
+    from .paths import run_root
+
+    return run_root(run_id) / "trace.jsonl"
+
+
 def _read_trace(p: Path) -> list[Any]:
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
@@ -30,11 +45,34 @@ def _read_trace(p: Path) -> list[Any]:
     return []
 
 
+def _read_stream(p: Path) -> list[Any]:
+    """Parse ``trace.jsonl`` skipping blank or torn (partially written) lines."""
+    out: list[Any] = []
+    try:
+        with open(p, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    out.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return out
+
+
 def read_trace(run_id: str) -> list[Any]:
-    """Return the saved trace list for ``run_id`` or an empty list."""
+    """Return the saved trace list for ``run_id`` or an empty list.
+
+    Entries already compacted into ``trace.json`` come first, followed by any
+    steps still pending in ``trace.jsonl``.
+    """
 
     p = trace_path(run_id)
-    return _read_trace(p) if p.exists() else []
+    data = _read_trace(p) if p.exists() else []
+    return data + _read_stream(stream_path(run_id))
 
 
 def _atomic_write(path: Path, text: str) -> None:
@@ -78,20 +116,45 @@ def cleanup_stale_tmp(dir: Path, ttl_sec: int = 3600) -> None:
 
 _CLEANED = False
 _LOCKS: dict[str, Lock] = {}
+_LOCKS_GUARD = Lock()
+# run_id -> [appends since last fsync, monotonic time of last fsync]
+_UNSYNCED: dict[str, list[float]] = {}
 
 
 def _lock_for(run_id: str) -> Lock:
-    lock = _LOCKS.get(run_id)
-    if lock is None:
-        lock = Lock()
-        _LOCKS[run_id] = lock
-    return lock
+    with _LOCKS_GUARD:
+        lock = _LOCKS.get(run_id)
+        if lock is None:
+            lock = Lock()
+            _LOCKS[run_id] = lock
+        return lock
+
+
+def _append_line(run_id: str, entry: Mapping[str, Any], *, sync: bool = False) -> None:
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    p = stream_path(run_id)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with _lock_for(run_id):
+        state = _UNSYNCED.setdefault(run_id, [0, time.monotonic()])
+        with open(p, "a", encoding="utf-8") as fh:
+            fh.write(line)
+            fh.flush()
+            state[0] += 1
+            if (
+                sync
+                or state[0] >= FSYNC_BATCH
+                or time.monotonic() - state[1] >= FSYNC_INTERVAL_S
+            ):
+                os.fsync(fh.fileno())
+                state[0] = 0
+                state[1] = time.monotonic()
 
 
 def append_step(run_id: str, step: Mapping[str, Any], *, meta: dict | None = None) -> None:
-    """Append ``step`` (and optional ``meta``) to the per-run trace.
+    """Append ``step`` (and optional ``meta``) to the per-run trace stream.
 
-    The target path is ``.dr_rd/runs/{run_id}/trace.json``.
+    The target path is ``.dr_rd/runs/{run_id}/trace.jsonl``; call
+    :func:`compact` to materialise ``trace.json``.
     """
 
     global _CLEANED
@@ -104,22 +167,56 @@ def append_step(run_id: str, step: Mapping[str, Any], *, meta: dict | None = Non
             pass
         _CLEANED = True
 
-    lock = _lock_for(run_id)
-    with lock:
-        p = trace_path(run_id)
-        data = _read_trace(p) if p.exists() else []
-        entry = dict(step)
-        if meta is not None:
-            entry["meta"] = dict(meta)
-        data.append(entry)
-        _atomic_write(p, json.dumps(data, ensure_ascii=False))
+    entry = dict(step)
+    if meta is not None:
+        entry["meta"] = dict(meta)
+    _append_line(run_id, entry)
 
 
 def append_event(run_id: str, event: Mapping[str, Any]) -> None:
+    _append_line(run_id, dict(event))
+
+
+def sync(run_id: str) -> None:
+    """Force any buffered trace appends for ``run_id`` to stable storage."""
+
+    p = stream_path(run_id)
+    with _lock_for(run_id):
+        if not p.exists():
+            return
+        with open(p, "a", encoding="utf-8") as fh:
+            os.fsync(fh.fileno())
+        _UNSYNCED[run_id] = [0, time.monotonic()]
+
+
+def compact(run_id: str) -> list[Any]:
+    """Fold ``trace.jsonl`` into the legacy ``trace.json`` and remove the stream.
+
+    Safe to call repeatedly; returns the full compacted trace.
+    """
+
     p = trace_path(run_id)
-    data = _read_trace(p) if p.exists() else []
-    data.append(dict(event))
-    _atomic_write(p, json.dumps(data, ensure_ascii=False))
+    stream = stream_path(run_id)
+    with _lock_for(run_id):
+        if not stream.exists():
+            return _read_trace(p) if p.exists() else []
+        data = (_read_trace(p) if p.exists() else []) + _read_stream(stream)
+        _atomic_write(p, json.dumps(data, ensure_ascii=False))
+        stream.unlink(missing_ok=True)
+        _UNSYNCED.pop(run_id, None)
+        return data
+
+
+def discard_stream(run_id: str) -> None:
+    """Drop steps still pending in ``trace.jsonl``.
+
+    Call after replacing ``trace.json`` wholesale so :func:`compact` and
+    :func:`read_trace` do not append the superseded steps again.
+    """
+
+    with _lock_for(run_id):
+        stream_path(run_id).unlink(missing_ok=True)
+        _UNSYNCED.pop(run_id, None)
 
 
 def flush_phase_meta(run_id: str, phase: str, meta: Mapping[str, Any]) -> None:
@@ -139,7 +236,11 @@ def flush_phase_meta(run_id: str, phase: str, meta: Mapping[str, Any]) -> None:
 
 __all__ = [
     "trace_path",
+    "stream_path",
     "append_step",
+    "compact",
+    "sync",
+    "discard_stream",
     "append_event",
     "flush_phase_meta",
     "read_trace",
@@ -1,6 +1,5 @@
 import mimetypes
 import os
-import re
 from pathlib import Path
 
 SAFE_TYPES = {
@@ -25,6 +24,6 @@ def allowed(path: Path) -> bool:
 
 
 def detect_pii(text: str) -> bool:
-    from .redaction import PII_PATTERNS
+    from core.redaction import BASE_CATEGORIES, SCANNER
 
-    return any(re.search(p, text) for p in PII_PATTERNS)
+    return SCANNER.any(text, BASE_CATEGORIES)
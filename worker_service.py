@@ -1,4 +1,6 @@
 """Minimal FastAPI service exposing core.runner.execute_task."""
+import asyncio
+
 from fastapi import FastAPI
 from pydantic import BaseModel, Field
 
@@ -13,7 +15,9 @@ class RunRequest(BaseModel):
 @app.post("/run")
 async def run(req: RunRequest):
     from core.runner import execute_task
-    return execute_task(req.role, req.title, req.desc, req.inputs)
+    # Agents are synchronous; run them off the event loop so concurrent
+    # requests and health checks are not blocked behind one task.
+    return await asyncio.to_thread(execute_task, req.role, req.title, req.desc, req.inputs)
 
 @app.get("/healthz")
 async def health():